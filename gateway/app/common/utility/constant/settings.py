@@ -32,6 +32,10 @@ class Settings:
         self.response_service_url = os.getenv("RESPONSE_SERVICE_URL", "http://localhost:8005")
         self.report_service_url = os.getenv("REPORT_SERVICE_URL", "http://localhost:8006")
         self.monitoring_service_url = os.getenv("MONITORING_SERVICE_URL", "http://localhost:8007")
+        
+        # account-service 공개키(JWKS) - 토큰 로컬 검증용
+        self.jwks_url = os.getenv("JWKS_URL", f"{self.auth_service_url.rstrip('/')}/.well-known/jwks.json")
+        self.jwks_refresh_seconds = float(os.getenv("JWKS_REFRESH_SECONDS", 300))
     
     def is_production(self) -> bool:
         """프로덕션 환경인지 확인"""
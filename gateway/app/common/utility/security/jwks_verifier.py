@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+import httpx
+import jwt
+
+logger = logging.getLogger("jwks_verifier")
+
+
+class JwksVerifier:
+    """
+    JWKS 기반 JWT 로컬 검증기
+
+    account-service의 /.well-known/jwks.json 공개키를 kid별로 캐시해 두고,
+    요청마다 account-service를 호출하지 않고 서명/만료만 로컬에서 검증한다.
+    공개키는 백그라운드에서 주기적으로 갱신하며, 처음 보는 kid가 오면
+    (키 회전 직후) 최소 간격을 지켜 즉시 갱신한다.
+    토큰 폐기(로그아웃) 여부는 확인하지 않으므로, 폐기 확인이 필요한 요청은
+    account-service에서 처리해야 한다.
+    """
+
+    def __init__(self, jwks_url: str, refresh_interval: float = 300.0,
+                 min_refresh_interval: float = 30.0, timeout: float = 5.0):
+        self.jwks_url = jwks_url
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._last_refresh = 0.0
+        self._refresh_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """공개키 초기 로드 및 백그라운드 갱신 시작"""
+        await self.refresh()
+        self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        """백그라운드 갱신 종료"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def refresh(self, force: bool = True) -> bool:
+        """JWKS 다시 받기 (force=False면 최소 간격 내 재요청 생략)"""
+        async with self._refresh_lock:
+            if not force and time.monotonic() - self._last_refresh < self.min_refresh_interval:
+                return False
+            self._last_refresh = time.monotonic()
+            try:
+                async with httpx.AsyncClient(timeout=self.timeout) as client:
+                    resp = await client.get(self.jwks_url)
+                    resp.raise_for_status()
+                keys = {}
+                for key_data in resp.json().get("keys", []):
+                    kid = key_data.get("kid")
+                    if kid:
+                        keys[kid] = jwt.PyJWK(key_data)
+                self._keys = keys
+                logger.info(f"🔑 JWKS 갱신 완료: {len(keys)}개 키")
+                return True
+            except Exception as e:
+                logger.warning(f"⚠️ JWKS 갱신 실패 (기존 키 유지): {e}")
+                return False
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh()
+
+    def verify(self, token: str) -> Optional[dict]:
+        """캐시된 키로 토큰 검증 (알 수 없는 kid/검증 실패 시 None)"""
+        try:
+            header = jwt.get_unverified_header(token)
+            key = self._keys.get(header.get("kid"))
+            if key is None:
+                return None
+            payload = jwt.decode(token, key.key, algorithms=[key.algorithm_name])
+        except jwt.PyJWTError:
+            return None
+        if payload.get("type", "access") != "access":
+            return None
+        return payload
+
+    async def verify_async(self, token: str) -> Optional[dict]:
+        """토큰 검증 (처음 보는 kid면 JWKS를 갱신한 뒤 한 번 더 시도)"""
+        payload = self.verify(token)
+        if payload is not None:
+            return payload
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except jwt.PyJWTError:
+            return None
+        if kid and kid not in self._keys and await self.refresh(force=False):
+            return self.verify(token)
+        return None
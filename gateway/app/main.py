@@ -1,8 +1,9 @@
 from typing import Optional, List
 from fastapi import APIRouter, FastAPI, Request, UploadFile, File, Query, HTTPException, Form, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 import os
+import asyncio
 import logging
 import sys
 from dotenv import load_dotenv
@@ -16,6 +17,7 @@ import httpx  # ✅ 추가: 프록시 요청 릴레이용
 # from app.domain.discovery.model.service_type import ServiceType
 from app.common.utility.constant.settings import Settings
 from app.common.utility.factory.response_factory import ResponseFactory
+from app.common.utility.security.jwks_verifier import JwksVerifier
 
 
 # ===== 환경 설정 =====
@@ -40,7 +42,17 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️ Settings 초기화 실패, 계속 진행합니다: {e}")
         app.state.settings = None
+    # JWT 로컬 검증기 (account-service JWKS 캐시)
+    app.state.jwks_verifier = None
+    if app.state.settings is not None:
+        app.state.jwks_verifier = JwksVerifier(
+            app.state.settings.jwks_url,
+            refresh_interval=app.state.settings.jwks_refresh_seconds
+        )
+        await app.state.jwks_verifier.start()
     yield
+    if app.state.jwks_verifier is not None:
+        await app.state.jwks_verifier.stop()
     logger.info("🛑 Gateway API 서비스 종료")
 
 
@@ -145,6 +157,144 @@ async def _relay(method: str, base_url: str, path: str, headers=None, body=None,
         return resp
 
 
+# 클라이언트 연결 종료 확인 간격 / 먼저 끊긴 요청의 상태 코드 (nginx 관례)
+DISCONNECT_POLL_SECONDS = float(os.getenv("DISCONNECT_POLL_SECONDS", "0.25"))
+CLIENT_CLOSED_REQUEST = 499
+
+relay_stats = {"relayed": 0, "client_disconnects": 0, "streams": 0}
+
+
+async def _open_upstream(method: str, base_url: str, path: str, headers=None, body=None, params=None,
+                         streaming: bool = False):
+    """
+    업스트림 요청을 보내고 응답 헤더까지만 받는다 → (client, response)
+    본문은 호출한 쪽이 읽고 닫는다. streaming이면 토큰 사이 간격이 길어도 끊지 않도록 읽기 제한이 없다.
+    """
+    url = f"{base_url}/{path.lstrip('/')}"
+    timeout = httpx.Timeout(30.0, read=None) if streaming else httpx.Timeout(30.0)
+    client = httpx.AsyncClient(timeout=timeout)
+    try:
+        upstream_request = client.build_request(method, url, headers=headers, content=body, params=params)
+        response = await client.send(upstream_request, stream=True)
+    except BaseException:
+        await client.aclose()
+        raise
+    return client, response
+
+
+async def _relay_until_disconnected(request: Request, **upstream_kwargs):
+    """
+    _open_upstream과 같지만 응답 헤더를 받기 전에 클라이언트가 연결을 끊으면 업스트림 요청을 취소한다
+    (None 반환). 업스트림 연결이 닫히므로 하위 서비스도 생성 중이던 응답을 중단할 수 있다.
+    """
+    relay_stats["relayed"] += 1
+    task = asyncio.ensure_future(_open_upstream(**upstream_kwargs))
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                relay_stats["client_disconnects"] += 1
+                logger.info(f"🛑 클라이언트 연결 종료, 업스트림 요청 취소: {request.method} {request.url.path}")
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                return None
+    finally:
+        task.cancel()
+
+
+# 스트리밍 응답에서 그대로 넘기지 않는 헤더 (길이/전송 방식은 게이트웨이 응답이 다시 정한다)
+STREAM_HOP_HEADERS = ("content-length", "transfer-encoding", "connection")
+
+
+def _wants_stream(request: Request, path: str) -> bool:
+    """SSE 요청 여부 (/stream, /jobs/{id}/events 또는 Accept: text/event-stream)"""
+    route = path.rstrip("/")
+    return (
+        route.endswith("stream")
+        or route.endswith("/events")
+        or "text/event-stream" in request.headers.get("accept", "")
+    )
+
+
+async def _respond(client: httpx.AsyncClient, response: httpx.Response) -> Response:
+    """
+    업스트림 응답 전달. text/event-stream은 받은 조각을 바로 흘려보내고(첫 토큰 지연 유지),
+    그 밖의 응답은 본문을 다 읽어 한 번에 보낸다. 클라이언트가 스트림 중간에 끊으면 제너레이터가
+    닫히면서 업스트림 연결도 닫힌다.
+    """
+    if response.headers.get("content-type", "").startswith("text/event-stream"):
+        relay_stats["streams"] += 1
+
+        async def relay_body():
+            try:
+                async for chunk in response.aiter_raw():
+                    yield chunk
+            finally:
+                await response.aclose()
+                await client.aclose()
+
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name.lower() not in STREAM_HOP_HEADERS
+        }
+        return StreamingResponse(relay_body(), status_code=response.status_code, headers=headers)
+
+    try:
+        await response.aread()
+    finally:
+        await response.aclose()
+        await client.aclose()
+    return Response(
+        content=response.content,
+        status_code=response.status_code,
+        headers=dict(response.headers)
+    )
+
+
+def _append_forwarded_for(request: Request, headers: dict) -> dict:
+    """
+    게이트웨이가 본 클라이언트 주소를 X-Forwarded-For 뒤에 추가.
+    하위 서비스는 오른쪽 값(신뢰하는 프록시가 붙인 값)만 클라이언트 IP로 쓴다.
+    """
+    if request.client:
+        forwarded_for = headers.get("x-forwarded-for")
+        headers["x-forwarded-for"] = (
+            f"{forwarded_for}, {request.client.host}" if forwarded_for else request.client.host
+        )
+    return headers
+
+
+# 게이트웨이가 검증한 사용자 정보를 하위 서비스로 전달하는 헤더
+IDENTITY_HEADERS = ("x-user-id", "x-company-id", "x-user-role", "x-username")
+
+
+async def _apply_identity_headers(request: Request, headers: dict) -> dict:
+    """
+    Bearer 토큰을 JWKS로 로컬 검증해 사용자 식별 헤더를 추가.
+    클라이언트가 직접 보낸 식별 헤더는 항상 제거한다.
+    """
+    for name in IDENTITY_HEADERS:
+        headers.pop(name, None)
+
+    verifier = getattr(request.app.state, "jwks_verifier", None)
+    authorization = request.headers.get("authorization", "")
+    if verifier is None or not authorization.lower().startswith("bearer "):
+        return headers
+
+    claims = await verifier.verify_async(authorization[7:].strip())
+    if claims:
+        if claims.get("uid") is not None:
+            headers["x-user-id"] = str(claims["uid"])
+        if claims.get("cid"):
+            headers["x-company-id"] = str(claims["cid"])
+        if claims.get("role"):
+            headers["x-user-role"] = str(claims["role"])
+        headers["x-username"] = str(claims.get("sub", ""))
+    return headers
+
+
 # ===== Auth 서비스 프록시 =====
 @gateway_router.api_route("/api/account/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
 async def account_proxy(request: Request, path: str):
@@ -176,6 +326,8 @@ async def account_proxy(request: Request, path: str):
         headers = dict(request.headers)
         headers.pop("host", None)
         headers.pop("content-length", None)
+        headers = _append_forwarded_for(request, headers)
+        headers = await _apply_identity_headers(request, headers)
         
         # account-service는 /api/account/* 경로를 사용하므로 경로 변환
         auth_service_path = f"api/account/{path}"
@@ -234,24 +386,26 @@ async def chatbot_proxy(request: Request, path: str):
         headers = dict(request.headers)
         headers.pop("host", None)
         headers.pop("content-length", None)
+        headers = _append_forwarded_for(request, headers)
+        headers = await _apply_identity_headers(request, headers)
         
         # chatbot-service는 /api/v1/chat/* 경로를 사용하므로 경로 변환
         chatbot_service_path = f"api/v1/chat/{path}"
         
-        response = await _relay(
+        upstream = await _relay_until_disconnected(
+            request,
             method=request.method,
             base_url=base_url,
             path=chatbot_service_path,
             headers=headers,
             body=body,
-            params=dict(request.query_params)
+            params=dict(request.query_params),
+            streaming=_wants_stream(request, path)
         )
+        if upstream is None:
+            return Response(status_code=CLIENT_CLOSED_REQUEST)
         
-        return Response(
-            content=response.content,
-            status_code=response.status_code,
-            headers=dict(response.headers)
-        )
+        return await _respond(*upstream)
         
     except Exception as e:
         logger.error(f"Chatbot 프록시 오류: {e}")
@@ -289,7 +443,7 @@ print("   /api/chatbot/{path:path} vs /{service}/{path:path}")
 # ===== 헬스 및 기본 =====
 @gateway_router.get("/health", summary="API v1 헬스 체크")
 async def api_v1_health_check():
-    return {"status": "healthy!", "version": "v1"}
+    return {"status": "healthy!", "version": "v1", "relay": relay_stats}
 
 
 @app.exception_handler(404)
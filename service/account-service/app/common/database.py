@@ -0,0 +1,236 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+import asyncpg
+
+logger = logging.getLogger("account_service")
+
+# 마지막으로 성공한 SSL 옵션 (매 연결마다 실패하는 옵션부터 시도하지 않도록 기억)
+_SSL_OPTIONS = ['require', True, False, None]
+_working_ssl_option = None
+_ssl_option_known = False
+
+
+def get_asyncpg_dsn(database_url: Optional[str] = None) -> str:
+    """asyncpg 연결용 DSN 정리 (postgres:// 변환, 드라이버 표기/쿼리 파라미터 제거)"""
+    if database_url is None:
+        database_url = os.getenv("DATABASE_URL", "")
+    database_url = database_url.replace("postgresql+asyncpg://", "postgresql://")
+    if "postgres://" in database_url:
+        database_url = database_url.replace("postgres://", "postgresql://")
+    return database_url.split("?")[0]  # 쿼리 파라미터 제거
+
+
+def _ssl_candidates():
+    """시도할 SSL 옵션 순서 (마지막으로 성공한 옵션 우선)"""
+    if not _ssl_option_known:
+        return _SSL_OPTIONS
+    return [_working_ssl_option] + [option for option in _SSL_OPTIONS if option != _working_ssl_option]
+
+
+async def connect_database(conn_str: Optional[str] = None) -> asyncpg.Connection:
+    """데이터베이스 연결 생성 (여러 SSL 옵션 시도)"""
+    global _working_ssl_option, _ssl_option_known
+    conn_str = conn_str or get_asyncpg_dsn()
+    
+    for ssl_option in _ssl_candidates():
+        try:
+            if ssl_option is None:
+                conn = await asyncpg.connect(conn_str)
+            else:
+                conn = await asyncpg.connect(conn_str, ssl=ssl_option)
+            _working_ssl_option, _ssl_option_known = ssl_option, True
+            return conn
+        except Exception as e:
+            logger.warning(f"DB 연결 실패 (SSL: {ssl_option}): {e}")
+            continue
+    raise ConnectionError("모든 연결 방법 실패")
+
+
+# ===== 커넥션 풀 / 읽기 레플리카 라우팅 =====
+
+DATABASE_REPLICA_URLS = os.getenv("DATABASE_REPLICA_URLS", "")
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_MAX_INACTIVE_SECONDS = float(os.getenv("DB_POOL_MAX_INACTIVE_SECONDS", "300"))
+DB_COMMAND_TIMEOUT_SECONDS = float(os.getenv("DB_COMMAND_TIMEOUT_SECONDS", "30"))
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "2"))
+REPLICA_LAG_CHECK_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "5"))
+
+# 레플리카 지연 시간 (프라이머리에 연결되면 0)
+_REPLICA_LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM NOW() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+async def create_database_pool(conn_str: str, min_size: int = DB_POOL_MIN_SIZE,
+                               max_size: int = DB_POOL_MAX_SIZE) -> asyncpg.Pool:
+    """커넥션 풀 생성 (connect_database와 같은 SSL 옵션 순서)"""
+    global _working_ssl_option, _ssl_option_known
+    for ssl_option in _ssl_candidates():
+        try:
+            kwargs = {} if ssl_option is None else {"ssl": ssl_option}
+            pool = await asyncpg.create_pool(
+                conn_str,
+                min_size=min_size,
+                max_size=max_size,
+                max_inactive_connection_lifetime=DB_POOL_MAX_INACTIVE_SECONDS,
+                command_timeout=DB_COMMAND_TIMEOUT_SECONDS,
+                **kwargs,
+            )
+            _working_ssl_option, _ssl_option_known = ssl_option, True
+            return pool
+        except Exception as e:
+            logger.warning(f"DB 풀 생성 실패 (SSL: {ssl_option}): {e}")
+            continue
+    raise ConnectionError("모든 연결 방법 실패")
+
+
+def _mask_dsn(conn_str: str) -> str:
+    """로그/상태 출력용 (계정 정보 제거)"""
+    return conn_str.rsplit("@", 1)[-1]
+
+
+class ReplicaState:
+    def __init__(self, conn_str: str):
+        self.conn_str = conn_str
+        self.name = _mask_dsn(conn_str)
+        self.pool: Optional[asyncpg.Pool] = None
+        self.lag_seconds: Optional[float] = None
+        self.healthy = False
+
+
+class DatabaseRouter:
+    """
+    프라이머리/읽기 레플리카 라우팅
+
+    쓰기는 프라이머리 풀, 읽기 전용 조회는 정상 레플리카 풀을 라운드로빈으로 사용한다.
+    사용자가 자신의 데이터를 쓴 직후에는 READ_YOUR_WRITES_SECONDS 동안 같은 키의
+    읽기를 프라이머리로 보내 방금 쓴 내용을 읽을 수 있게 한다.
+    백그라운드에서 레플리카 지연을 측정해 REPLICA_MAX_LAG_SECONDS를 넘거나 응답이 없으면
+    순환에서 제외하고, 회복되면 다시 포함한다. 정상 레플리카가 없으면 프라이머리에서 읽는다.
+    """
+
+    def __init__(self, primary_url: Optional[str] = None, replica_urls: str = DATABASE_REPLICA_URLS):
+        self.primary_url = get_asyncpg_dsn(primary_url)
+        self.replicas = [
+            ReplicaState(get_asyncpg_dsn(url.strip()))
+            for url in replica_urls.split(",") if url.strip()
+        ]
+        self.primary_pool: Optional[asyncpg.Pool] = None
+        self._sticky_until: Dict[str, float] = {}
+        self._next_replica = 0
+        self._monitor_task: Optional[asyncio.Task] = None
+        self.stats = {"primary_reads": 0, "replica_reads": 0, "sticky_reads": 0}
+
+    async def start(self):
+        """풀 생성 및 레플리카 지연 감시 시작"""
+        if not self.primary_url:
+            logger.warning("⚠️ DATABASE_URL이 설정되지 않아 DB 풀을 만들지 않습니다")
+            return
+        self.primary_pool = await create_database_pool(self.primary_url)
+        logger.info(f"✅ 프라이머리 풀 준비: {_mask_dsn(self.primary_url)} (max={DB_POOL_MAX_SIZE})")
+        if self.replicas:
+            await self._check_replicas()
+            self._monitor_task = asyncio.create_task(self._monitor_replicas())
+
+    async def stop(self):
+        """풀 종료"""
+        if self._monitor_task:
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                pass
+            self._monitor_task = None
+        for replica in self.replicas:
+            if replica.pool is not None:
+                await replica.pool.close()
+                replica.pool = None
+        if self.primary_pool is not None:
+            await self.primary_pool.close()
+            self.primary_pool = None
+
+    def _require_primary(self) -> asyncpg.Pool:
+        if self.primary_pool is None:
+            raise ConnectionError("DB 풀이 준비되지 않았습니다")
+        return self.primary_pool
+
+    def primary(self):
+        """쓰기용 커넥션 (async with)"""
+        return self._require_primary().acquire()
+
+    def replica(self, *sticky_keys: str):
+        """읽기용 커넥션 (async with) - 최근에 쓴 키가 있으면 프라이머리"""
+        now = time.monotonic()
+        if any(self._sticky_until.get(key, 0) > now for key in sticky_keys):
+            self.stats["sticky_reads"] += 1
+            return self.primary()
+
+        healthy = [replica for replica in self.replicas if replica.healthy and replica.pool is not None]
+        if not healthy:
+            self.stats["primary_reads"] += 1
+            return self.primary()
+        self._next_replica = (self._next_replica + 1) % len(healthy)
+        self.stats["replica_reads"] += 1
+        return healthy[self._next_replica].pool.acquire()
+
+    def mark_written(self, *sticky_keys: str):
+        """쓰기 후 짧은 시간 동안 해당 키의 읽기를 프라이머리로 고정"""
+        if not self.replicas:
+            return
+        now = time.monotonic()
+        until = now + READ_YOUR_WRITES_SECONDS
+        for key in sticky_keys:
+            self._sticky_until[key] = until
+        # 만료된 항목 정리
+        if len(self._sticky_until) > 10000:
+            self._sticky_until = {key: value for key, value in self._sticky_until.items() if value > now}
+
+    async def _check_replicas(self):
+        for replica in self.replicas:
+            try:
+                if replica.pool is None:
+                    replica.pool = await create_database_pool(replica.conn_str)
+                async with replica.pool.acquire() as conn:
+                    replica.lag_seconds = float(await conn.fetchval(_REPLICA_LAG_QUERY, timeout=2))
+                healthy = replica.lag_seconds <= REPLICA_MAX_LAG_SECONDS
+            except Exception as e:
+                logger.warning(f"⚠️ 레플리카 상태 확인 실패 ({replica.name}): {e}")
+                replica.lag_seconds = None
+                healthy = False
+            if healthy != replica.healthy:
+                state = "순환 포함" if healthy else "순환 제외"
+                logger.warning(f"🔁 레플리카 {replica.name} {state} (지연: {replica.lag_seconds}s)")
+            replica.healthy = healthy
+
+    async def _monitor_replicas(self):
+        while True:
+            await asyncio.sleep(REPLICA_LAG_CHECK_SECONDS)
+            await self._check_replicas()
+
+    def status(self) -> Dict:
+        return {
+            "primary": "connected" if self.primary_pool is not None else "disconnected",
+            "pool": {
+                "size": self.primary_pool.get_size(),
+                "idle": self.primary_pool.get_idle_size(),
+                "max": self.primary_pool.get_max_size(),
+            } if self.primary_pool is not None else None,
+            "replicas": [
+                {"name": replica.name, "healthy": replica.healthy, "lag_seconds": replica.lag_seconds}
+                for replica in self.replicas
+            ],
+            **self.stats,
+        }
+
+
+database = DatabaseRouter()
@@ -1,87 +1,65 @@
 from fastapi import HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials
+from typing import AsyncIterator, Optional
+from datetime import datetime, timezone
+import asyncio
 import logging
-import asyncpg
+import base64
+import time
 import os
 
-from app.domain.user.service.user_service import UserService
+from app.common.database import database
+from app.domain.user.service.user_service import UserService, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.domain.user.service.token_revocation_service import token_revocation_list
+from app.domain.user.service import login_throttle_service
+from app.domain.user.service.login_throttle_service import login_throttle
+from app.domain.user.service.login_activity_service import login_activity_recorder
+from app.domain.user.service.availability_service import user_availability_index
 from app.domain.user.repository.user_repository import UserRepository
-from app.domain.user.model.user_model import UserCreate, UserLogin, UserResponse, TokenResponse
+from app.domain.user.entity.user_entity import UserEntity
+from app.domain.user.service import bulk_provision_service
+from app.domain.user.model.user_model import (
+    UserCreate, UserLogin, UserResponse, TokenResponse, LogoutRequest, BulkUserConflict, BulkProvisionResponse,
+    CompanyUserPage, AvailabilityResponse
+)
 
 logger = logging.getLogger("account_service")
 
 class UserController:
-    def __init__(self):
-        self.database_url = os.getenv("DATABASE_URL", "")
-        if "postgres://" in self.database_url:
-            self.database_url = self.database_url.replace("postgres://", "postgresql://")
-        self.conn_str = self.database_url.split("?")[0]  # 쿼리 파라미터 제거
-    
-    async def _get_db_connection(self):
-        """데이터베이스 연결 생성"""
-        try:
-            # 여러 SSL 옵션 시도해서 연결
-            for ssl_option in ['require', True, False, None]:
-                try:
-                    if ssl_option is None:
-                        conn = await asyncpg.connect(self.conn_str)
-                    else:
-                        conn = await asyncpg.connect(self.conn_str, ssl=ssl_option)
-                    return conn
-                except Exception as e:
-                    logger.warning(f"DB 연결 실패 (SSL: {ssl_option}): {e}")
-                    continue
-            raise Exception("모든 연결 방법 실패")
-        except Exception as e:
-            logger.error(f"데이터베이스 연결 오류: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="데이터베이스 연결 실패"
-            )
+    def __init__(self, user_repository: Optional[UserRepository] = None):
+        self.user_repository = user_repository or UserRepository()
+        self.user_service = UserService()
     
     async def register_user(self, user_data: UserCreate) -> UserResponse:
         """사용자 회원가입"""
         try:
-            conn = await self._get_db_connection()
-            
-            # 사용자명 중복 체크
-            existing = await conn.fetchval(
-                "SELECT id FROM users WHERE username = $1 OR email = $2",
-                user_data.username, user_data.email
-            )
-            
-            if existing:
-                await conn.close()
+            # 사용자명/이메일 중복 체크
+            if await self.user_repository.exists_username_or_email(user_data.username, user_data.email):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="사용자명 또는 이메일이 이미 존재합니다."
                 )
             
-            # 비밀번호 해싱
-            from passlib.context import CryptContext
-            pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-            hashed_password = pwd_context.hash(user_data.password)
-            
-            # 사용자 생성
-            result = await conn.fetchrow("""
-                INSERT INTO users (username, email, password_hash, company_id, role)
-                VALUES ($1, $2, $3, $4, $5)
-                RETURNING id, username, email, company_id, role, is_active, created_at, updated_at
-            """, user_data.username, user_data.email, hashed_password, 
-                user_data.company_id, user_data.role)
+            # 비밀번호 해싱 (이벤트 루프를 막지 않도록 스레드에서 실행)
+            hashed_password = await asyncio.to_thread(self.user_service.hash_password, user_data.password)
             
-            await conn.close()
+            # 사용자 생성 (동시에 같은 이름으로 가입하면 None)
+            # 자가 가입은 회사 없이 일반 사용자로만 만든다 (회사/역할은 관리자 일괄 등록에서 정한다)
+            user = await self.user_repository.create_user(UserEntity(
+                username=user_data.username,
+                email=user_data.email,
+                password_hash=hashed_password,
+                company_id=None,
+                role="user"
+            ))
+            if user is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="사용자명 또는 이메일이 이미 존재합니다."
+                )
+            user_availability_index.add(user['username'], user['email'])
             
-            return UserResponse(
-                id=result['id'],
-                username=result['username'],
-                email=result['email'],
-                company_id=result['company_id'],
-                role=result['role'],
-                is_active=result['is_active'],
-                created_at=result['created_at'],
-                updated_at=result['updated_at']
-            )
+            return UserResponse.model_validate(user)
             
         except HTTPException:
             raise
@@ -92,65 +70,56 @@ class UserController:
                 detail="회원가입 중 오류가 발생했습니다."
             )
     
-    async def login_user(self, login_data: UserLogin) -> TokenResponse:
+    async def login_user(self, login_data: UserLogin, client_ip: Optional[str] = None) -> TokenResponse:
         """사용자 로그인"""
-        try:
-            conn = await self._get_db_connection()
-            
-            # 사용자 조회
-            user = await conn.fetchrow(
-                "SELECT * FROM users WHERE username = $1 AND is_active = true",
-                login_data.username
+        # 사용자명/IP별 시도 이력에 따른 지연·잠금 (bcrypt 실행 전에 거절)
+        # 허용된 시도는 여기서 바로 실패로 예약하고 성공하면 되돌린다 (동시 요청이 모두 통과하지 않도록)
+        decision = await login_throttle.reserve(login_data.username, client_ip)
+        if not decision.allowed:
+            retry_after = max(1, int(decision.retry_after + 0.999))
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="로그인 시도가 너무 많습니다. 잠시 후 다시 시도해주세요.",
+                headers={"Retry-After": str(retry_after)}
             )
+        
+        try:
+            # 사용자 조회 (읽기 레플리카, 방금 가입한 사용자는 프라이머리)
+            user = await self.user_repository.get_user_by_username(login_data.username, active_only=True)
             
             if not user:
-                await conn.close()
+                # 존재하지 않는 사용자: bcrypt 없이 동일한 시간 후 거절
+                await login_throttle_service.reject_unknown_user()
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="잘못된 사용자명 또는 비밀번호입니다."
                 )
             
-            # 비밀번호 검증
-            from passlib.context import CryptContext
-            pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-            
-            if not pwd_context.verify(login_data.password, user['password_hash']):
-                await conn.close()
+            # 비밀번호 검증 (이벤트 루프를 막지 않도록 스레드에서 실행)
+            if not await login_throttle_service.verify_password(login_data.password, user['password_hash']):
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="잘못된 사용자명 또는 비밀번호입니다."
                 )
             
-            # JWT 토큰 생성
-            from jose import jwt
-            from datetime import datetime, timedelta
+            await login_throttle.refund(login_data.username, client_ip, decision.attempt)
+            # last_login_at/로그인 횟수/감사 이벤트는 응답 경로 밖에서 일괄 기록
+            login_activity_recorder.record(user['id'], user['username'], client_ip)
             
-            SECRET_KEY = os.getenv("SECRET_KEY") or os.getenv("JWT_SECRET", "your-secret-key-here")
-            ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
-            ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+            user_response = UserResponse.model_validate(user)
             
-            access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-            expire = datetime.utcnow() + access_token_expires
-            
-            to_encode = {"sub": user['username'], "exp": expire}
-            access_token = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-            
-            await conn.close()
-            
-            user_response = UserResponse(
-                id=user['id'],
-                username=user['username'],
-                email=user['email'],
-                company_id=user['company_id'],
-                role=user['role'],
-                is_active=user['is_active'],
-                created_at=user['created_at'],
-                updated_at=user['updated_at']
+            # JWT 토큰 생성 (사용자 클레임 포함) + 리프레시 토큰 발급
+            access_token = self.user_service.create_access_token(
+                self.user_service.build_access_claims(user_response)
             )
+            async with database.primary() as conn:
+                refresh_token = await self._issue_refresh_token(conn, user_response.id)
             
             return TokenResponse(
                 access_token=access_token,
                 token_type="bearer",
+                refresh_token=refresh_token,
+                expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
                 user=user_response
             )
             
@@ -163,62 +132,365 @@ class UserController:
                 detail="로그인 중 오류가 발생했습니다."
             )
     
+    async def _verify_access_token(self, token: str) -> dict:
+        """액세스 토큰 검증 (서명/만료 + 폐기 여부, users 테이블 조회 없음)"""
+        payload = self.user_service.verify_token(token)
+        if payload is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="유효하지 않은 토큰입니다."
+            )
+        if await token_revocation_list.is_revoked(payload.get("jti")):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="폐기된 토큰입니다."
+            )
+        return payload
+    
+    async def _require_admin(self, credentials: HTTPAuthorizationCredentials) -> dict:
+        """회사에 소속된 관리자 토큰만 허용"""
+        payload = await self._verify_access_token(credentials.credentials)
+        if payload.get("role") != "admin" or not payload.get("cid"):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="관리자 권한이 필요합니다."
+            )
+        return payload
+    
     async def get_current_user(self, credentials: HTTPAuthorizationCredentials) -> UserResponse:
         """현재 사용자 정보 조회"""
         try:
-            token = credentials.credentials
+            payload = await self._verify_access_token(credentials.credentials)
             
-            # JWT 토큰 검증
-            from jose import JWTError, jwt
+            # 사용자 정보 조회 (uid 클레임이 있으면 기본키로 조회, 읽기 레플리카 사용)
+            if payload.get("uid") is not None:
+                user = await self.user_repository.get_user_by_id(payload["uid"], active_only=True)
+            else:
+                user = await self.user_repository.get_user_by_username(payload["sub"], active_only=True)
             
-            SECRET_KEY = os.getenv("SECRET_KEY") or os.getenv("JWT_SECRET", "your-secret-key-here")
-            ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
-            
-            try:
-                payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-                username: str = payload.get("sub")
-                if username is None:
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="유효하지 않은 토큰입니다."
-                    )
-            except JWTError:
+            if not user:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="유효하지 않은 토큰입니다."
+                    detail="사용자를 찾을 수 없습니다."
                 )
             
-            # 사용자 정보 조회
-            conn = await self._get_db_connection()
-            user = await conn.fetchrow(
-                "SELECT * FROM users WHERE username = $1 AND is_active = true",
-                username
+            return UserResponse.model_validate(user)
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"사용자 정보 조회 오류: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="인증에 실패했습니다."
+            )
+    
+    async def _issue_refresh_token(self, conn, user_id: int, family_id: Optional[str] = None) -> str:
+        """리프레시 토큰 발급 및 저장"""
+        refresh_token, claims = self.user_service.create_refresh_token(user_id, family_id)
+        await conn.execute("""
+            INSERT INTO refresh_tokens (jti, family_id, user_id, expires_at)
+            VALUES ($1, $2, $3, $4)
+        """, claims["jti"], claims["fid"], user_id, claims["exp"].replace(tzinfo=timezone.utc))
+        return refresh_token
+    
+    async def refresh_tokens(self, refresh_token: str) -> TokenResponse:
+        """리프레시 토큰 회전 (사용된 토큰 재사용 시 같은 계열 전체 폐기)"""
+        payload = self.user_service.verify_token(refresh_token, expected_type="refresh")
+        if payload is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="유효하지 않은 리프레시 토큰입니다."
             )
+        
+        try:
+            async with database.primary() as conn:
+                reused = False
+                user = None
+                new_refresh_token = None
             
-            await conn.close()
+                async with conn.transaction():
+                    stored = await conn.fetchrow(
+                        "SELECT family_id, user_id, used_at, revoked_at FROM refresh_tokens WHERE jti = $1 FOR UPDATE",
+                        payload["jti"]
+                    )
+                    if stored and stored['revoked_at'] is None:
+                        if stored['used_at'] is not None:
+                            # 이미 회전된 토큰의 재사용 → 탈취로 간주하고 계열 전체 폐기
+                            await conn.execute(
+                                "UPDATE refresh_tokens SET revoked_at = NOW() WHERE family_id = $1 AND revoked_at IS NULL",
+                                stored['family_id']
+                            )
+                            reused = True
+                        else:
+                            user = await conn.fetchrow(
+                                "SELECT * FROM users WHERE id = $1 AND is_active = true",
+                                stored['user_id']
+                            )
+                            if user:
+                                await conn.execute(
+                                    "UPDATE refresh_tokens SET used_at = NOW() WHERE jti = $1",
+                                    payload["jti"]
+                                )
+                                new_refresh_token = await self._issue_refresh_token(
+                                    conn, user['id'], stored['family_id']
+                                )
             
-            if not user:
+            if reused:
+                logger.warning(f"⚠️ 리프레시 토큰 재사용 감지: user_id={stored['user_id']}")
+            if user is None:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="사용자를 찾을 수 없습니다."
+                    detail="유효하지 않은 리프레시 토큰입니다."
                 )
             
-            return UserResponse(
-                id=user['id'],
-                username=user['username'],
-                email=user['email'],
-                company_id=user['company_id'],
-                role=user['role'],
-                is_active=user['is_active'],
-                created_at=user['created_at'],
-                updated_at=user['updated_at']
+            user_response = UserResponse(**{key: user[key] for key in UserResponse.model_fields})
+            access_token = self.user_service.create_access_token(
+                self.user_service.build_access_claims(user_response)
+            )
+            return TokenResponse(
+                access_token=access_token,
+                token_type="bearer",
+                refresh_token=new_refresh_token,
+                expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+                user=user_response
             )
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"사용자 정보 조회 오류: {e}")
+            logger.error(f"토큰 갱신 오류: {e}")
             raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="인증에 실패했습니다."
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="토큰 갱신 중 오류가 발생했습니다."
+            )
+    
+    async def logout_user(self, credentials: HTTPAuthorizationCredentials,
+                          logout_data: Optional[LogoutRequest] = None) -> dict:
+        """로그아웃 (액세스 토큰 폐기 + 리프레시 토큰 계열 폐기)"""
+        payload = await self._verify_access_token(credentials.credentials)
+        
+        try:
+            async with database.primary() as conn:
+                expires_at = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+                await token_revocation_list.revoke(conn, payload["jti"], expires_at)
+            
+                if logout_data and logout_data.refresh_token:
+                    refresh_payload = self.user_service.verify_token(logout_data.refresh_token, expected_type="refresh")
+                    if refresh_payload and refresh_payload.get("uid") == payload.get("uid"):
+                        await conn.execute(
+                            "UPDATE refresh_tokens SET revoked_at = NOW() WHERE family_id = $1 AND revoked_at IS NULL",
+                            refresh_payload["fid"]
+                        )
+            
+            return {"message": "로그아웃되었습니다."}
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"로그아웃 오류: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="로그아웃 중 오류가 발생했습니다."
+            )
+    
+    async def bulk_register_users(self, credentials: HTTPAuthorizationCredentials, chunks: AsyncIterator[bytes],
+                                  content_length: Optional[str], content_type: Optional[str],
+                                  format_hint: Optional[str] = None) -> BulkProvisionResponse:
+        """사용자 일괄 등록 (CSV/NDJSON → COPY 스테이징 → users 병합, 관리자 회사 소속으로만 등록)"""
+        # 행마다 bcrypt 비용이 들므로 인증·권한 확인을 본문 읽기/파싱보다 먼저 한다
+        admin = await self._require_admin(credentials)
+        start_time = time.perf_counter()
+        try:
+            body = await bulk_provision_service.read_payload(chunks, content_length)
+            data_format = bulk_provision_service.detect_format(content_type, format_hint)
+            rows, conflicts, total_rows = bulk_provision_service.parse_bulk_payload(
+                body, data_format, admin["cid"]
+            )
+        except OverflowError as e:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+        except (ValueError, UnicodeDecodeError) as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        
+        try:
+            async with database.primary() as conn:
+                # 이미 존재하는 사용자명/이메일은 해싱 전에 걸러낸다 (bcrypt 비용 절약)
+                if rows:
+                    existing = await conn.fetch(
+                        "SELECT username, email FROM users WHERE username = ANY($1::text[]) OR email = ANY($2::text[])",
+                        [row['username'] for row in rows], [row['email'] for row in rows]
+                    )
+                    taken_usernames = {record['username'] for record in existing}
+                    taken_emails = {record['email'] for record in existing}
+                    remaining = []
+                    for row in rows:
+                        if row['username'] in taken_usernames or row['email'] in taken_emails:
+                            conflicts.append(self._bulk_conflict(row, taken_usernames))
+                        else:
+                            remaining.append(row)
+                    rows = remaining
+            
+                created = 0
+                if rows:
+                    # 비밀번호 병렬 해싱
+                    hashes = await bulk_provision_service.hash_passwords([row['password'] for row in rows])
+                    records = [
+                        (row['row_no'], row['username'], row['email'], password_hash, row['company_id'], row['role'])
+                        for row, password_hash in zip(rows, hashes)
+                    ]
+                
+                    async with conn.transaction():
+                        await conn.execute("""
+                            CREATE TEMP TABLE users_staging (
+                                row_no INTEGER PRIMARY KEY,
+                                username VARCHAR(50) NOT NULL,
+                                email VARCHAR(100) NOT NULL,
+                                password_hash VARCHAR(255) NOT NULL,
+                                company_id VARCHAR(100),
+                                role VARCHAR(20) NOT NULL
+                            ) ON COMMIT DROP
+                        """)
+                        await conn.copy_records_to_table(
+                            "users_staging",
+                            records=records,
+                            columns=["row_no", "username", "email", "password_hash", "company_id", "role"]
+                        )
+                        inserted = await conn.fetch("""
+                            INSERT INTO users (username, email, password_hash, company_id, role)
+                            SELECT username, email, password_hash, company_id, role
+                            FROM users_staging
+                            ORDER BY row_no
+                            ON CONFLICT DO NOTHING
+                            RETURNING username, email
+                        """)
+                        created = len(inserted)
+                        for record in inserted:
+                            user_availability_index.add(record['username'], record['email'])
+                    
+                        # 사전 검사 이후 동시에 생성된 사용자와의 충돌
+                        if created < len(rows):
+                            inserted_usernames = {record['username'] for record in inserted}
+                            lost = [row for row in rows if row['username'] not in inserted_usernames]
+                            taken = await conn.fetch(
+                                "SELECT username FROM users WHERE username = ANY($1::text[])",
+                                [row['username'] for row in lost]
+                            )
+                            taken_usernames = {record['username'] for record in taken}
+                            conflicts.extend(self._bulk_conflict(row, taken_usernames) for row in lost)
+            
+            elapsed = time.perf_counter() - start_time
+            users_per_second = created / elapsed if elapsed > 0 else 0.0
+            logger.info(
+                f"📦 일괄 등록 완료: {created}/{total_rows}명 생성, 충돌 {len(conflicts)}건, "
+                f"{elapsed:.2f}s ({users_per_second:.1f} users/sec)"
+            )
+            
+            return BulkProvisionResponse(
+                total_rows=total_rows,
+                created=created,
+                conflicts=sorted(conflicts, key=lambda conflict: conflict.row),
+                elapsed_seconds=round(elapsed, 4),
+                users_per_second=round(users_per_second, 2)
+            )
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"일괄 등록 오류: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="일괄 등록 중 오류가 발생했습니다."
+            )
+    
+    async def check_availability(self, username: Optional[str] = None,
+                                 email: Optional[str] = None) -> AvailabilityResponse:
+        """사용자명/이메일 사용 가능 여부 (대부분 메모리 인덱스로 응답)"""
+        if not username and not email:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="username 또는 email 중 하나는 필요합니다."
+            )
+        try:
+            result = await user_availability_index.check(username, email)
+            return AvailabilityResponse(username=username, email=email, **result)
+        except Exception as e:
+            logger.error(f"가용성 확인 오류: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="가용성 확인 중 오류가 발생했습니다."
+            )
+    
+    @staticmethod
+    def _bulk_conflict(row: dict, taken_usernames: set) -> BulkUserConflict:
+        """기존 사용자와 충돌한 행을 충돌 정보로 변환"""
+        reason = "username_exists" if row['username'] in taken_usernames else "email_exists"
+        return BulkUserConflict(row=row['row_no'], username=row['username'], email=row['email'], reason=reason)
+    
+    async def list_company_users(self, credentials: HTTPAuthorizationCredentials, company_id: str,
+                                 cursor: Optional[str] = None, limit: int = 50,
+                                 role: Optional[str] = None, is_active: Optional[bool] = None) -> CompanyUserPage:
+        """회사별 사용자 디렉터리 조회 (keyset 페이지네이션, 토큰의 회사와 같은 회사만)"""
+        payload = await self._verify_access_token(credentials.credentials)
+        if not payload.get("cid") or payload["cid"] != company_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="다른 회사의 사용자 목록은 조회할 수 없습니다."
+            )
+        after_id = self._decode_cursor(cursor)
+        
+        try:
+            async with database.replica() as conn:
+                # (company_id, id) 인덱스를 따라 커서 이후 limit+1 건만 읽는다
+                records = await conn.fetch("""
+                    SELECT id, username, email, company_id, role, is_active, created_at, updated_at
+                    FROM users
+                    WHERE company_id = $1
+                      AND id > $2
+                      AND ($3::varchar IS NULL OR role = $3)
+                      AND ($4::boolean IS NULL OR is_active = $4)
+                    ORDER BY id
+                    LIMIT $5
+                """, company_id, after_id, role, is_active, limit + 1)
+            
+                approximate_total = await conn.fetchval(
+                    "SELECT user_count FROM company_user_counts WHERE company_id = $1",
+                    company_id
+                )
+            
+            has_more = len(records) > limit
+            records = records[:limit]
+            next_cursor = self._encode_cursor(records[-1]['id']) if has_more else None
+            
+            return CompanyUserPage(
+                items=[UserResponse(**dict(record)) for record in records],
+                next_cursor=next_cursor,
+                approximate_total=approximate_total or 0
+            )
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"회사 사용자 목록 조회 오류: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="회사 사용자 목록 조회 중 오류가 발생했습니다."
+            )
+    
+    @staticmethod
+    def _encode_cursor(last_id: int) -> str:
+        """마지막 사용자 id를 불투명 커서로 변환"""
+        return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+    
+    @staticmethod
+    def _decode_cursor(cursor: Optional[str]) -> int:
+        """커서를 마지막 사용자 id로 변환 (없으면 처음부터)"""
+        if not cursor:
+            return 0
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            return int(base64.urlsafe_b64decode(padded.encode()).decode())
+        except (ValueError, UnicodeDecodeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="유효하지 않은 커서입니다."
             )
@@ -1,3 +1,25 @@
-from .user_model import UserCreate, UserLogin, UserResponse, TokenResponse
+from .user_model import (
+    UserCreate,
+    UserLogin,
+    UserResponse,
+    TokenResponse,
+    RefreshTokenRequest,
+    LogoutRequest,
+    BulkUserConflict,
+    BulkProvisionResponse,
+    CompanyUserPage,
+    AvailabilityResponse
+)
 
-__all__ = ["UserCreate", "UserLogin", "UserResponse", "TokenResponse"]
+__all__ = [
+    "UserCreate",
+    "UserLogin",
+    "UserResponse",
+    "TokenResponse",
+    "RefreshTokenRequest",
+    "LogoutRequest",
+    "BulkUserConflict",
+    "BulkProvisionResponse",
+    "CompanyUserPage",
+    "AvailabilityResponse"
+]
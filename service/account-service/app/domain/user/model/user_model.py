@@ -1,7 +1,7 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Index
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -19,14 +19,20 @@ class UserModel(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    last_login_at = Column(DateTime(timezone=True), nullable=True)
+    login_count = Column(Integer, default=0, nullable=False)
+    
+    __table_args__ = (
+        # 회사별 사용자 디렉터리 (keyset 페이지네이션)
+        Index("idx_users_company_id_id", "company_id", "id"),
+    )
 
 # Pydantic 모델들
 class UserCreate(BaseModel):
+    """자가 가입 요청 (역할/회사는 토큰 클레임이 되므로 받지 않는다, 회사 배정은 관리자 일괄 등록으로)"""
     username: str
     email: str
     password: str
-    company_id: Optional[str] = None
-    role: str = "user"
 
 class UserLogin(BaseModel):
     username: str
@@ -48,4 +54,38 @@ class UserResponse(BaseModel):
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
     user: UserResponse
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+
+
+class BulkUserConflict(BaseModel):
+    row: int
+    username: Optional[str] = None
+    email: Optional[str] = None
+    reason: str  # invalid | duplicate_in_batch | username_exists | email_exists
+    detail: Optional[str] = None
+
+class BulkProvisionResponse(BaseModel):
+    total_rows: int
+    created: int
+    conflicts: List[BulkUserConflict]
+    elapsed_seconds: float
+    users_per_second: float
+
+class CompanyUserPage(BaseModel):
+    items: List[UserResponse]
+    next_cursor: Optional[str] = None
+    approximate_total: int  # 필터와 무관한 회사 전체 사용자 수 (카운터 테이블 기준)
+
+class AvailabilityResponse(BaseModel):
+    username: Optional[str] = None
+    username_available: Optional[bool] = None
+    email: Optional[str] = None
+    email_available: Optional[bool] = None
@@ -1,100 +1,102 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from typing import Optional
 import logging
 
-from ..model.user_model import UserModel
+import asyncpg
+
+from app.common.database import database, DatabaseRouter
 from ..entity.user_entity import UserEntity
 
 logger = logging.getLogger("account_service")
 
+# 조회 시 반환하는 users 컬럼
+USER_COLUMNS = "id, username, email, password_hash, company_id, role, is_active, created_at, updated_at"
+
+# update_user로 변경 가능한 컬럼
+UPDATABLE_COLUMNS = ("email", "password_hash", "company_id", "role", "is_active")
+
 class UserRepository:
-    def __init__(self, session: AsyncSession):
-        self.session = session
-    
-    async def create_user(self, user_entity: UserEntity) -> Optional[UserModel]:
-        """새 사용자 생성"""
+    """
+    users 테이블 접근 (asyncpg 커넥션 풀)
+
+    쓰기는 프라이머리, 조회는 읽기 레플리카를 사용하며 방금 쓴 사용자의 조회는
+    DatabaseRouter가 프라이머리로 보낸다. 조회 결과는 컬럼명 → 값 dict로 반환한다.
+    """
+
+    def __init__(self, db: DatabaseRouter = database):
+        self.db = db
+
+    async def create_user(self, user_entity: UserEntity) -> Optional[dict]:
+        """새 사용자 생성 (사용자명/이메일 중복이면 None)"""
         try:
-            db_user = UserModel(
-                username=user_entity.username,
-                email=user_entity.email,
-                password_hash=user_entity.password_hash,
-                company_id=user_entity.company_id,
-                role=user_entity.role
-            )
-            self.session.add(db_user)
-            await self.session.commit()
-            await self.session.refresh(db_user)
-            return db_user
-        except Exception as e:
-            logger.error(f"사용자 생성 오류: {e}")
-            await self.session.rollback()
+            async with self.db.primary() as conn:
+                record = await conn.fetchrow(f"""
+                    INSERT INTO users (username, email, password_hash, company_id, role)
+                    VALUES ($1, $2, $3, $4, $5)
+                    RETURNING {USER_COLUMNS}
+                """, user_entity.username, user_entity.email, user_entity.password_hash,
+                    user_entity.company_id, user_entity.role)
+        except asyncpg.UniqueViolationError:
             return None
-    
-    async def get_user_by_username(self, username: str) -> Optional[UserModel]:
+        self.db.mark_written(f"user:{record['id']}", f"username:{record['username']}")
+        return dict(record)
+
+    async def exists_username_or_email(self, username: str, email: str) -> bool:
+        """사용자명 또는 이메일 사용 여부 (쓰기 직전 확인이므로 프라이머리)"""
+        async with self.db.primary() as conn:
+            return await conn.fetchval(
+                "SELECT EXISTS (SELECT 1 FROM users WHERE username = $1 OR email = $2)",
+                username, email
+            )
+
+    async def get_user_by_username(self, username: str, active_only: bool = False) -> Optional[dict]:
         """사용자명으로 사용자 조회"""
-        try:
-            result = await self.session.execute(
-                select(UserModel).where(UserModel.username == username)
+        async with self.db.replica(f"username:{username}") as conn:
+            record = await conn.fetchrow(
+                f"SELECT {USER_COLUMNS} FROM users WHERE username = $1 AND ($2 = false OR is_active)",
+                username, active_only
             )
-            return result.scalar_one_or_none()
-        except Exception as e:
-            logger.error(f"사용자명 조회 오류: {e}")
-            return None
-    
-    async def get_user_by_email(self, email: str) -> Optional[UserModel]:
+        return dict(record) if record else None
+
+    async def get_user_by_email(self, email: str) -> Optional[dict]:
         """이메일로 사용자 조회"""
-        try:
-            result = await self.session.execute(
-                select(UserModel).where(UserModel.email == email)
-            )
-            return result.scalar_one_or_none()
-        except Exception as e:
-            logger.error(f"이메일 조회 오류: {e}")
-            return None
-    
-    async def get_user_by_id(self, user_id: int) -> Optional[UserModel]:
+        async with self.db.replica() as conn:
+            record = await conn.fetchrow(f"SELECT {USER_COLUMNS} FROM users WHERE email = $1", email)
+        return dict(record) if record else None
+
+    async def get_user_by_id(self, user_id: int, active_only: bool = False) -> Optional[dict]:
         """ID로 사용자 조회"""
-        try:
-            result = await self.session.execute(
-                select(UserModel).where(UserModel.id == user_id)
+        async with self.db.replica(f"user:{user_id}") as conn:
+            record = await conn.fetchrow(
+                f"SELECT {USER_COLUMNS} FROM users WHERE id = $1 AND ($2 = false OR is_active)",
+                user_id, active_only
             )
-            return result.scalar_one_or_none()
-        except Exception as e:
-            logger.error(f"ID 조회 오류: {e}")
-            return None
-    
-    async def verify_user_credentials(self, username: str, password_hash: str) -> Optional[UserModel]:
+        return dict(record) if record else None
+
+    async def verify_user_credentials(self, username: str, password_hash: str) -> Optional[dict]:
         """사용자 인증 정보 확인"""
-        try:
-            result = await self.session.execute(
-                select(UserModel).where(
-                    UserModel.username == username,
-                    UserModel.password_hash == password_hash,
-                    UserModel.is_active == True
-                )
+        async with self.db.replica(f"username:{username}") as conn:
+            record = await conn.fetchrow(
+                f"SELECT {USER_COLUMNS} FROM users WHERE username = $1 AND password_hash = $2 AND is_active",
+                username, password_hash
             )
-            return result.scalar_one_or_none()
-        except Exception as e:
-            logger.error(f"인증 정보 확인 오류: {e}")
-            return None
-    
-    async def update_user(self, user_id: int, update_data: dict) -> Optional[UserModel]:
+        return dict(record) if record else None
+
+    async def update_user(self, user_id: int, update_data: dict) -> Optional[dict]:
         """사용자 정보 업데이트"""
+        columns = [key for key in update_data if key in UPDATABLE_COLUMNS]
+        if not columns:
+            return await self.get_user_by_id(user_id)
+        assignments = ", ".join(f"{column} = ${index}" for index, column in enumerate(columns, start=2))
         try:
-            result = await self.session.execute(
-                select(UserModel).where(UserModel.id == user_id)
-            )
-            user = result.scalar_one_or_none()
-            if user:
-                for key, value in update_data.items():
-                    if hasattr(user, key):
-                        setattr(user, key, value)
-                await self.session.commit()
-                await self.session.refresh(user)
-                return user
-            return None
-        except Exception as e:
+            async with self.db.primary() as conn:
+                record = await conn.fetchrow(f"""
+                    UPDATE users SET {assignments}, updated_at = NOW()
+                    WHERE id = $1
+                    RETURNING {USER_COLUMNS}
+                """, user_id, *(update_data[column] for column in columns))
+        except asyncpg.UniqueViolationError as e:
             logger.error(f"사용자 업데이트 오류: {e}")
-            await self.session.rollback()
             return None
+        if record:
+            self.db.mark_written(f"user:{user_id}", f"username:{record['username']}")
+        return dict(record) if record else None
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import timedelta
+from typing import Dict, Optional
+
+from app.common.bloom_filter import BloomFilter
+from app.common.database import database
+
+logger = logging.getLogger("account_service")
+
+# 사용자명/이메일 가용성 인덱스 설정
+AVAILABILITY_FILTER_CAPACITY = int(os.getenv("AVAILABILITY_FILTER_CAPACITY", "100000"))
+AVAILABILITY_FILTER_ERROR_RATE = float(os.getenv("AVAILABILITY_FILTER_ERROR_RATE", "0.001"))
+AVAILABILITY_REFRESH_SECONDS = int(os.getenv("AVAILABILITY_REFRESH_SECONDS", "30"))
+# 증분 반영은 직전 반영 시각보다 이만큼 앞선 created_at부터 다시 읽는다 (늦게 커밋된 트랜잭션 대비)
+AVAILABILITY_REFRESH_OVERLAP_SECONDS = int(os.getenv("AVAILABILITY_REFRESH_OVERLAP_SECONDS", "300"))
+# 겹침 구간보다 오래 걸린 트랜잭션까지 반영하도록 주기적으로 전체를 다시 구성
+AVAILABILITY_REBUILD_SECONDS = int(os.getenv("AVAILABILITY_REBUILD_SECONDS", "3600"))
+
+
+def _username_key(username: str) -> str:
+    return f"u:{username}"
+
+
+def _email_key(email: str) -> str:
+    return f"e:{email}"
+
+
+class UserAvailabilityIndex:
+    """
+    사용자명/이메일 가용성 인덱스
+
+    시작 시 users 테이블을 스트리밍해 블룸 필터를 만들고, 가입 시 바로 추가한다.
+    필터가 "없음"이라고 답하면 DB 없이 사용 가능으로 응답하고, "있을 수도 있음"일 때만
+    users를 조회한다. 다른 레플리카에서 가입한 사용자는 주기적으로 직전 반영 시각 이후
+    created_at만 읽어 반영하며, 이 사이의 짧은 지연은 회원가입 시 중복 검사가 최종적으로 막는다.
+
+    SERIAL id나 created_at(트랜잭션 시작 시각)은 커밋 순서와 다를 수 있다. 그래서 마지막 id 대신
+    AVAILABILITY_REFRESH_OVERLAP_SECONDS만큼 겹쳐 읽고, 그보다 오래 걸린 트랜잭션은
+    AVAILABILITY_REBUILD_SECONDS마다 하는 전체 재구성으로 반영한다.
+    """
+
+    def __init__(self):
+        self._filter = BloomFilter(AVAILABILITY_FILTER_CAPACITY, AVAILABILITY_FILTER_ERROR_RATE)
+        self._rebuilding: Optional[BloomFilter] = None
+        self._swept_at = None  # 마지막 반영 시점의 DB 시각
+        self._rebuilt_at = 0.0
+        self._ready = False
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"checks": 0, "filter_negatives": 0, "db_lookups": 0}
+
+    async def start(self):
+        """필터 초기 로드 및 증분 반영 작업 시작"""
+        try:
+            await self._rebuild()
+        except Exception as e:
+            logger.warning(f"⚠️ 가용성 인덱스 초기 로드 실패 (DB 조회로 대체): {e}")
+        self._task = asyncio.create_task(self._maintain())
+
+    async def stop(self):
+        """증분 반영 작업 종료"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def add(self, username: str, email: str):
+        """새로 가입한 사용자 반영"""
+        for bloom in (self._filter, self._rebuilding):
+            if bloom is not None:
+                bloom.add(_username_key(username))
+                bloom.add(_email_key(email))
+
+    async def check(self, username: Optional[str] = None, email: Optional[str] = None) -> Dict[str, Optional[bool]]:
+        """사용 가능 여부 (요청하지 않은 항목은 None)"""
+        result: Dict[str, Optional[bool]] = {"username_available": None, "email_available": None}
+        to_lookup = {}
+        if username:
+            if self._maybe_taken(_username_key(username)):
+                to_lookup["username"] = username
+            else:
+                result["username_available"] = True
+        if email:
+            if self._maybe_taken(_email_key(email)):
+                to_lookup["email"] = email
+            else:
+                result["email_available"] = True
+
+        if to_lookup:
+            # 필터 양성(오탐 가능)인 항목만 한 번의 쿼리로 확인
+            self.stats["db_lookups"] += 1
+            async with database.replica() as conn:
+                record = await conn.fetchrow("""
+                    SELECT
+                        EXISTS (SELECT 1 FROM users WHERE username = $1) AS username_taken,
+                        EXISTS (SELECT 1 FROM users WHERE email = $2) AS email_taken
+                """, to_lookup.get("username"), to_lookup.get("email"))
+            if "username" in to_lookup:
+                result["username_available"] = not record["username_taken"]
+            if "email" in to_lookup:
+                result["email_available"] = not record["email_taken"]
+        return result
+
+    def _maybe_taken(self, key: str) -> bool:
+        self.stats["checks"] += 1
+        if self._ready and key not in self._filter:
+            self.stats["filter_negatives"] += 1
+            return False
+        return True
+
+    async def _rebuild(self):
+        """users 테이블 전체를 스트리밍해 필터를 새로 구성"""
+        try:
+            async with database.replica() as conn:
+                count = await conn.fetchval("SELECT COUNT(*) FROM users")
+                # 사용자명 + 이메일 두 항목씩, 증가분을 고려해 여유 있게 잡는다
+                self._rebuilding = BloomFilter(
+                    max(AVAILABILITY_FILTER_CAPACITY, count * 4), AVAILABILITY_FILTER_ERROR_RATE
+                )
+                async with conn.transaction(readonly=True):
+                    swept_at = await conn.fetchval("SELECT NOW()")
+                    async for record in conn.cursor("SELECT username, email FROM users"):
+                        self._rebuilding.add(_username_key(record['username']))
+                        self._rebuilding.add(_email_key(record['email']))
+            # 로드 중 가입한 사용자는 add()가 새 필터에도 반영했다
+            self._filter, self._swept_at = self._rebuilding, swept_at
+            self._rebuilt_at = time.monotonic()
+            self._ready = True
+        finally:
+            self._rebuilding = None
+        logger.info(f"✅ 가용성 인덱스 로드 완료: 사용자 {count}명")
+
+    async def _refresh(self):
+        """직전 반영 시각(겹침 구간 포함) 이후 생성된 사용자 추가 (이미 있는 항목은 다시 넣어도 무해)"""
+        async with database.replica() as conn:
+            swept_at = await conn.fetchval("SELECT NOW()")
+            records = await conn.fetch(
+                "SELECT username, email FROM users WHERE created_at >= $1",
+                self._swept_at - timedelta(seconds=AVAILABILITY_REFRESH_OVERLAP_SECONDS)
+            )
+        for record in records:
+            self.add(record['username'], record['email'])
+        self._swept_at = swept_at
+
+    async def _maintain(self):
+        while True:
+            await asyncio.sleep(AVAILABILITY_REFRESH_SECONDS)
+            try:
+                # 용량을 넘기면 오탐률이 올라가므로 다시 구성 (겹침 구간 밖에서 커밋된 행도 주기적으로 반영)
+                if (not self._ready or len(self._filter) > self._filter.capacity
+                        or time.monotonic() - self._rebuilt_at >= AVAILABILITY_REBUILD_SECONDS):
+                    await self._rebuild()
+                else:
+                    await self._refresh()
+            except Exception as e:
+                logger.warning(f"⚠️ 가용성 인덱스 동기화 실패: {e}")
+
+
+user_availability_index = UserAvailabilityIndex()
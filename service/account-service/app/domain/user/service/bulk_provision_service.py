@@ -0,0 +1,215 @@
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from ..model.user_model import BulkUserConflict
+
+logger = logging.getLogger("account_service")
+
+# 비밀번호 해싱 설정 (UserService와 동일한 스킴)
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# 일괄 등록 설정
+BULK_PROVISION_MAX_ROWS = int(os.getenv("BULK_PROVISION_MAX_ROWS", "5000"))
+# 본문 크기 상한 (행 수 상한보다 먼저, 본문을 다 읽기 전에 거절)
+BULK_PROVISION_MAX_BYTES = int(os.getenv("BULK_PROVISION_MAX_BYTES", str(2 * 1024 * 1024)))
+BULK_HASH_WORKERS = int(os.getenv("BULK_HASH_WORKERS", str(os.cpu_count() or 1)))
+# 일괄 등록으로 부여할 수 있는 역할 (쉼표 구분, 관리자 계정은 기본적으로 만들 수 없다)
+BULK_PROVISION_ROLES = tuple(
+    role.strip() for role in os.getenv("BULK_PROVISION_ROLES", "user").split(",") if role.strip()
+)
+
+# 문자열 필드와 스테이징 테이블 컬럼 길이 (비밀번호는 bcrypt가 72바이트까지만 사용)
+BULK_FIELDS = ("username", "email", "password", "company_id", "role")
+PASSWORD_MAX_BYTES = 72
+COMPANY_ID_MAX_LENGTH = 100
+
+CSV_CONTENT_TYPES = ("text/csv", "application/csv")
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+# bcrypt는 해싱 중 GIL을 해제하므로 스레드 풀만으로도 모든 코어를 사용할 수 있다
+_hash_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    """해싱 전용 스레드 풀 (최초 사용 시 생성)"""
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(
+            max_workers=BULK_HASH_WORKERS,
+            thread_name_prefix="bulk-hash",
+        )
+    return _hash_executor
+
+
+def shutdown_hash_executor():
+    """앱 종료 시 해싱 스레드 풀 정리"""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=True)
+        _hash_executor = None
+
+
+async def hash_passwords(passwords: List[str]) -> List[str]:
+    """비밀번호 목록을 여러 코어에서 병렬로 해싱"""
+    if not passwords:
+        return []
+    loop = asyncio.get_running_loop()
+    executor = _get_hash_executor()
+    return await asyncio.gather(
+        *(loop.run_in_executor(executor, pwd_context.hash, password) for password in passwords)
+    )
+
+
+async def read_payload(chunks: AsyncIterator[bytes], content_length: Optional[str],
+                       max_bytes: int = BULK_PROVISION_MAX_BYTES) -> bytes:
+    """요청 본문을 max_bytes까지만 읽는다 (Content-Length가 크거나 읽다가 넘으면 OverflowError)"""
+    message = f"요청 본문은 최대 {max_bytes}바이트까지 허용됩니다."
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise OverflowError(message)
+    body = bytearray()
+    async for chunk in chunks:
+        body += chunk
+        if len(body) > max_bytes:
+            raise OverflowError(message)
+    return bytes(body)
+
+
+def detect_format(content_type: Optional[str], format_hint: Optional[str] = None) -> str:
+    """요청 형식 판별 (csv 또는 ndjson)"""
+    if format_hint:
+        hint = format_hint.lower()
+        if hint in ("csv", "ndjson", "jsonl"):
+            return "csv" if hint == "csv" else "ndjson"
+        raise ValueError(f"지원하지 않는 형식입니다: {format_hint}")
+
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in CSV_CONTENT_TYPES:
+        return "csv"
+    if media_type in NDJSON_CONTENT_TYPES:
+        return "ndjson"
+    raise ValueError("Content-Type은 text/csv 또는 application/x-ndjson 이어야 합니다.")
+
+
+def _iter_csv(text: str):
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames or not {"username", "email", "password"} <= set(reader.fieldnames):
+        raise ValueError("CSV 헤더에 username, email, password 컬럼이 필요합니다.")
+    for row_no, row in enumerate(reader, start=1):
+        yield row_no, row
+
+
+def _iter_ndjson(text: str):
+    row_no = 0
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        row_no += 1
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            row = None
+        yield row_no, row if isinstance(row, dict) else None
+
+
+def _validate_row(fields: Dict[str, str], company_id: str) -> Optional[str]:
+    """행 검증 실패 사유 (문제가 없으면 None)"""
+    if len(fields["username"]) < 3 or len(fields["username"]) > 50:
+        return "사용자명은 3~50자여야 합니다."
+    if "@" not in fields["email"] or len(fields["email"]) > 100:
+        return "올바른 이메일 형식이 아닙니다."
+    if not fields["password"]:
+        return "비밀번호가 필요합니다."
+    if len(fields["password"].encode("utf-8")) > PASSWORD_MAX_BYTES:
+        return f"비밀번호는 {PASSWORD_MAX_BYTES}바이트 이하여야 합니다."
+    if fields["company_id"] and fields["company_id"] != company_id:
+        return "다른 회사의 사용자는 등록할 수 없습니다."
+    if fields["role"] and fields["role"] not in BULK_PROVISION_ROLES:
+        return f"허용되지 않는 역할입니다 (허용: {', '.join(BULK_PROVISION_ROLES)})."
+    return None
+
+
+def parse_bulk_payload(
+    body: bytes,
+    data_format: str,
+    company_id: str,
+) -> Tuple[List[Dict], List[BulkUserConflict], int]:
+    """
+    CSV/NDJSON 본문을 사용자 행으로 변환
+
+    Args:
+        company_id: 등록을 요청한 관리자의 회사 (모든 행이 이 회사 소속으로 등록된다)
+
+    Returns:
+        (유효한 행 목록, 검증 실패/배치 내 중복 목록, 전체 행 수)
+    """
+    if len(company_id) > COMPANY_ID_MAX_LENGTH:
+        raise ValueError("회사 ID가 너무 깁니다.")
+    text = body.decode("utf-8-sig")
+    rows_iter = _iter_csv(text) if data_format == "csv" else _iter_ndjson(text)
+
+    rows: List[Dict] = []
+    conflicts: List[BulkUserConflict] = []
+    seen_usernames = set()
+    seen_emails = set()
+    total = 0
+
+    for row_no, raw in rows_iter:
+        total += 1
+        if total > BULK_PROVISION_MAX_ROWS:
+            raise OverflowError(f"한 번에 최대 {BULK_PROVISION_MAX_ROWS}명까지 등록할 수 있습니다.")
+
+        if raw is None:
+            conflicts.append(BulkUserConflict(row=row_no, reason="invalid", detail="JSON 객체가 아닙니다."))
+            continue
+
+        # NDJSON은 숫자/null/배열 값도 들어올 수 있다 (CSV는 항상 문자열)
+        invalid_field = next(
+            (name for name in BULK_FIELDS if raw.get(name) is not None and not isinstance(raw.get(name), str)),
+            None
+        )
+        if invalid_field:
+            conflicts.append(BulkUserConflict(
+                row=row_no, reason="invalid", detail=f"{invalid_field} 값은 문자열이어야 합니다."
+            ))
+            continue
+
+        fields = {name: raw.get(name) or "" for name in BULK_FIELDS}
+        for name in ("username", "email", "company_id", "role"):
+            fields[name] = fields[name].strip()
+        username = fields["username"]
+        email = fields["email"]
+
+        detail = _validate_row(fields, company_id)
+        if detail:
+            conflicts.append(BulkUserConflict(
+                row=row_no, username=username or None, email=email or None,
+                reason="invalid", detail=detail
+            ))
+            continue
+
+        if username in seen_usernames or email in seen_emails:
+            conflicts.append(BulkUserConflict(
+                row=row_no, username=username, email=email, reason="duplicate_in_batch"
+            ))
+            continue
+        seen_usernames.add(username)
+        seen_emails.add(email)
+
+        rows.append({
+            "row_no": row_no,
+            "username": username,
+            "email": email,
+            "password": fields["password"],
+            "company_id": company_id,
+            "role": fields["role"] or "user",
+        })
+
+    return rows, conflicts, total
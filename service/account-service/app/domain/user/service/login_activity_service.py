@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Optional, Tuple
+
+from app.common.database import database
+
+logger = logging.getLogger("account_service")
+
+# 로그인 활동 기록 설정
+LOGIN_ACTIVITY_FLUSH_MS = int(os.getenv("LOGIN_ACTIVITY_FLUSH_MS", "500"))
+LOGIN_ACTIVITY_BATCH_SIZE = int(os.getenv("LOGIN_ACTIVITY_BATCH_SIZE", "500"))
+LOGIN_ACTIVITY_QUEUE_SIZE = int(os.getenv("LOGIN_ACTIVITY_QUEUE_SIZE", "10000"))
+LOGIN_ACTIVITY_FLUSH_RETRIES = 3
+
+# (user_id, username, client_ip, logged_in_at)
+LoginEvent = Tuple[int, str, Optional[str], datetime]
+
+
+class LoginActivityRecorder:
+    """
+    로그인 활동 write-behind 기록기
+
+    login_user 응답 경로에서는 메모리 큐에 넣기만 하고, 백그라운드 작업이
+    N ms마다 또는 M건이 쌓이면 login_events COPY + users 집계 UPDATE로 한 번에 기록한다.
+    큐가 가득 차면 이벤트를 버리고 dropped로 집계하며, 종료 시 남은 이벤트를 모두 기록한다.
+    """
+
+    def __init__(self, flush_interval_ms: int = LOGIN_ACTIVITY_FLUSH_MS,
+                 batch_size: int = LOGIN_ACTIVITY_BATCH_SIZE,
+                 max_queue_size: int = LOGIN_ACTIVITY_QUEUE_SIZE):
+        self.flush_interval = flush_interval_ms / 1000
+        self.batch_size = batch_size
+        self.max_queue_size = max_queue_size
+        self._pending: Deque[LoginEvent] = deque()
+        self._wakeup = asyncio.Event()
+        self._closed = True
+        self._task: Optional[asyncio.Task] = None
+        self._last_drop_warning = 0.0
+        self.recorded = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.last_flush_ms = 0.0
+
+    async def start(self):
+        """백그라운드 기록 작업 시작"""
+        self._closed = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0):
+        """남은 이벤트를 모두 기록하고 종료"""
+        self._closed = True
+        self._wakeup.set()
+        if self._task:
+            try:
+                await asyncio.wait_for(self._task, timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"⚠️ 로그인 활동 기록 종료 시간 초과: {len(self._pending)}건 미기록")
+            self._task = None
+
+    def record(self, user_id: int, username: str, client_ip: Optional[str] = None):
+        """로그인 이벤트 추가 (DB 쓰기 없음)"""
+        if self._closed or len(self._pending) >= self.max_queue_size:
+            self.dropped += 1
+            now = time.monotonic()
+            if now - self._last_drop_warning > 10:
+                self._last_drop_warning = now
+                logger.warning(f"⚠️ 로그인 활동 큐 초과로 이벤트 유실 (누적 {self.dropped}건)")
+            return
+        self._pending.append((user_id, username, client_ip, datetime.now(timezone.utc)))
+        self.recorded += 1
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    def stats(self) -> Dict:
+        return {
+            "queue_depth": len(self._pending),
+            "recorded": self.recorded,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+        }
+
+    async def _run(self):
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._flush_pending()
+        # 종료 시 남은 이벤트 기록
+        await self._flush_pending()
+
+    async def _flush_pending(self):
+        while self._pending:
+            batch: List[LoginEvent] = []
+            while self._pending and len(batch) < self.batch_size:
+                batch.append(self._pending.popleft())
+            await self._flush_with_retry(batch)
+
+    async def _flush_with_retry(self, batch: List[LoginEvent]):
+        for attempt in range(1, LOGIN_ACTIVITY_FLUSH_RETRIES + 1):
+            try:
+                started = time.perf_counter()
+                await self._flush(batch)
+                self.last_flush_ms = (time.perf_counter() - started) * 1000
+                self.flushed += len(batch)
+                return
+            except Exception as e:
+                logger.warning(f"⚠️ 로그인 활동 기록 실패 ({attempt}/{LOGIN_ACTIVITY_FLUSH_RETRIES}): {e}")
+                await asyncio.sleep(0.2 * attempt)
+        self.failed += len(batch)
+        logger.error(f"❌ 로그인 활동 {len(batch)}건 기록 포기")
+
+    async def _flush(self, batch: List[LoginEvent]):
+        # 사용자별 마지막 로그인 시각/횟수 집계
+        per_user: Dict[int, List] = {}
+        for user_id, _, _, logged_in_at in batch:
+            entry = per_user.setdefault(user_id, [logged_in_at, 0])
+            entry[0] = max(entry[0], logged_in_at)
+            entry[1] += 1
+
+        async with database.primary() as conn:
+            async with conn.transaction():
+                await conn.copy_records_to_table(
+                    "login_events",
+                    records=batch,
+                    columns=["user_id", "username", "client_ip", "logged_in_at"]
+                )
+                await conn.execute("""
+                    UPDATE users AS u
+                    SET last_login_at = GREATEST(COALESCE(u.last_login_at, v.logged_in_at), v.logged_in_at),
+                        login_count = u.login_count + v.logins
+                    FROM unnest($1::int[], $2::timestamptz[], $3::int[]) AS v(user_id, logged_in_at, logins)
+                    WHERE u.id = v.user_id
+                """, list(per_user), [entry[0] for entry in per_user.values()],
+                    [entry[1] for entry in per_user.values()])
+
+
+login_activity_recorder = LoginActivityRecorder()
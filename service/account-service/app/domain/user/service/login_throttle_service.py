@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Tuple
+
+from passlib.context import CryptContext
+
+# Redis는 선택 사항 (REDIS_URL 설정 시에만 사용)
+try:
+    import redis.asyncio as aioredis  # type: ignore
+except ImportError:
+    aioredis = None
+
+logger = logging.getLogger("account_service")
+
+# 로그인 시도 제한 설정
+LOGIN_WINDOW_SECONDS = int(os.getenv("LOGIN_WINDOW_SECONDS", "900"))
+LOGIN_FREE_ATTEMPTS = int(os.getenv("LOGIN_FREE_ATTEMPTS", "5"))
+LOGIN_BASE_DELAY_SECONDS = float(os.getenv("LOGIN_BASE_DELAY_SECONDS", "1"))
+LOGIN_MAX_DELAY_SECONDS = float(os.getenv("LOGIN_MAX_DELAY_SECONDS", "60"))
+LOGIN_USER_LOCKOUT_ATTEMPTS = int(os.getenv("LOGIN_USER_LOCKOUT_ATTEMPTS", "20"))
+LOGIN_IP_LOCKOUT_ATTEMPTS = int(os.getenv("LOGIN_IP_LOCKOUT_ATTEMPTS", "100"))
+LOGIN_LOCKOUT_SECONDS = int(os.getenv("LOGIN_LOCKOUT_SECONDS", "900"))
+LOGIN_THROTTLE_MAX_KEYS = int(os.getenv("LOGIN_THROTTLE_MAX_KEYS", "100000"))
+REDIS_URL = os.getenv("REDIS_URL", "")
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+@dataclass
+class ThrottleDecision:
+    allowed: bool
+    retry_after: float = 0.0
+    reason: Optional[str] = None  # delay | lockout
+    attempt: Optional[str] = None  # 허용된 경우 예약된 시도 ID (성공 시 refund에 넘긴다)
+
+
+def _evaluate(failures: int, last_failure: float, lockout_attempts: int, now: float) -> ThrottleDecision:
+    """실패 횟수에 따른 점진적 지연/잠금 판단"""
+    if failures >= lockout_attempts:
+        retry_after = last_failure + LOGIN_LOCKOUT_SECONDS - now
+        if retry_after > 0:
+            return ThrottleDecision(False, retry_after, "lockout")
+    if failures >= LOGIN_FREE_ATTEMPTS:
+        delay = min(LOGIN_BASE_DELAY_SECONDS * 2 ** (failures - LOGIN_FREE_ATTEMPTS), LOGIN_MAX_DELAY_SECONDS)
+        retry_after = last_failure + delay - now
+        if retry_after > 0:
+            return ThrottleDecision(False, retry_after, "delay")
+    return ThrottleDecision(True)
+
+
+def _keys(username: str, ip: Optional[str]) -> List[Tuple[str, int]]:
+    """(키, 잠금 기준 횟수) 목록 - 사용자명과 IP를 각각 추적"""
+    keys = [(f"user:{username.strip().lower()}", LOGIN_USER_LOCKOUT_ATTEMPTS)]
+    if ip:
+        keys.append((f"ip:{ip}", LOGIN_IP_LOCKOUT_ATTEMPTS))
+    return keys
+
+
+def _most_restrictive(decisions: List[ThrottleDecision]) -> ThrottleDecision:
+    denied = [decision for decision in decisions if not decision.allowed]
+    if not denied:
+        return ThrottleDecision(True)
+    return max(denied, key=lambda decision: decision.retry_after)
+
+
+class InMemoryLoginThrottle:
+    """
+    프로세스 내 슬라이딩 윈도우 로그인 시도 추적기
+
+    허용 여부 판단과 시도 기록을 한 번에 한다 (reserve). 판단 뒤 bcrypt가 끝나야 실패를 기록하면
+    동시에 몰린 요청이 모두 검사를 통과해 각자 bcrypt를 돌리기 때문이다. 성공하면 예약을 되돌린다.
+    """
+
+    def __init__(self, max_keys: int = LOGIN_THROTTLE_MAX_KEYS):
+        self.max_keys = max_keys
+        self._attempts: "OrderedDict[str, Deque[Tuple[float, str]]]" = OrderedDict()
+
+    def _window(self, key: str, now: float) -> Deque[Tuple[float, str]]:
+        attempts = self._attempts.get(key)
+        if attempts is None:
+            return deque()
+        while attempts and attempts[0][0] <= now - LOGIN_WINDOW_SECONDS:
+            attempts.popleft()
+        if not attempts:
+            del self._attempts[key]
+        return attempts
+
+    async def reserve(self, username: str, ip: Optional[str]) -> ThrottleDecision:
+        """허용되면 시도를 실패로 미리 기록 (await 없이 판단과 기록을 함께 처리)"""
+        now = time.time()
+        keys = _keys(username, ip)
+        decisions = []
+        for key, lockout_attempts in keys:
+            attempts = self._window(key, now)
+            if attempts:
+                decisions.append(_evaluate(len(attempts), attempts[-1][0], lockout_attempts, now))
+        decision = _most_restrictive(decisions)
+        if not decision.allowed:
+            return decision
+
+        attempt = uuid.uuid4().hex
+        for key, _ in keys:
+            self._attempts.setdefault(key, deque()).append((now, attempt))
+            self._attempts.move_to_end(key)
+        # 메모리 상한: 가장 오래 갱신되지 않은 키부터 제거
+        while len(self._attempts) > self.max_keys:
+            self._attempts.popitem(last=False)
+        return ThrottleDecision(True, attempt=attempt)
+
+    async def refund(self, username: str, ip: Optional[str], attempt: Optional[str]):
+        """로그인 성공: 사용자명 기록은 초기화하고 IP에서는 이번 시도만 되돌린다"""
+        keys = _keys(username, ip)
+        self._attempts.pop(keys[0][0], None)
+        for key, _ in keys[1:]:
+            attempts = self._attempts.get(key)
+            if attempts:
+                remaining = deque(entry for entry in attempts if entry[1] != attempt)
+                if remaining:
+                    self._attempts[key] = remaining
+                else:
+                    del self._attempts[key]
+
+
+class RedisLoginThrottle:
+    """Redis sorted set 기반 슬라이딩 윈도우 (레플리카 간 공유)"""
+
+    def __init__(self, redis_url: str, prefix: str = "login_throttle:"):
+        self.prefix = prefix
+        self._redis = aioredis.from_url(redis_url)
+        self._fallback = InMemoryLoginThrottle()
+
+    async def reserve(self, username: str, ip: Optional[str]) -> ThrottleDecision:
+        """
+        MULTI/EXEC 안에서 기존 시도 수를 읽고 이번 시도를 추가한다. 동시에 들어온 요청도 Redis가
+        순서대로 처리하므로 각자 앞선 예약을 포함한 횟수로 판단한다. 거절되면 추가한 시도를 지운다.
+        """
+        now = time.time()
+        keys = _keys(username, ip)
+        attempt = uuid.uuid4().hex
+        member = f"{now:.6f}:{attempt}"
+        try:
+            pipe = self._redis.pipeline(transaction=True)
+            for key, _ in keys:
+                pipe.zremrangebyscore(self.prefix + key, 0, now - LOGIN_WINDOW_SECONDS)
+                pipe.zcard(self.prefix + key)
+                pipe.zrange(self.prefix + key, -1, -1, withscores=True)
+                pipe.zadd(self.prefix + key, {member: now})
+                pipe.expire(self.prefix + key, max(LOGIN_WINDOW_SECONDS, LOGIN_LOCKOUT_SECONDS))
+            results = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Redis 로그인 제한 조회 실패 (메모리로 대체): {e}")
+            return await self._fallback.reserve(username, ip)
+
+        decisions = []
+        for index, (_, lockout_attempts) in enumerate(keys):
+            count, last = results[index * 5 + 1], results[index * 5 + 2]
+            if count:
+                decisions.append(_evaluate(count, last[0][1], lockout_attempts, now))
+        decision = _most_restrictive(decisions)
+        if decision.allowed:
+            return ThrottleDecision(True, attempt=member)
+
+        # 거절된 요청은 시도로 세지 않는다
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            for key, _ in keys:
+                pipe.zrem(self.prefix + key, member)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Redis 로그인 시도 취소 실패: {e}")
+        return decision
+
+    async def refund(self, username: str, ip: Optional[str], attempt: Optional[str]):
+        keys = _keys(username, ip)
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.delete(self.prefix + keys[0][0])
+            for key, _ in keys[1:]:
+                pipe.zrem(self.prefix + key, attempt)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Redis 로그인 성공 기록 실패: {e}")
+        await self._fallback.refund(username, ip, attempt)
+
+
+def create_login_throttle():
+    """REDIS_URL이 있고 redis 패키지가 설치되어 있으면 Redis, 아니면 메모리 구현"""
+    if REDIS_URL:
+        if aioredis is None:
+            logger.warning("⚠️ REDIS_URL이 설정됐지만 redis 패키지가 없어 메모리 로그인 제한을 사용합니다")
+        else:
+            return RedisLoginThrottle(REDIS_URL)
+    return InMemoryLoginThrottle()
+
+
+login_throttle = create_login_throttle()
+
+
+# ===== bcrypt 검증 비용 =====
+# 존재하지 않는 사용자명은 bcrypt를 실행하지 않고, 실제 검증에 걸리는 평균 시간만큼
+# 기다렸다가 거절한다. 응답 시간으로 사용자 존재 여부를 알 수 없고 CPU도 쓰지 않는다.
+_verify_seconds_ewma = 0.25
+_EWMA_ALPHA = 0.1
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """bcrypt 검증을 스레드에서 실행하고 소요 시간을 기록"""
+    global _verify_seconds_ewma
+    started = time.perf_counter()
+    result = await asyncio.to_thread(pwd_context.verify, plain_password, hashed_password)
+    elapsed = time.perf_counter() - started
+    _verify_seconds_ewma += _EWMA_ALPHA * (elapsed - _verify_seconds_ewma)
+    return result
+
+
+async def reject_unknown_user():
+    """실제 검증과 같은 시간만큼 대기 (CPU 사용 없음)"""
+    await asyncio.sleep(_verify_seconds_ewma)
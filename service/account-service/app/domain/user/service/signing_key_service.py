@@ -0,0 +1,226 @@
+import asyncio
+import base64
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt, JWTError
+
+logger = logging.getLogger("account_service")
+
+# JWT 서명 설정
+SECRET_KEY = os.getenv("SECRET_KEY") or os.getenv("JWT_SECRET", "your-secret-key-here")
+ALGORITHM = os.getenv("JWT_ALGORITHM", "RS256")
+JWT_KEYS_DIR = os.getenv("JWT_KEYS_DIR", "")
+JWT_ACTIVE_KID = os.getenv("JWT_ACTIVE_KID", "")
+# 키 디렉터리를 다시 읽는 주기 (키 회전 시 재시작 불필요)
+JWT_KEYS_RELOAD_SECONDS = float(os.getenv("JWT_KEYS_RELOAD_SECONDS", "60"))
+# production에서는 키가 없으면 기동 실패 (레플리카마다 다른 임시 키로 서명하지 않도록)
+ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+JWT_REQUIRE_KEYS = os.getenv(
+    "JWT_REQUIRE_KEYS", "true" if ENVIRONMENT.lower() == "production" else "false"
+).lower() == "true"
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "RS384", "RS512")
+
+
+def _b64url_uint(value: int) -> str:
+    data = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+class SigningKeyStore:
+    """
+    JWT 서명 키 저장소
+
+    JWT_KEYS_DIR의 `<kid>.pem`(개인키)과 `<kid>.pub.pem`(회전으로 은퇴한 공개키)을 읽는다.
+    활성 키(JWT_ACTIVE_KID, 미지정 시 가장 최근 개인키)로 서명하고, 모든 공개키를
+    JWKS로 공개해 다른 서비스가 시크릿 없이 토큰을 로컬 검증할 수 있게 한다.
+    키 회전: 새 개인키를 추가 → JWKS 전파 후 활성 kid 변경 → 이전 키는 토큰 만료 후
+    `.pub.pem`만 남긴다. JWT_ALGORITHM=HS256이면 기존 공유 시크릿 방식을 그대로 쓴다.
+
+    디렉터리는 JWT_KEYS_RELOAD_SECONDS마다 다시 읽는다 (파일 목록/수정 시각이 바뀐 경우만).
+    키가 하나도 없으면 개발 환경에서만 임시 키를 만들고, JWT_REQUIRE_KEYS(production 기본값)이면
+    기동을 실패시킨다. 레플리카마다 다른 키로 서명하면 서로의 토큰을 검증할 수 없기 때문이다.
+    """
+
+    def __init__(self, algorithm: str = ALGORITHM, keys_dir: str = JWT_KEYS_DIR,
+                 active_kid: str = JWT_ACTIVE_KID, require_keys: bool = JWT_REQUIRE_KEYS,
+                 reload_seconds: float = JWT_KEYS_RELOAD_SECONDS):
+        self.algorithm = algorithm
+        self.keys_dir = keys_dir
+        self.configured_kid = active_kid
+        self.require_keys = require_keys
+        self.reload_seconds = reload_seconds
+        self.active_kid: Optional[str] = None
+        self._signing_key = None
+        self._verify_keys: Dict[str, object] = {}
+        self._jwks: List[dict] = []
+        self._fingerprint: Optional[Tuple] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_asymmetric(self) -> bool:
+        return self.algorithm in ASYMMETRIC_ALGORITHMS
+
+    async def start(self):
+        """키 로드 (키가 필요한데 없으면 RuntimeError) + 주기적 재로드 시작"""
+        if not self.is_asymmetric:
+            return
+        self.reload()
+        self._task = asyncio.create_task(self._reload_loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _reload_loop(self):
+        while True:
+            await asyncio.sleep(self.reload_seconds)
+            try:
+                self.reload()
+            except Exception as e:
+                # 읽기 실패(회전 중 파일 일부만 복사된 경우 등)는 기존 키를 그대로 쓴다
+                logger.warning(f"⚠️ JWT 서명 키 재로드 실패 (기존 키 유지): {e}")
+
+    def _ensure_loaded(self):
+        if self._signing_key is None:
+            self.reload()
+
+    def _scan(self) -> Tuple[Optional[Path], Tuple]:
+        """키 디렉터리와 (파일명, 수정 시각) 목록"""
+        keys_path = Path(self.keys_dir) if self.keys_dir else None
+        if not keys_path or not keys_path.is_dir():
+            return keys_path, ()
+        return keys_path, tuple(sorted((path.name, path.stat().st_mtime) for path in keys_path.glob("*.pem")))
+
+    def reload(self) -> bool:
+        """키 디렉터리가 바뀌었으면 다시 읽는다 → 변경 여부"""
+        keys_path, fingerprint = self._scan()
+        if self._signing_key is not None and fingerprint == self._fingerprint:
+            return False
+
+        private_keys = {}
+        public_keys = {}
+        mtimes = {}
+        for name, mtime in fingerprint:
+            pem = (keys_path / name).read_bytes()
+            if name.endswith(".pub.pem"):
+                kid = name[:-len(".pub.pem")]
+                public_keys[kid] = serialization.load_pem_public_key(pem)
+            else:
+                kid = name[:-len(".pem")]
+                private_keys[kid] = serialization.load_pem_private_key(pem, password=None)
+                public_keys[kid] = private_keys[kid].public_key()
+                mtimes[kid] = mtime
+
+        if not private_keys:
+            if self.require_keys:
+                raise RuntimeError(f"JWT 서명 키가 없습니다 (JWT_KEYS_DIR={self.keys_dir or '미설정'})")
+            if self._signing_key is not None:
+                # 개발용 임시 키를 쓰는 중이면 그대로 유지
+                self._fingerprint = fingerprint
+                return False
+            kid, private_key = self._generate_key(keys_path)
+            private_keys[kid] = private_key
+            public_keys[kid] = private_key.public_key()
+            mtimes[kid] = time.time()
+            fingerprint = self._scan()[1]
+
+        kid = self.configured_kid if self.configured_kid in private_keys else max(mtimes, key=mtimes.get)
+        signing_key = jwk.construct(
+            private_keys[kid].private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            ),
+            self.algorithm,
+        )
+
+        # 공개키는 kid별로 미리 파싱해 두어 검증마다 PEM을 다시 읽지 않는다
+        verify_keys = {}
+        jwks = []
+        for key_id, public_key in public_keys.items():
+            verify_keys[key_id] = jwk.construct(
+                public_key.public_bytes(
+                    serialization.Encoding.PEM,
+                    serialization.PublicFormat.SubjectPublicKeyInfo,
+                ),
+                self.algorithm,
+            )
+            numbers = public_key.public_numbers()
+            jwks.append({
+                "kty": "RSA",
+                "use": "sig",
+                "alg": self.algorithm,
+                "kid": key_id,
+                "n": _b64url_uint(numbers.n),
+                "e": _b64url_uint(numbers.e),
+            })
+
+        # 다 읽은 뒤 한 번에 교체 (검증 중인 요청이 반쯤 바뀐 키 집합을 보지 않도록)
+        self.active_kid = kid
+        self._signing_key = signing_key
+        self._verify_keys = verify_keys
+        self._jwks = jwks
+        self._fingerprint = fingerprint
+        logger.info(f"🔑 JWT 서명 키 로드: 활성 kid={kid}, 공개키 {len(jwks)}개")
+        return True
+
+    def _generate_key(self, keys_path: Optional[Path]):
+        """키가 없을 때 새 RSA 키 생성 (디렉터리가 있으면 파일로 저장)"""
+        kid = time.strftime("%Y%m%d%H%M%S", time.gmtime())
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        if keys_path is not None:
+            try:
+                keys_path.mkdir(parents=True, exist_ok=True)
+                key_file = keys_path / f"{kid}.pem"
+                key_file.write_bytes(private_key.private_bytes(
+                    serialization.Encoding.PEM,
+                    serialization.PrivateFormat.PKCS8,
+                    serialization.NoEncryption(),
+                ))
+                key_file.chmod(0o600)
+                logger.warning(f"⚠️ JWT 서명 키가 없어 새로 생성했습니다: {key_file}")
+                return kid, private_key
+            except OSError as e:
+                logger.warning(f"⚠️ JWT 서명 키 저장 실패: {e}")
+        logger.warning("⚠️ 임시 JWT 서명 키를 사용합니다 (재시작/레플리카 간 공유되지 않음, JWT_KEYS_DIR 설정 필요)")
+        return kid, private_key
+
+    def sign(self, claims: dict) -> str:
+        """클레임 서명"""
+        if not self.is_asymmetric:
+            return jwt.encode(claims, SECRET_KEY, algorithm=self.algorithm)
+        self._ensure_loaded()
+        return jwt.encode(claims, self._signing_key, algorithm=self.algorithm,
+                          headers={"kid": self.active_kid})
+
+    def decode(self, token: str) -> dict:
+        """토큰 서명/만료 검증 (실패 시 JWTError)"""
+        if not self.is_asymmetric:
+            return jwt.decode(token, SECRET_KEY, algorithms=[self.algorithm])
+        self._ensure_loaded()
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self._verify_keys.get(kid)
+        if key is None:
+            raise JWTError(f"알 수 없는 kid: {kid}")
+        return jwt.decode(token, key, algorithms=[self.algorithm])
+
+    def jwks(self) -> dict:
+        """JWKS 문서"""
+        if self.is_asymmetric:
+            self._ensure_loaded()
+        return {"keys": list(self._jwks)}
+
+
+signing_keys = SigningKeyStore()
@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Optional
+
+import asyncpg
+
+from app.common.bloom_filter import BloomFilter
+from app.common.database import connect_database, database
+
+logger = logging.getLogger("account_service")
+
+# 토큰 폐기 목록 설정
+TOKEN_DENYLIST_CAPACITY = int(os.getenv("TOKEN_DENYLIST_CAPACITY", "100000"))
+TOKEN_DENYLIST_ERROR_RATE = float(os.getenv("TOKEN_DENYLIST_ERROR_RATE", "0.001"))
+TOKEN_DENYLIST_REBUILD_SECONDS = int(os.getenv("TOKEN_DENYLIST_REBUILD_SECONDS", "300"))
+
+# 레플리카 간 동기화용 NOTIFY 채널
+REVOCATION_CHANNEL = "token_revoked"
+
+
+class TokenRevocationList:
+    """
+    폐기된 토큰(jti) 목록
+
+    token_denylist 테이블을 원본으로 하고, 메모리의 블룸 필터로 대부분의 검사를
+    DB 없이 처리한다. 필터가 "없음"이라고 답하면 폐기되지 않은 토큰으로 확정되며,
+    "있을 수도 있음"일 때만 token_denylist를 조회한다.
+    다른 레플리카의 폐기는 LISTEN/NOTIFY로 즉시 반영되고, 주기적인 재구축으로
+    만료된 항목 정리와 놓친 알림을 보정한다.
+    """
+
+    def __init__(self):
+        self._filter = BloomFilter(TOKEN_DENYLIST_CAPACITY, TOKEN_DENYLIST_ERROR_RATE)
+        self._rebuilding: Optional[BloomFilter] = None
+        self._ready = False
+        self._listener: Optional[asyncpg.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"checks": 0, "filter_negatives": 0, "db_lookups": 0, "revoked": 0}
+
+    async def start(self):
+        """필터 초기 로드 및 동기화 작업 시작"""
+        try:
+            await self._ensure_listener()
+            await self._rebuild()
+        except Exception as e:
+            logger.warning(f"⚠️ 토큰 폐기 목록 초기 로드 실패 (DB 조회로 대체): {e}")
+        self._task = asyncio.create_task(self._maintain())
+
+    async def stop(self):
+        """동기화 작업 종료"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._listener is not None and not self._listener.is_closed():
+            await self._listener.close()
+        self._listener = None
+
+    async def revoke(self, conn: asyncpg.Connection, jti: str, expires_at: datetime):
+        """토큰 폐기 (만료 시각까지 denylist에 유지)"""
+        await conn.execute("""
+            INSERT INTO token_denylist (jti, expires_at) VALUES ($1, $2)
+            ON CONFLICT (jti) DO NOTHING
+        """, jti, expires_at)
+        await conn.execute("SELECT pg_notify($1, $2)", REVOCATION_CHANNEL, jti)
+        self._add(jti)
+        self.stats["revoked"] += 1
+
+    async def is_revoked(self, jti: Optional[str]) -> bool:
+        """토큰 폐기 여부 확인"""
+        if not jti:
+            return False
+        self.stats["checks"] += 1
+        if self._ready and jti not in self._filter:
+            self.stats["filter_negatives"] += 1
+            return False
+
+        # 필터가 양성(오탐 가능)이거나 아직 로드되지 않은 경우에만 DB 확인
+        self.stats["db_lookups"] += 1
+        async with database.primary() as conn:
+            return await conn.fetchval(
+                "SELECT EXISTS (SELECT 1 FROM token_denylist WHERE jti = $1 AND expires_at > NOW())",
+                jti
+            )
+
+    def _add(self, jti: str):
+        self._filter.add(jti)
+        if self._rebuilding is not None:
+            self._rebuilding.add(jti)
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self._add(payload)
+
+    def _on_listener_terminated(self, connection):
+        # 알림을 놓칠 수 있으므로 다음 재구축 전까지는 DB로 확인한다
+        self._ready = False
+
+    async def _ensure_listener(self):
+        if self._listener is None or self._listener.is_closed():
+            self._listener = await connect_database()
+            await self._listener.add_listener(REVOCATION_CHANNEL, self._on_notify)
+            self._listener.add_termination_listener(self._on_listener_terminated)
+
+    async def _rebuild(self):
+        """만료 항목을 정리하고 필터를 새로 구성"""
+        conn = await connect_database()
+        try:
+            await conn.execute("DELETE FROM token_denylist WHERE expires_at <= NOW()")
+            count = await conn.fetchval("SELECT COUNT(*) FROM token_denylist")
+            # 용량을 넘기면 오탐률이 급격히 오르므로 여유 있게 잡는다
+            self._rebuilding = BloomFilter(max(TOKEN_DENYLIST_CAPACITY, count * 2), TOKEN_DENYLIST_ERROR_RATE)
+            async with conn.transaction():
+                async for record in conn.cursor("SELECT jti FROM token_denylist"):
+                    self._rebuilding.add(record['jti'])
+            self._filter, self._rebuilding = self._rebuilding, None
+            # 알림 수신 중일 때만 필터의 "없음" 응답을 신뢰한다
+            self._ready = self._listener is not None and not self._listener.is_closed()
+            logger.info(f"✅ 토큰 폐기 목록 로드 완료: {count}건")
+        finally:
+            self._rebuilding = None
+            await conn.close()
+
+    async def _maintain(self):
+        while True:
+            await asyncio.sleep(TOKEN_DENYLIST_REBUILD_SECONDS)
+            try:
+                await self._ensure_listener()
+                await self._rebuild()
+            except Exception as e:
+                logger.warning(f"⚠️ 토큰 폐기 목록 동기화 실패: {e}")
+
+
+token_revocation_list = TokenRevocationList()
@@ -1,27 +1,25 @@
 from passlib.context import CryptContext
-from jose import JWTError, jwt
+from jose import JWTError
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 import os
+import uuid
 import logging
 
-from ..repository.user_repository import UserRepository
-from ..entity.user_entity import UserEntity
-from ..model.user_model import UserCreate, UserLogin, UserResponse, TokenResponse
+from .signing_key_service import signing_keys
+from ..model.user_model import UserResponse
 
 logger = logging.getLogger("account_service")
 
 # 비밀번호 해싱 설정
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-# JWT 설정
-SECRET_KEY = os.getenv("SECRET_KEY") or os.getenv("JWT_SECRET", "your-secret-key-here")
-ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+# JWT 설정 (서명 키/알고리즘은 signing_key_service에서 관리)
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
 
 class UserService:
-    def __init__(self, user_repository: UserRepository):
-        self.user_repository = user_repository
+    """비밀번호 해싱과 토큰 발급/검증 (사용자 조회·저장은 UserController가 UserRepository로 처리)"""
     
     def hash_password(self, password: str) -> str:
         """비밀번호 해싱"""
@@ -31,101 +29,53 @@ class UserService:
         """비밀번호 검증"""
         return pwd_context.verify(plain_password, hashed_password)
     
+    def build_access_claims(self, user: UserResponse) -> dict:
+        """액세스 토큰에 담을 사용자 클레임 (다른 서비스가 사용자 재조회 없이 사용)"""
+        return {
+            "sub": user.username,
+            "uid": user.id,
+            "cid": user.company_id,
+            "role": user.role,
+        }
+    
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None):
         """JWT 토큰 생성"""
         to_encode = data.copy()
+        now = datetime.utcnow()
         if expires_delta:
-            expire = datetime.utcnow() + expires_delta
+            expire = now + expires_delta
         else:
-            expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+            expire = now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         
-        to_encode.update({"exp": expire})
-        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+        # jti: 개별 토큰 폐기(로그아웃)용 식별자
+        to_encode.update({"exp": expire, "iat": now, "jti": uuid.uuid4().hex, "type": "access"})
+        encoded_jwt = signing_keys.sign(to_encode)
         return encoded_jwt
     
-    def verify_token(self, token: str) -> Optional[dict]:
+    def create_refresh_token(self, user_id: int, family_id: Optional[str] = None) -> Tuple[str, dict]:
+        """리프레시 토큰 생성 (회전 시 같은 family_id 유지)"""
+        now = datetime.utcnow()
+        claims = {
+            "sub": str(user_id),
+            "uid": user_id,
+            "fid": family_id or uuid.uuid4().hex,
+            "jti": uuid.uuid4().hex,
+            "iat": now,
+            "exp": now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+            "type": "refresh",
+        }
+        return signing_keys.sign(claims), claims
+    
+    def verify_token(self, token: str, expected_type: str = "access") -> Optional[dict]:
         """JWT 토큰 검증"""
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            payload = signing_keys.decode(token)
             username: str = payload.get("sub")
             if username is None:
                 return None
+            # type 클레임이 없는 기존 토큰은 액세스 토큰으로 간주
+            if payload.get("type", "access") != expected_type:
+                return None
             return payload
         except JWTError:
             return None
-    
-    async def register_user(self, user_data: UserCreate) -> Optional[UserResponse]:
-        """사용자 회원가입"""
-        # 사용자명 중복 확인
-        existing_user = await self.user_repository.get_user_by_username(user_data.username)
-        if existing_user:
-            return None
-        
-        # 이메일 중복 확인
-        existing_email = await self.user_repository.get_user_by_email(user_data.email)
-        if existing_email:
-            return None
-        
-        # 비밀번호 해싱
-        hashed_password = self.hash_password(user_data.password)
-        
-        # UserEntity 생성
-        user_entity = UserEntity(
-            username=user_data.username,
-            email=user_data.email,
-            password_hash=hashed_password,
-            company_id=user_data.company_id,
-            role=user_data.role
-        )
-        
-        # DB에 저장
-        db_user = await self.user_repository.create_user(user_entity)
-        if db_user:
-            return UserResponse.model_validate(db_user)
-        return None
-    
-    async def authenticate_user(self, login_data: UserLogin) -> Optional[UserResponse]:
-        """사용자 로그인 인증"""
-        # 사용자 조회
-        user = await self.user_repository.get_user_by_username(login_data.username)
-        if not user:
-            return None
-        
-        # 비밀번호 검증
-        if not self.verify_password(login_data.password, user.password_hash):
-            return None
-        
-        return UserResponse.model_validate(user)
-    
-    async def login_user(self, login_data: UserLogin) -> Optional[TokenResponse]:
-        """사용자 로그인 (토큰 생성 포함)"""
-        user = await self.authenticate_user(login_data)
-        if not user:
-            return None
-        
-        # 액세스 토큰 생성
-        access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = self.create_access_token(
-            data={"sub": user.username}, expires_delta=access_token_expires
-        )
-        
-        return TokenResponse(
-            access_token=access_token,
-            token_type="bearer",
-            user=user
-        )
-    
-    async def get_current_user(self, token: str) -> Optional[UserResponse]:
-        """토큰으로 현재 사용자 조회"""
-        payload = self.verify_token(token)
-        if payload is None:
-            return None
-        
-        username: str = payload.get("sub")
-        if username is None:
-            return None
-        
-        user = await self.user_repository.get_user_by_username(username)
-        if user:
-            return UserResponse.model_validate(user)
-        return None
@@ -1,30 +1,103 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Query, status
+from typing import Optional
+import os
 from fastapi.security import HTTPBearer
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.user.controller.user_controller import UserController
-from app.domain.user.model.user_model import UserCreate, UserLogin, UserResponse, TokenResponse
-from app.main import get_database
+from app.domain.user.model.user_model import (
+    UserCreate, UserLogin, UserResponse, TokenResponse, RefreshTokenRequest, LogoutRequest,
+    BulkProvisionResponse,
+    CompanyUserPage, AvailabilityResponse
+)
 
 router = APIRouter(prefix="/api/account", tags=["account"])
 
+# 이 서비스 앞에 있는 신뢰할 수 있는 프록시 수 (게이트웨이만 있으면 1, 0이면 X-Forwarded-For 무시)
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+
 # JWT 토큰 검증을 위한 security
 security = HTTPBearer()
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register_user(user_data: UserCreate, db: AsyncSession = Depends(get_database)):
+async def register_user(user_data: UserCreate):
     """사용자 회원가입"""
     controller = UserController()
     return await controller.register_user(user_data)
 
+def get_client_ip(request: Request) -> Optional[str]:
+    """클라이언트 IP
+
+    X-Forwarded-For의 앞쪽 값은 클라이언트가 마음대로 넣을 수 있으므로, 신뢰하는 프록시
+    TRUSTED_PROXY_HOPS개가 덧붙인 오른쪽 값만 본다 (각 프록시는 자신이 본 주소를 뒤에 추가한다).
+    """
+    peer = request.client.host if request.client else None
+    if TRUSTED_PROXY_HOPS <= 0:
+        return peer
+    forwarded_for = request.headers.get("x-forwarded-for", "")
+    hops = [address.strip() for address in forwarded_for.split(",") if address.strip()]
+    if peer:
+        hops.append(peer)
+    # 오른쪽 끝부터 신뢰하는 프록시를 건너뛴 첫 주소
+    if len(hops) > TRUSTED_PROXY_HOPS:
+        return hops[-TRUSTED_PROXY_HOPS - 1]
+    return hops[0] if hops else None
+
+@router.get("/availability", response_model=AvailabilityResponse)
+async def check_availability(
+    username: Optional[str] = Query(None, max_length=50),
+    email: Optional[str] = Query(None, max_length=100)
+):
+    """사용자명/이메일 사용 가능 여부 (회원가입 입력 중 실시간 확인용)"""
+    controller = UserController()
+    return await controller.check_availability(username, email)
+
 @router.post("/login", response_model=TokenResponse)
-async def login_user(login_data: UserLogin, db: AsyncSession = Depends(get_database)):
+async def login_user(login_data: UserLogin, request: Request):
     """사용자 로그인"""
     controller = UserController()
-    return await controller.login_user(login_data)
+    return await controller.login_user(login_data, get_client_ip(request))
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user(credentials = Depends(security), db: AsyncSession = Depends(get_database)):
+async def get_current_user(credentials = Depends(security)):
     """현재 사용자 정보 조회"""
     controller = UserController()
     return await controller.get_current_user(credentials)
+
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh_tokens(refresh_data: RefreshTokenRequest):
+    """액세스 토큰 갱신 (리프레시 토큰 회전)"""
+    controller = UserController()
+    return await controller.refresh_tokens(refresh_data.refresh_token)
+
+@router.post("/logout")
+async def logout_user(logout_data: Optional[LogoutRequest] = None, credentials = Depends(security)):
+    """로그아웃 (토큰 폐기)"""
+    controller = UserController()
+    return await controller.logout_user(credentials, logout_data)
+
+@router.post("/bulk", response_model=BulkProvisionResponse)
+async def bulk_register_users(
+    request: Request,
+    format: Optional[str] = Query(None, description="csv 또는 ndjson (미지정 시 Content-Type으로 판별)"),
+    credentials = Depends(security)
+):
+    """사용자 일괄 등록 (CSV/NDJSON, 관리자 전용 - 관리자 회사 소속으로 등록)"""
+    controller = UserController()
+    # 본문은 관리자 확인 뒤에 크기 상한까지만 읽는다
+    return await controller.bulk_register_users(
+        credentials, request.stream(), request.headers.get("content-length"),
+        request.headers.get("content-type"), format
+    )
+
+@router.get("/companies/{company_id}/users", response_model=CompanyUserPage)
+async def list_company_users(
+    company_id: str,
+    cursor: Optional[str] = Query(None, description="이전 페이지 응답의 next_cursor"),
+    limit: int = Query(50, ge=1, le=200),
+    role: Optional[str] = Query(None),
+    is_active: Optional[bool] = Query(None),
+    credentials = Depends(security)
+):
+    """회사별 사용자 디렉터리 조회 (같은 회사 사용자만)"""
+    controller = UserController()
+    return await controller.list_company_users(credentials, company_id, cursor, limit, role, is_active)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Account Service 처리량 벤치마크
+register / login / me 엔드포인트의 초당 요청 수(requests/sec)와 지연 시간을 측정합니다.
+
+변경 전후 비교:
+    git stash 또는 이전 커밋으로 서비스를 띄워 한 번, 변경 후 다시 한 번 실행한 뒤
+    --label 로 구분한 결과 JSON을 --compare 로 비교합니다.
+
+    python benchmark_account.py --label before --output before.json
+    python benchmark_account.py --label after --output after.json
+    python benchmark_account.py --compare before.json after.json
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from typing import Dict, List
+
+import httpx
+
+
+class AccountBenchmark:
+    """엔드포인트별 동시 요청 벤치마크"""
+
+    def __init__(self, base_url: str, concurrency: int, requests_per_endpoint: int):
+        self.base_url = base_url.rstrip("/")
+        self.concurrency = concurrency
+        self.requests_per_endpoint = requests_per_endpoint
+        self.client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        )
+        self.run_id = uuid.uuid4().hex[:8]
+        self.password = "benchmark-password"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.client.aclose()
+
+    async def _run(self, name: str, make_request) -> Dict:
+        """make_request(i)를 동시성 제한 하에 N번 실행"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        latencies: List[float] = []
+        errors = 0
+
+        async def one(index: int):
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await make_request(index)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(index) for index in range(self.requests_per_endpoint)))
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        result = {
+            "endpoint": name,
+            "requests": self.requests_per_endpoint,
+            "errors": errors,
+            "requests_per_second": round(self.requests_per_endpoint / elapsed, 2),
+            "p50_ms": round(statistics.median(latencies), 2),
+            "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        }
+        print(f"  {name:<10} {result['requests_per_second']:>9.2f} req/s  "
+              f"p50 {result['p50_ms']:>8.2f}ms  p95 {result['p95_ms']:>8.2f}ms  errors {errors}")
+        return result
+
+    def _username(self, index: int) -> str:
+        return f"bench_{self.run_id}_{index}"
+
+    async def bench_register(self) -> Dict:
+        return await self._run("register", lambda index: self.client.post(
+            f"{self.base_url}/api/account/register",
+            json={
+                "username": self._username(index),
+                "email": f"{self._username(index)}@benchmark.local",
+                "password": self.password,
+            },
+        ))
+
+    async def bench_login(self) -> Dict:
+        # 로그인 제한에 걸리지 않도록 가입한 사용자들을 돌아가며 사용
+        return await self._run("login", lambda index: self.client.post(
+            f"{self.base_url}/api/account/login",
+            json={"username": self._username(index), "password": self.password},
+            headers={"X-Forwarded-For": f"10.0.{index // 250 % 250}.{index % 250}"},
+        ))
+
+    async def bench_me(self) -> Dict:
+        response = await self.client.post(
+            f"{self.base_url}/api/account/login",
+            json={"username": self._username(0), "password": self.password},
+        )
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return await self._run("me", lambda index: self.client.get(
+            f"{self.base_url}/api/account/me", headers=headers,
+        ))
+
+    async def run(self) -> List[Dict]:
+        print(f"🚀 {self.base_url} (동시성 {self.concurrency}, 엔드포인트별 {self.requests_per_endpoint}건)")
+        return [await self.bench_register(), await self.bench_login(), await self.bench_me()]
+
+
+def compare(before_path: str, after_path: str):
+    """두 결과 파일의 requests/sec 비교"""
+    with open(before_path) as f:
+        before = {row["endpoint"]: row for row in json.load(f)["results"]}
+    with open(after_path) as f:
+        after = {row["endpoint"]: row for row in json.load(f)["results"]}
+
+    print(f"{'endpoint':<10} {'before':>12} {'after':>12} {'change':>9}")
+    for endpoint, row in before.items():
+        if endpoint not in after:
+            continue
+        old, new = row["requests_per_second"], after[endpoint]["requests_per_second"]
+        change = (new - old) / old * 100 if old else 0.0
+        print(f"{endpoint:<10} {old:>8.2f} r/s {new:>8.2f} r/s {change:>+8.1f}%")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Account Service 벤치마크")
+    parser.add_argument("--base-url", default="http://localhost:8002")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    async with AccountBenchmark(args.base_url, args.concurrency, args.requests) as benchmark:
+        results = await benchmark.run()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"label": args.label, "base_url": args.base_url, "results": results}, f, indent=2)
+        print(f"💾 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+import hashlib
+import os
+import socket
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+# Snowflake 방식 ID 설정
+# [시각 40비트 (ms, 2024-01-01 기준 약 34년)][워커 5비트][순번 8비트] = 53비트
+# 프론트엔드가 ID를 JavaScript number로 다루므로 2^53 안에 들어가게 나눈다 (DB에는 BIGINT로 저장)
+SNOWFLAKE_EPOCH_MS = 1704067200000
+WORKER_BITS = 5
+SEQUENCE_BITS = 8
+
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+WORKER_SHIFT = SEQUENCE_BITS
+TIMESTAMP_SHIFT = WORKER_BITS + SEQUENCE_BITS
+
+# 워커 ID는 5비트라 한 서비스에 동시에 떠 있는 프로세스(복제본 × uvicorn 워커)는 최대 32개다.
+# 해시로 유도한 ID는 2개만 떠도 겹칠 수 있으므로 production에서는 명시를 요구한다.
+ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+SNOWFLAKE_REQUIRE_WORKER_ID = os.getenv(
+    "SNOWFLAKE_REQUIRE_WORKER_ID", "true" if ENVIRONMENT.lower() == "production" else "false"
+).lower() == "true"
+
+
+def _default_worker_id() -> int:
+    """SNOWFLAKE_WORKER_ID (프로세스마다 0~31 중 겹치지 않게 지정)
+
+    지정하지 않으면 SNOWFLAKE_REQUIRE_WORKER_ID(production 기본값)일 때 기동을 멈추고, 아니면
+    호스트명 + PID에서 유도한다. 유도한 값은 32개 중 하나라 복제본이 둘 이상이면 겹칠 수 있다
+    (단일 프로세스 개발 환경용).
+    """
+    configured = os.getenv("SNOWFLAKE_WORKER_ID")
+    if configured:
+        return int(configured)
+    if SNOWFLAKE_REQUIRE_WORKER_ID:
+        raise RuntimeError(
+            f"SNOWFLAKE_WORKER_ID가 설정되지 않았습니다 (복제본/워커 프로세스마다 0~{MAX_WORKER_ID} 중 "
+            f"겹치지 않는 값을 지정하세요)"
+        )
+    seed = f"{socket.gethostname()}:{os.getpid()}".encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(seed, digest_size=2).digest(), "big") & MAX_WORKER_ID
+
+
+class SnowflakeGenerator:
+    """
+    조율 없는 정수 ID 생성기 (BIGINT 컬럼용)
+
+    ID는 (밀리초 시각, 워커 ID, 같은 밀리초 안의 순번)을 이어 붙인 값이라 DB 왕복 없이 만들 수
+    있고, 워커 ID가 다르면 서로 겹치지 않는다. next_id()는 await 없이 끝나므로 asyncio 안에서는
+    락 없이도 원자적이고, 한 프로세스 안에서는 항상 증가한다. 시계가 뒤로 가거나 한 밀리초의
+    순번을 다 쓰면 기다리지 않고 논리 시각을 1ms 앞당겨 이어서 발급한다.
+    """
+
+    def __init__(self, worker_id: Optional[int] = None, epoch_ms: int = SNOWFLAKE_EPOCH_MS):
+        worker_id = _default_worker_id() if worker_id is None else worker_id
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"워커 ID는 0~{MAX_WORKER_ID} 범위여야 합니다: {worker_id}")
+        self.worker_id = worker_id
+        self.epoch_ms = epoch_ms
+        self._last_ms = -1
+        self._sequence = 0
+        self.issued = 0
+        self.borrowed_ms = 0
+
+    def next_id(self) -> int:
+        now = int(time.time() * 1000) - self.epoch_ms
+        if now > self._last_ms:
+            self._last_ms = now
+            self._sequence = 0
+        elif self._sequence < MAX_SEQUENCE:
+            self._sequence += 1
+        else:
+            # 순번 소진 (또는 시계 역행 중 소진) → 논리 시각을 앞당긴다
+            self._last_ms += 1
+            self._sequence = 0
+            self.borrowed_ms += 1
+        self.issued += 1
+        return (self._last_ms << TIMESTAMP_SHIFT) | (self.worker_id << WORKER_SHIFT) | self._sequence
+
+    def parse(self, snowflake_id: int) -> Tuple[datetime, int, int]:
+        """ID → (발급 시각, 워커 ID, 순번)"""
+        timestamp_ms = (snowflake_id >> TIMESTAMP_SHIFT) + self.epoch_ms
+        return (
+            datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc),
+            (snowflake_id >> WORKER_SHIFT) & MAX_WORKER_ID,
+            snowflake_id & MAX_SEQUENCE,
+        )
+
+    def stats(self) -> Dict:
+        return {"worker_id": self.worker_id, "issued": self.issued, "borrowed_ms": self.borrowed_ms}
+
+
+snowflake = SnowflakeGenerator()
+
+
+def next_id() -> int:
+    return snowflake.next_id()
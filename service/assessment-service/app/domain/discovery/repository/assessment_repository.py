@@ -1,5 +1,7 @@
 from typing import Optional, Any
 
+from ....common.snowflake import next_id
+
 # SQLAlchemy import (linter 무시)
 # type: ignore를 사용하여 linter 경고 억제
 try:
@@ -18,10 +20,11 @@ class AssessmentRepository:
         self.session = session
     
     async def create_assessment(self, assessment_data: dict):
-        """새 평가 생성"""
+        """새 평가 생성 (ID는 DB 시퀀스 없이 Snowflake 방식으로 발급)"""
         # 실제 구현 시 SQLAlchemy ORM 사용
-        print(f"평가 생성: {assessment_data}")
-        return {"id": 1, **assessment_data}
+        assessment = {**assessment_data, "id": next_id()}
+        print(f"평가 생성: {assessment}")
+        return assessment
     
     async def get_assessment_by_id(self, assessment_id: int):
         """ID로 평가 조회"""
@@ -31,7 +31,8 @@ async def get_assessment(assessment_id: int):
 @router.post("/")
 async def create_assessment(assessment_data: Dict[str, Any]):
     """새 평가 생성"""
-    return {"message": "평가 생성", "data": assessment_data}
+    assessment = await AssessmentRepository().create_assessment(assessment_data)
+    return {"message": "평가 생성", "data": assessment}
 
 @router.put("/{assessment_id}")
 async def update_assessment(assessment_id: int, assessment_data: Dict[str, Any]):
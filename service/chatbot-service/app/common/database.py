@@ -0,0 +1,89 @@
+import logging
+import os
+from typing import Dict, Optional
+
+import asyncpg
+
+logger = logging.getLogger("chatbot_service")
+
+# 커넥션 풀 설정
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_MAX_INACTIVE_SECONDS = float(os.getenv("DB_POOL_MAX_INACTIVE_SECONDS", "300"))
+DB_COMMAND_TIMEOUT_SECONDS = float(os.getenv("DB_COMMAND_TIMEOUT_SECONDS", "30"))
+
+# Railway 등 관리형 Postgres는 SSL 요구 여부가 환경마다 달라 순서대로 시도한다
+_SSL_OPTIONS = ['require', True, False, None]
+
+
+def get_asyncpg_dsn(database_url: Optional[str] = None) -> str:
+    """asyncpg 연결용 DSN 정리 (postgres:// 변환, 드라이버 표기/쿼리 파라미터 제거)"""
+    if database_url is None:
+        database_url = os.getenv("DATABASE_URL", "")
+    database_url = database_url.replace("postgresql+asyncpg://", "postgresql://")
+    if "postgres://" in database_url:
+        database_url = database_url.replace("postgres://", "postgresql://")
+    return database_url.split("?")[0]  # 쿼리 파라미터 제거
+
+
+class Database:
+    """chatbot-service 공용 asyncpg 커넥션 풀"""
+
+    def __init__(self, database_url: Optional[str] = None):
+        self.conn_str = get_asyncpg_dsn(database_url)
+        self.pool: Optional[asyncpg.Pool] = None
+
+    @property
+    def is_configured(self) -> bool:
+        return bool(self.conn_str)
+
+    @property
+    def is_ready(self) -> bool:
+        return self.pool is not None
+
+    async def start(self):
+        """풀 생성 (SSL 옵션 순서대로 시도)"""
+        if not self.is_configured:
+            logger.warning("⚠️ DATABASE_URL이 설정되지 않아 DB 풀을 만들지 않습니다")
+            return
+        for ssl_option in _SSL_OPTIONS:
+            try:
+                kwargs = {} if ssl_option is None else {"ssl": ssl_option}
+                self.pool = await asyncpg.create_pool(
+                    self.conn_str,
+                    min_size=DB_POOL_MIN_SIZE,
+                    max_size=DB_POOL_MAX_SIZE,
+                    max_inactive_connection_lifetime=DB_POOL_MAX_INACTIVE_SECONDS,
+                    command_timeout=DB_COMMAND_TIMEOUT_SECONDS,
+                    **kwargs,
+                )
+                logger.info(f"✅ DB 풀 준비 완료 (max={DB_POOL_MAX_SIZE})")
+                return
+            except Exception as e:
+                logger.warning(f"DB 풀 생성 실패 (SSL: {ssl_option}): {e}")
+        raise ConnectionError("모든 연결 방법 실패")
+
+    async def stop(self):
+        """풀 종료"""
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    def acquire(self):
+        """커넥션 (async with)"""
+        if self.pool is None:
+            raise ConnectionError("DB 풀이 준비되지 않았습니다")
+        return self.pool.acquire()
+
+    def status(self) -> Dict:
+        if self.pool is None:
+            return {"status": "not_configured" if not self.is_configured else "disconnected"}
+        return {
+            "status": "connected",
+            "size": self.pool.get_size(),
+            "idle": self.pool.get_idle_size(),
+            "max": self.pool.get_max_size(),
+        }
+
+
+database = Database()
@@ -0,0 +1,97 @@
+import hashlib
+import logging
+import os
+import re
+import unicodedata
+from typing import List
+
+import numpy as np
+
+# sentence-transformers는 선택 사항 (EMBEDDING_MODEL 지정 + 설치 시에만 사용)
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+logger = logging.getLogger("chatbot_service")
+
+# 임베딩 설정
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "")
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "384"))
+
+_WHITESPACE = re.compile(r"\s+")
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def normalize_text(text: str) -> str:
+    """비교용 정규화 (NFKC, 소문자, 문장부호 제거, 공백 정리)"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class HashingEmbedder:
+    """
+    문자 n-gram 해싱 임베딩 (모델 파일 없이 CPU에서 동작)
+
+    한국어는 띄어쓰기/조사 변화가 많아 어절 대신 문자 1~2-gram을 차원에 해싱하고
+    빈도를 제곱근으로 완화한 뒤 L2 정규화한다. 내적이 곧 코사인 유사도이다.
+    어휘 기반이라 표현만 조금 다른 질문은 가깝게, 뜻이 같아도 단어가 다르면 멀게 나온다.
+    """
+
+    # 어휘가 겹치면 뜻이 반대여도 가깝게 나오므로(늘었는데/줄었는데) 의미 캐시에는 쓰지 않는다
+    semantic = False
+
+    def __init__(self, dim: int = EMBEDDING_DIM, ngram_range=(1, 2)):
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text: str):
+        compact = normalize_text(text).replace(" ", "_")
+        for n in range(self.ngram_range[0], self.ngram_range[1] + 1):
+            for i in range(max(1, len(compact) - n + 1)):
+                yield compact[i:i + n]
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+                vectors[row, int.from_bytes(digest, "little") % self.dim] += 1.0
+        np.sqrt(vectors, out=vectors)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+class SentenceTransformerEmbedder:
+    """sentence-transformers 로컬 모델 (CPU)"""
+
+    semantic = True
+
+    def __init__(self, model_name: str):
+        self._model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self._model.get_sentence_embedding_dimension()
+        self.name = model_name
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return self._model.encode(
+            texts, batch_size=64, normalize_embeddings=True, convert_to_numpy=True
+        ).astype(np.float32)
+
+
+def create_embedder():
+    """EMBEDDING_MODEL이 있고 sentence-transformers가 설치되어 있으면 모델, 아니면 해싱 임베딩"""
+    if EMBEDDING_MODEL:
+        if SentenceTransformer is None:
+            logger.warning("⚠️ EMBEDDING_MODEL이 설정됐지만 sentence-transformers가 없어 해싱 임베딩을 사용합니다")
+        else:
+            try:
+                return SentenceTransformerEmbedder(EMBEDDING_MODEL)
+            except Exception as e:
+                logger.warning(f"⚠️ 임베딩 모델 로드 실패 (해싱 임베딩으로 대체): {e}")
+    return HashingEmbedder()
+
+
+embedder = create_embedder()
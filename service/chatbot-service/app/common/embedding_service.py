@@ -0,0 +1,259 @@
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .embedding import embedder
+
+logger = logging.getLogger("chatbot_service")
+
+# 마이크로 배치 / 캐시 설정
+EMBED_BATCH_MAX = int(os.getenv("EMBED_BATCH_MAX", "64"))
+EMBED_BATCH_WAIT_MS = float(os.getenv("EMBED_BATCH_WAIT_MS", "5"))
+EMBEDDING_MEMORY_CACHE = int(os.getenv("EMBEDDING_MEMORY_CACHE", "20000"))
+EMBEDDING_CACHE_PATH = os.getenv(
+    "EMBEDDING_CACHE_PATH", str(Path(__file__).resolve().parents[1] / "data" / "embedding_cache.sqlite3")
+)
+EMBEDDING_DISK_CACHE_MAX_ROWS = int(os.getenv("EMBEDDING_DISK_CACHE_MAX_ROWS", "1000000"))
+
+# (키, 텍스트, 결과를 받을 future)
+_Request = Tuple[bytes, str, asyncio.Future]
+
+
+class _DiskCache:
+    """내용 해시 → 벡터 SQLite 저장소 (임베딩 스레드에서만 사용)"""
+
+    def __init__(self, path: str, max_rows: int):
+        self.path = path
+        self.max_rows = max_rows
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+
+    def open(self):
+        if self._conn is not None:
+            return
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)")
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        found: Dict[bytes, np.ndarray] = {}
+        # SQLite 바인딩 변수 수 제한 안에서 나눠 조회
+        for start in range(0, len(keys), 500):
+            part = keys[start:start + 500]
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(part))})", part
+            ).fetchall()
+            for key, vector in rows:
+                found[key] = np.frombuffer(vector, dtype=np.float32)
+        return found
+
+    def put_many(self, items: List[Tuple[bytes, np.ndarray]]):
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, vector.astype(np.float32).tobytes()) for key, vector in items],
+            )
+        self._writes += len(items)
+        if self._writes >= 10000:
+            self._writes = 0
+            self._prune()
+
+    def _prune(self):
+        """최대 행 수를 넘으면 오래 전에 넣은 것부터 삭제"""
+        count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        if count > self.max_rows:
+            with self._conn:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE rowid IN (SELECT rowid FROM embeddings ORDER BY rowid LIMIT ?)",
+                    (count - self.max_rows,),
+                )
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] if self._conn else 0
+
+
+class EmbeddingService:
+    """
+    요청 경로용 임베딩 서비스
+
+    동시에 들어온 임베딩 요청을 최대 EMBED_BATCH_MAX개 또는 첫 요청 후 EMBED_BATCH_WAIT_MS까지
+    모아 전용 스레드에서 한 번의 벡터화 호출로 처리한다. 결과는 (임베딩 방식, 텍스트) 해시를
+    키로 메모리 LRU와 디스크(SQLite)에 저장하므로 같은 문서나 질문은 다시 계산하지 않는다.
+    """
+
+    def __init__(self, batch_max: int = EMBED_BATCH_MAX, batch_wait_ms: float = EMBED_BATCH_WAIT_MS,
+                 memory_cache_size: int = EMBEDDING_MEMORY_CACHE, cache_path: Optional[str] = EMBEDDING_CACHE_PATH,
+                 disk_max_rows: int = EMBEDDING_DISK_CACHE_MAX_ROWS):
+        self.batch_max = batch_max
+        self.batch_wait = batch_wait_ms / 1000
+        self.memory_cache_size = memory_cache_size
+        self.dim = embedder.dim
+        self._memory: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._disk = _DiskCache(cache_path, disk_max_rows) if cache_path else None
+        # 모델 호출과 SQLite 접근을 한 스레드로 직렬화
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding")
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {
+            "requests": 0, "memory_hits": 0, "disk_hits": 0, "computed": 0,
+            "batches": 0, "batched_texts": 0, "last_batch_ms": 0.0,
+        }
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(f"{embedder.name}\0{text}".encode("utf-8"), digest_size=16).digest()
+
+    async def start(self):
+        if self._disk is not None:
+            try:
+                await self._run_in_thread(self._disk.open)
+            except Exception as e:
+                logger.warning(f"⚠️ 임베딩 디스크 캐시 열기 실패 (메모리 캐시만 사용): {e}")
+                self._disk = None
+        self._ensure_worker()
+
+    async def stop(self):
+        """대기 중인 요청을 처리하고 종료"""
+        if self._task is not None:
+            await self._queue.put(None)
+            await self._task
+            self._task = None
+        if self._disk is not None:
+            await self._run_in_thread(self._disk.close)
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._worker())
+
+    async def _run_in_thread(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _remember(self, key: bytes, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_cache_size:
+            self._memory.popitem(last=False)
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """텍스트 목록 → (N, dim) 정규화 벡터"""
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        self.stats["requests"] += len(texts)
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+        waiting: List[Tuple[int, asyncio.Future]] = []
+        loop = asyncio.get_running_loop()
+        self._ensure_worker()
+        for index, text in enumerate(texts):
+            key = self._key(text)
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                vectors[index] = vector
+                continue
+            future = loop.create_future()
+            self._queue.put_nowait((key, text, future))
+            waiting.append((index, future))
+        for index, future in waiting:
+            vectors[index] = await future
+        return np.vstack(vectors)
+
+    async def embed_one(self, text: str) -> np.ndarray:
+        return (await self.embed([text]))[0]
+
+    async def _worker(self):
+        while True:
+            request = await self._queue.get()
+            if request is None:
+                return
+            batch: List[_Request] = [request]
+            deadline = time.monotonic() + self.batch_wait
+            stop = False
+            # 최대 크기 또는 대기 시간까지 모은다
+            while len(batch) < self.batch_max:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0 and self._queue.empty():
+                    break
+                try:
+                    request = self._queue.get_nowait() if timeout <= 0 else await asyncio.wait_for(self._queue.get(), timeout)
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+                if request is None:
+                    stop = True
+                    break
+                batch.append(request)
+            await self._process(batch)
+            if stop:
+                return
+
+    async def _process(self, batch: List[_Request]):
+        started = time.perf_counter()
+        try:
+            results = await self._run_in_thread(self._compute, [(key, text) for key, text, _ in batch])
+        except Exception as e:
+            logger.error(f"❌ 임베딩 배치 실패: {e}")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (key, _, future), vector in zip(batch, results):
+            self._remember(key, vector)
+            if not future.done():
+                future.set_result(vector)
+        self.stats["batches"] += 1
+        self.stats["batched_texts"] += len(batch)
+        self.stats["last_batch_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    def _compute(self, items: List[Tuple[bytes, str]]) -> List[np.ndarray]:
+        """(임베딩 스레드) 디스크 캐시 조회 → 나머지만 한 번에 임베딩 → 디스크 저장"""
+        unique: Dict[bytes, str] = dict(items)
+        if self._disk is not None:
+            self._disk.open()
+        found = self._disk.get_many(list(unique)) if self._disk is not None else {}
+        self.stats["disk_hits"] += len(found)
+        missing = [key for key in unique if key not in found]
+        if missing:
+            computed = embedder.embed([unique[key] for key in missing])
+            new_items = list(zip(missing, computed))
+            found.update(new_items)
+            self.stats["computed"] += len(missing)
+            if self._disk is not None:
+                try:
+                    self._disk.put_many(new_items)
+                except Exception as e:
+                    logger.warning(f"⚠️ 임베딩 디스크 캐시 저장 실패: {e}")
+        return [found[key] for key, _ in items]
+
+    def metrics(self) -> Dict:
+        batches = self.stats["batches"]
+        return {
+            **self.stats,
+            "embedder": embedder.name,
+            "avg_batch_size": round(self.stats["batched_texts"] / batches, 2) if batches else 0.0,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "memory_entries": len(self._memory),
+            "disk_cache": self._disk is not None,
+        }
+
+
+embedding_service = EmbeddingService()
@@ -0,0 +1,26 @@
+from .domain.discovery.controller.chatbot_controller import ChatbotController
+from .domain.discovery.repository.chatbot_repository import ChatbotRepository
+from .domain.discovery.service.chatbot_service import ChatbotService
+from .domain.discovery.service.llm_runtime import LLMRuntime
+from .domain.retrieval.controller.retrieval_controller import RetrievalController
+from .domain.retrieval.service.retrieval_service import retrieval_service
+from .domain.diagnosis.controller.diagnosis_controller import DiagnosisController
+from .domain.diagnosis.service.job_service import job_service
+
+
+class AppContainer:
+    """
+    앱 수명 동안 하나만 만드는 객체 묶음
+
+    lifespan에서 LLM 실행 환경(클라이언트, 프롬프트 템플릿)이 준비된 뒤 만들어 app.state.container에
+    둔다. 리포지토리, 서비스, 컨트롤러는 요청 상태를 갖지 않으므로 요청들이 그대로 함께 쓰고,
+    요청마다 달라지는 값(회사/사용자)은 라우터가 헤더에서 읽어 인자로 넘긴다.
+    """
+
+    def __init__(self, runtime: LLMRuntime):
+        self.runtime = runtime
+        self.chatbot_repository = ChatbotRepository()
+        self.chatbot_service = ChatbotService(self.chatbot_repository, runtime)
+        self.chatbot_controller = ChatbotController(self.chatbot_service)
+        self.retrieval_controller = RetrievalController(retrieval_service)
+        self.diagnosis_controller = DiagnosisController(job_service)
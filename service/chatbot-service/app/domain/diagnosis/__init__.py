@@ -0,0 +1,9 @@
+from .controller.diagnosis_controller import DiagnosisController
+from .service.job_service import JobService, job_service
+from .service.diagnosis_pipeline import DiagnosisPipeline
+from .repository.job_store import JobStore, MemoryJobStore
+from .model.diagnosis_model import (
+    DiagnosisJobRequest,
+    DiagnosisJobSubmitResponse,
+    DiagnosisJobResponse
+)
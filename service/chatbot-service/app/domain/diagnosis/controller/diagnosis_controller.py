@@ -0,0 +1,64 @@
+from fastapi import HTTPException
+from typing import AsyncIterator, Dict
+import json
+import logging
+
+from ..service.job_service import JobService, TooManyJobs
+from ..model.diagnosis_model import DiagnosisJobRequest, DiagnosisJobSubmitResponse, DiagnosisJobResponse
+
+logger = logging.getLogger("chatbot_service")
+
+class DiagnosisController:
+    def __init__(self, job_service: JobService):
+        self.job_service = job_service
+
+    @staticmethod
+    def _to_response(job: Dict) -> DiagnosisJobResponse:
+        return DiagnosisJobResponse(
+            job_id=job["id"],
+            status=job["status"],
+            progress=job["progress"],
+            step=job["step"],
+            attempts=job["attempts"],
+            result=job["result"],
+            error=job["error"],
+            created_at=job["created_at"],
+            started_at=job["started_at"],
+            finished_at=job["finished_at"]
+        )
+
+    async def submit(self, request: DiagnosisJobRequest, company_id: str, user_id: int) -> DiagnosisJobSubmitResponse:
+        """진단 작업을 접수하고 작업 ID를 바로 돌려줍니다."""
+        if not request.assessment:
+            raise HTTPException(status_code=400, detail="진단 자료가 비어 있습니다")
+        try:
+            job = await self.job_service.submit(company_id, user_id, request.model_dump())
+        except TooManyJobs as e:
+            raise HTTPException(status_code=429, detail=str(e))
+        except Exception as e:
+            logger.error(f"❌ 진단 작업 접수 오류: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"진단 작업 접수 중 오류가 발생했습니다: {str(e)}"
+            )
+        return DiagnosisJobSubmitResponse(job_id=job["id"], status=job["status"])
+
+    async def get_job(self, job_id: int, company_id: str, user_id: int) -> DiagnosisJobResponse:
+        """진단 작업 상태와 결과를 조회합니다."""
+        job = await self.job_service.get(job_id, company_id, user_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="진단 작업을 찾을 수 없습니다")
+        return self._to_response(job)
+
+    async def stream_job(self, job_id: int, company_id: str, user_id: int) -> AsyncIterator[str]:
+        """진단 작업 진행 상황을 server-sent events로 전송합니다."""
+        async for job in self.job_service.watch(job_id, company_id, user_id):
+            response = self._to_response(job)
+            if job["status"] == "succeeded":
+                event = "done"
+            elif job["status"] == "failed":
+                event = "error"
+            else:
+                event = "progress"
+                response.result = None
+            yield f"event: {event}\ndata: {json.dumps(response.model_dump(mode='json'), ensure_ascii=False)}\n\n"
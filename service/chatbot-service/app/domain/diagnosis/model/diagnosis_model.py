@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+
+class DiagnosisJobRequest(BaseModel):
+    """기업 종합 진단 작업 요청 모델"""
+    company_name: Optional[str] = None
+    assessment: Dict[str, Any]  # 진단 설문/재무 자료 등
+    areas: Optional[List[str]] = None  # 없으면 DIAGNOSIS_AREAS
+
+class DiagnosisJobSubmitResponse(BaseModel):
+    """진단 작업 접수 응답 모델"""
+    job_id: int
+    status: str
+
+class DiagnosisJobResponse(BaseModel):
+    """진단 작업 조회 응답 모델"""
+    job_id: int
+    status: str  # queued, running, succeeded, failed
+    progress: float
+    step: Optional[str] = None
+    attempts: int
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
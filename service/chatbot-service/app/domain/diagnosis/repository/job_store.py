@@ -0,0 +1,261 @@
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from ....common.database import database, Database
+from ....common.snowflake import next_id
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+FINISHED = {SUCCEEDED, FAILED}
+
+JOB_COLUMNS = """
+    id, company_id, user_id, status, payload, progress, step, checkpoint, result, error,
+    attempts, lease_id, created_at, started_at, finished_at, updated_at
+"""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _updated(status: str) -> bool:
+    """asyncpg execute 결과 ("UPDATE n") → 한 행 이상 바뀌었는지"""
+    return status.split()[-1] != "0"
+
+
+def _to_job(record) -> Dict[str, Any]:
+    job = dict(record)
+    for field in ("payload", "checkpoint", "result"):
+        if isinstance(job.get(field), str):
+            job[field] = json.loads(job[field])
+    return job
+
+
+class JobStore:
+    """
+    진단 작업 저장소 (diagnosis_jobs 테이블)
+
+    작업을 가져갈 때 lease_until을 잡고, 실행 중에는 진행 상황을 쓸 때마다 연장한다. 프로세스가
+    죽어 연장이 끊기면 lease가 지난 작업을 다른 워커(재시작한 자신 포함)가 다시 가져가며,
+    FOR UPDATE SKIP LOCKED로 여러 복제본이 같은 작업을 동시에 가져가지 않는다.
+
+    가져갈 때마다 새 lease_id를 발급하고, 이후 상태 변경은 모두 그 lease_id가 그대로일 때만 반영한다.
+    lease가 끝나 다른 워커가 다시 가져간 작업에 늦게 끝난 이전 워커가 쓰지 못하도록 하는 펜싱
+    토큰이며, 각 메서드는 반영 여부를 돌려준다 (False면 lease를 잃은 것).
+    """
+
+    def __init__(self, db: Database = database):
+        self.db = db
+
+    @property
+    def persistent(self) -> bool:
+        return True
+
+    async def create(self, job_id: int, company_id: str, user_id: int, payload: Dict) -> Dict:
+        async with self.db.acquire() as conn:
+            record = await conn.fetchrow(f"""
+                INSERT INTO diagnosis_jobs (id, company_id, user_id, status, payload)
+                VALUES ($1, $2, $3, '{QUEUED}', $4::jsonb)
+                RETURNING {JOB_COLUMNS}
+            """, job_id, company_id, user_id, json.dumps(payload, ensure_ascii=False))
+        return _to_job(record)
+
+    async def get(self, job_id: int) -> Optional[Dict]:
+        async with self.db.acquire() as conn:
+            record = await conn.fetchrow(f"SELECT {JOB_COLUMNS} FROM diagnosis_jobs WHERE id = $1", job_id)
+        return _to_job(record) if record else None
+
+    async def count_active(self, company_id: str, user_id: int) -> int:
+        async with self.db.acquire() as conn:
+            return await conn.fetchval(f"""
+                SELECT COUNT(*) FROM diagnosis_jobs
+                WHERE status IN ('{QUEUED}', '{RUNNING}')
+                  AND (CASE WHEN $1 <> '' THEN company_id = $1 ELSE user_id = $2 END)
+            """, company_id, user_id)
+
+    async def claim(self, lease_seconds: float) -> Optional[Dict]:
+        """실행할 작업 하나 가져오기 (대기 중이거나 lease가 끝난 실행 중 작업)"""
+        async with self.db.acquire() as conn:
+            record = await conn.fetchrow(f"""
+                UPDATE diagnosis_jobs
+                SET status = '{RUNNING}', attempts = attempts + 1, lease_id = $2,
+                    lease_until = NOW() + make_interval(secs => $1),
+                    started_at = COALESCE(started_at, NOW()), updated_at = NOW()
+                WHERE id = (
+                    SELECT id FROM diagnosis_jobs
+                    WHERE (status = '{QUEUED}' AND run_after <= NOW())
+                       OR (status = '{RUNNING}' AND lease_until < NOW())
+                    ORDER BY run_after, id
+                    FOR UPDATE SKIP LOCKED
+                    LIMIT 1
+                )
+                RETURNING {JOB_COLUMNS}
+            """, lease_seconds, next_id())
+        return _to_job(record) if record else None
+
+    async def report(self, job_id: int, lease_id: int, progress: float, step: Optional[str],
+                     checkpoint: Dict, lease_seconds: float) -> bool:
+        """진행 상황 + 체크포인트 저장 (lease 연장 포함)"""
+        async with self.db.acquire() as conn:
+            status = await conn.execute(f"""
+                UPDATE diagnosis_jobs
+                SET progress = $3, step = $4, checkpoint = $5::jsonb,
+                    lease_until = NOW() + make_interval(secs => $6), updated_at = NOW()
+                WHERE id = $1 AND lease_id = $2 AND status = '{RUNNING}'
+            """, job_id, lease_id, progress, step, json.dumps(checkpoint, ensure_ascii=False), lease_seconds)
+        return _updated(status)
+
+    async def heartbeat(self, job_id: int, lease_id: int, lease_seconds: float) -> bool:
+        async with self.db.acquire() as conn:
+            status = await conn.execute(f"""
+                UPDATE diagnosis_jobs SET lease_until = NOW() + make_interval(secs => $3)
+                WHERE id = $1 AND lease_id = $2 AND status = '{RUNNING}'
+            """, job_id, lease_id, lease_seconds)
+        return _updated(status)
+
+    async def complete(self, job_id: int, lease_id: int, result: Dict) -> bool:
+        async with self.db.acquire() as conn:
+            status = await conn.execute(f"""
+                UPDATE diagnosis_jobs
+                SET status = '{SUCCEEDED}', progress = 1, step = NULL, result = $3::jsonb, error = NULL,
+                    lease_until = NULL, finished_at = NOW(), updated_at = NOW()
+                WHERE id = $1 AND lease_id = $2 AND status = '{RUNNING}'
+            """, job_id, lease_id, json.dumps(result, ensure_ascii=False))
+        return _updated(status)
+
+    async def fail(self, job_id: int, lease_id: int, error: str) -> bool:
+        async with self.db.acquire() as conn:
+            status = await conn.execute(f"""
+                UPDATE diagnosis_jobs
+                SET status = '{FAILED}', error = $3, lease_until = NULL, finished_at = NOW(), updated_at = NOW()
+                WHERE id = $1 AND lease_id = $2 AND status = '{RUNNING}'
+            """, job_id, lease_id, error)
+        return _updated(status)
+
+    async def retry(self, job_id: int, lease_id: int, error: Optional[str], delay_seconds: float = 0) -> bool:
+        """실패 후 대기열로 되돌리기 (delay_seconds 뒤에 다시 실행)"""
+        async with self.db.acquire() as conn:
+            status = await conn.execute(f"""
+                UPDATE diagnosis_jobs
+                SET status = '{QUEUED}', error = $3, lease_until = NULL,
+                    run_after = NOW() + make_interval(secs => $4), updated_at = NOW()
+                WHERE id = $1 AND lease_id = $2 AND status = '{RUNNING}'
+            """, job_id, lease_id, error, delay_seconds)
+        return _updated(status)
+
+    async def release(self, job_id: int, lease_id: int) -> bool:
+        """종료 시 실행 중이던 작업 반납 (시도 횟수에 넣지 않는다)"""
+        async with self.db.acquire() as conn:
+            status = await conn.execute(f"""
+                UPDATE diagnosis_jobs
+                SET status = '{QUEUED}', attempts = attempts - 1, lease_until = NULL,
+                    run_after = NOW(), updated_at = NOW()
+                WHERE id = $1 AND lease_id = $2 AND status = '{RUNNING}'
+            """, job_id, lease_id)
+        return _updated(status)
+
+
+class MemoryJobStore:
+    """DB가 없을 때 쓰는 프로세스 메모리 저장소 (재시작하면 작업이 사라진다, 개발용)"""
+
+    def __init__(self):
+        self._jobs: Dict[int, Dict] = {}
+
+    @property
+    def persistent(self) -> bool:
+        return False
+
+    def _update(self, job_id: int, **fields):
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.update(fields, updated_at=_now())
+        return job
+
+    def _leased(self, job_id: int, lease_id: int) -> Optional[Dict]:
+        job = self._jobs.get(job_id)
+        return job if job is not None and job["status"] == RUNNING and job["lease_id"] == lease_id else None
+
+    async def create(self, job_id: int, company_id: str, user_id: int, payload: Dict) -> Dict:
+        now = _now()
+        self._jobs[job_id] = {
+            "id": job_id, "company_id": company_id, "user_id": user_id, "status": QUEUED,
+            "payload": payload, "progress": 0.0, "step": None, "checkpoint": {}, "result": None,
+            "error": None, "attempts": 0, "lease_id": None, "created_at": now, "started_at": None, "finished_at": None,
+            "updated_at": now, "run_after": time.monotonic(), "lease_until": None,
+        }
+        return dict(self._jobs[job_id])
+
+    async def get(self, job_id: int) -> Optional[Dict]:
+        job = self._jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+    async def count_active(self, company_id: str, user_id: int) -> int:
+        return sum(
+            1 for job in self._jobs.values()
+            if job["status"] in (QUEUED, RUNNING)
+            and (job["company_id"] == company_id if company_id else job["user_id"] == user_id)
+        )
+
+    async def claim(self, lease_seconds: float) -> Optional[Dict]:
+        now = time.monotonic()
+        candidates = [
+            job for job in self._jobs.values()
+            if (job["status"] == QUEUED and job["run_after"] <= now)
+            or (job["status"] == RUNNING and job["lease_until"] < now)
+        ]
+        if not candidates:
+            return None
+        job = min(candidates, key=lambda item: (item["run_after"], item["id"]))
+        self._update(
+            job["id"], status=RUNNING, attempts=job["attempts"] + 1, lease_id=next_id(),
+            lease_until=now + lease_seconds, started_at=job["started_at"] or _now()
+        )
+        return dict(job)
+
+    async def report(self, job_id: int, lease_id: int, progress: float, step: Optional[str],
+                     checkpoint: Dict, lease_seconds: float) -> bool:
+        if self._leased(job_id, lease_id) is None:
+            return False
+        self._update(job_id, progress=progress, step=step, checkpoint=checkpoint,
+                     lease_until=time.monotonic() + lease_seconds)
+        return True
+
+    async def heartbeat(self, job_id: int, lease_id: int, lease_seconds: float) -> bool:
+        job = self._leased(job_id, lease_id)
+        if job is None:
+            return False
+        job["lease_until"] = time.monotonic() + lease_seconds
+        return True
+
+    async def complete(self, job_id: int, lease_id: int, result: Dict) -> bool:
+        if self._leased(job_id, lease_id) is None:
+            return False
+        self._update(job_id, status=SUCCEEDED, progress=1.0, step=None, result=result, error=None,
+                     lease_until=None, finished_at=_now())
+        return True
+
+    async def fail(self, job_id: int, lease_id: int, error: str) -> bool:
+        if self._leased(job_id, lease_id) is None:
+            return False
+        self._update(job_id, status=FAILED, error=error, lease_until=None, finished_at=_now())
+        return True
+
+    async def retry(self, job_id: int, lease_id: int, error: Optional[str], delay_seconds: float = 0) -> bool:
+        if self._leased(job_id, lease_id) is None:
+            return False
+        self._update(job_id, status=QUEUED, error=error, lease_until=None,
+                     run_after=time.monotonic() + delay_seconds)
+        return True
+
+    async def release(self, job_id: int, lease_id: int) -> bool:
+        job = self._leased(job_id, lease_id)
+        if job is None:
+            return False
+        self._update(job_id, status=QUEUED, attempts=job["attempts"] - 1, lease_until=None,
+                     run_after=time.monotonic())
+        return True
@@ -0,0 +1,73 @@
+import json
+import logging
+import os
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from ...discovery.service.chatbot_service import ChatbotService
+from ...discovery.service.context_window import context_window
+from ...retrieval.service.retrieval_service import retrieval_service
+
+logger = logging.getLogger("chatbot_service")
+
+# 진단 파이프라인 설정
+DIAGNOSIS_AREAS = [area.strip() for area in os.getenv("DIAGNOSIS_AREAS", "재무,운영,마케팅,인사").split(",") if area.strip()]
+DIAGNOSIS_INPUT_TOKENS = int(os.getenv("DIAGNOSIS_INPUT_TOKENS", "3000"))
+
+AREA_PROMPT = (
+    "당신은 중소기업 진단 전문 컨설턴트입니다. 주어진 진단 자료를 근거로 지정된 분야의 현황, 강점, "
+    "문제점, 개선 과제를 한국어로 구체적으로 정리하세요. 자료에 없는 수치는 만들지 마세요."
+)
+
+SUMMARY_PROMPT = (
+    "당신은 중소기업 진단 전문 컨설턴트입니다. 분야별 진단 결과를 종합해 회사 전체의 핵심 문제, "
+    "우선순위가 높은 개선 과제 3~5개, 실행 순서를 한국어로 정리하세요."
+)
+
+# (진행률 0~1, 현재 단계, 체크포인트) → 저장
+ReportProgress = Callable[[float, Optional[str], Dict], Awaitable[None]]
+
+
+class DiagnosisPipeline:
+    """
+    기업 종합 진단 (분야별 분석 → 종합)
+
+    분야마다 진단 자료 + 관련 방법론 문서로 LLM 분석을 한 번씩 하고, 마지막에 분야별 결과를
+    종합한다. 단계가 끝날 때마다 결과를 체크포인트로 저장하므로 워커가 재시작돼도 끝난 단계는
+    다시 호출하지 않는다.
+    """
+
+    def __init__(self, chatbot_service: ChatbotService, areas: Optional[List[str]] = None):
+        self.chatbot_service = chatbot_service
+        self.areas = areas or DIAGNOSIS_AREAS
+
+    async def run(self, job: Dict, report: ReportProgress) -> Dict:
+        payload = job["payload"]
+        tenant = f"company:{job['company_id']}" if job["company_id"] else f"user:{job['user_id']}"
+        areas = payload.get("areas") or self.areas
+        company_name = payload.get("company_name") or "대상 회사"
+        material = context_window.counter.truncate(
+            json.dumps(payload.get("assessment") or {}, ensure_ascii=False, indent=1), DIAGNOSIS_INPUT_TOKENS
+        )
+        checkpoint = dict(job.get("checkpoint") or {})
+        results: Dict[str, str] = dict(checkpoint.get("areas") or {})
+        total_steps = len(areas) + 1
+
+        for area in areas:
+            if area in results:
+                continue
+            await report(len(results) / total_steps, f"{area} 분석", checkpoint)
+            documents = await retrieval_service.search(f"{area} 진단", tenant)
+            references = "\n\n".join(f"[{document['title']}]\n{document['text']}" for document in documents)
+            prompt = f"회사: {company_name}\n분야: {area}\n\n진단 자료:\n{material}"
+            if references:
+                prompt += f"\n\n참고 방법론:\n{references}"
+            results[area] = await self.chatbot_service.complete(AREA_PROMPT, prompt, tenant, job["user_id"])
+            checkpoint = {**checkpoint, "areas": results}
+            await report(len(results) / total_steps, f"{area} 분석 완료", checkpoint)
+
+        await report(len(areas) / total_steps, "종합 진단", checkpoint)
+        findings = "\n\n".join(f"## {area}\n{results[area]}" for area in areas)
+        summary = await self.chatbot_service.complete(
+            SUMMARY_PROMPT, f"회사: {company_name}\n\n{findings}", tenant, job["user_id"]
+        )
+        return {"company_name": company_name, "areas": {area: results[area] for area in areas}, "summary": summary}
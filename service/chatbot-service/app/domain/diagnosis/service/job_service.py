@@ -0,0 +1,222 @@
+import asyncio
+import logging
+import os
+import time
+from typing import AsyncIterator, Dict, List, Optional, Set, Union
+
+from ....common.database import database
+from ....common.snowflake import next_id
+from ...discovery.service.chatbot_service import ChatbotService
+from ...discovery.service.llm_scheduler import LLMOverloaded
+from ..repository.job_store import JobStore, MemoryJobStore, FINISHED
+from .diagnosis_pipeline import DiagnosisPipeline
+
+logger = logging.getLogger("chatbot_service")
+
+# 진단 작업 설정
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "2"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_DELAY_SECONDS = float(os.getenv("JOB_RETRY_DELAY_SECONDS", "10"))
+JOB_MAX_ACTIVE_PER_TENANT = int(os.getenv("JOB_MAX_ACTIVE_PER_TENANT", "5"))
+
+
+class TooManyJobs(Exception):
+    """테넌트의 대기/실행 중 작업이 한도를 넘은 경우"""
+
+
+class LeaseLost(Exception):
+    """lease가 끝나 다른 워커가 작업을 다시 가져간 경우 (이 워커는 더 쓰지 않고 손을 뗀다)"""
+
+
+class JobService:
+    """
+    장시간 진단 작업 실행기
+
+    제출하면 작업을 저장소에 넣고 ID만 바로 돌려준다. JOB_WORKERS개의 워커가 저장소에서 작업을
+    가져가 실행하고, 진행 상황과 단계별 체크포인트, 결과를 저장소에 기록한다. 실행 중에는 lease를
+    주기적으로 연장하며, 프로세스가 죽으면 lease가 끝난 뒤 다시 가져가 체크포인트부터 이어서
+    실행한다. 정상 종료할 때는 실행 중이던 작업을 바로 대기열로 돌려놓는다. 저장소 쓰기는 가져갈 때
+    받은 lease_id로 펜싱되므로, lease를 잃은 워커는 다음 쓰기에서 멈추고 결과를 덮어쓰지 않는다.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, lease_seconds: float = JOB_LEASE_SECONDS,
+                 poll_seconds: float = JOB_POLL_SECONDS, max_attempts: int = JOB_MAX_ATTEMPTS,
+                 retry_delay: float = JOB_RETRY_DELAY_SECONDS,
+                 max_active_per_tenant: int = JOB_MAX_ACTIVE_PER_TENANT):
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.max_active_per_tenant = max_active_per_tenant
+        self.store: Union[JobStore, MemoryJobStore] = MemoryJobStore()
+        self.pipeline: Optional[DiagnosisPipeline] = None
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._watchers: Dict[int, Set[asyncio.Event]] = {}
+        self._running: Set[int] = set()
+        self.stats = {"submitted": 0, "succeeded": 0, "failed": 0, "retried": 0, "resumed": 0, "lease_lost": 0,
+                      "worker_errors": 0}
+
+    async def start(self, chatbot_service: ChatbotService):
+        if database.is_ready:
+            self.store = JobStore(database)
+        else:
+            logger.warning("⚠️ DB가 없어 진단 작업을 메모리에만 보관합니다 (재시작 시 유실)")
+        self.pipeline = DiagnosisPipeline(chatbot_service)
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker(index)) for index in range(self.workers)]
+        logger.info(f"✅ 진단 작업 워커 {self.workers}개 시작")
+
+    async def stop(self):
+        """워커 종료 (실행 중이던 작업은 대기열로 반납)"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, company_id: str, user_id: int, payload: Dict) -> Dict:
+        if await self.store.count_active(company_id, user_id) >= self.max_active_per_tenant:
+            raise TooManyJobs(f"진행 중인 진단 작업이 {self.max_active_per_tenant}건을 넘었습니다")
+        job = await self.store.create(next_id(), company_id, user_id, payload)
+        self.stats["submitted"] += 1
+        self._wakeup.set()
+        logger.info(f"📝 진단 작업 접수: {job['id']}")
+        return job
+
+    async def get(self, job_id: int, company_id: str, user_id: int) -> Optional[Dict]:
+        """작업 조회 (같은 회사, 회사가 없으면 본인 작업만)"""
+        job = await self.store.get(job_id)
+        if job is None:
+            return None
+        owner = job["company_id"] == company_id if company_id else job["user_id"] == user_id
+        return job if owner else None
+
+    async def watch(self, job_id: int, company_id: str, user_id: int) -> AsyncIterator[Dict]:
+        """작업이 바뀔 때마다 최신 상태 (끝나면 종료)"""
+        last_update = None
+        changed = asyncio.Event()
+        self._watchers.setdefault(job_id, set()).add(changed)
+        try:
+            while True:
+                job = await self.get(job_id, company_id, user_id)
+                if job is None:
+                    return
+                if job["updated_at"] != last_update:
+                    last_update = job["updated_at"]
+                    yield job
+                if job["status"] in FINISHED:
+                    return
+                # 이 프로세스의 워커가 갱신하면 바로, 다른 복제본이 갱신하면 폴링으로 알아챈다
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                changed.clear()
+        finally:
+            watchers = self._watchers.get(job_id)
+            watchers.discard(changed)
+            if not watchers:
+                self._watchers.pop(job_id, None)
+
+    def _notify(self, job_id: int):
+        for changed in self._watchers.get(job_id, ()):
+            changed.set()
+
+    async def _worker(self, index: int):
+        while True:
+            try:
+                job = await self.store.claim(self.lease_seconds)
+            except Exception as e:
+                logger.warning(f"⚠️ 진단 작업 가져오기 실패: {e}")
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+            try:
+                await self._execute(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 상태 기록 실패(DB 장애 등) → 작업은 lease가 끝나면 다시 가져가고, 워커는 계속 돈다
+                self.stats["worker_errors"] += 1
+                logger.error(f"❌ 진단 작업 처리 중 저장소 오류: {job['id']}: {e}")
+
+    async def _execute(self, job: Dict):
+        job_id, lease_id = job["id"], job["lease_id"]
+        if job["attempts"] > self.max_attempts:
+            await self.store.fail(job_id, lease_id, "재시도 횟수를 초과했습니다")
+            self.stats["failed"] += 1
+            self._notify(job_id)
+            return
+        if job.get("checkpoint"):
+            self.stats["resumed"] += 1
+            logger.info(f"🔁 진단 작업 이어서 실행: {job_id} (시도 {job['attempts']})")
+
+        async def report(progress: float, step: Optional[str], checkpoint: Dict):
+            if not await self.store.report(job_id, lease_id, round(progress, 4), step, checkpoint,
+                                           self.lease_seconds):
+                raise LeaseLost()
+            self._notify(job_id)
+
+        self._running.add(job_id)
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, lease_id))
+        started = time.perf_counter()
+        try:
+            result = await self.pipeline.run(job, report)
+            if not await self.store.complete(job_id, lease_id, result):
+                raise LeaseLost()
+            self.stats["succeeded"] += 1
+            logger.info(f"✅ 진단 작업 완료: {job_id} ({time.perf_counter() - started:.1f}s)")
+        except asyncio.CancelledError:
+            # 서비스 종료 → 다른 워커가 바로 이어받도록 반납
+            await asyncio.shield(self.store.release(job_id, lease_id))
+            raise
+        except LeaseLost:
+            self.stats["lease_lost"] += 1
+            logger.warning(f"⚠️ 진단 작업 lease를 잃어 실행 중단 (다른 워커가 이어받음): {job_id}")
+        except LLMOverloaded as e:
+            await self._retry(job, str(e), max(e.retry_after, self.retry_delay))
+        except Exception as e:
+            logger.error(f"❌ 진단 작업 오류: {job_id}: {e}")
+            await self._retry(job, str(e), self.retry_delay * job["attempts"])
+        finally:
+            heartbeat.cancel()
+            self._running.discard(job_id)
+            self._notify(job_id)
+
+    async def _retry(self, job: Dict, error: str, delay: float):
+        if job["attempts"] >= self.max_attempts:
+            if await self.store.fail(job["id"], job["lease_id"], error):
+                self.stats["failed"] += 1
+            return
+        if await self.store.retry(job["id"], job["lease_id"], error, delay):
+            self.stats["retried"] += 1
+
+    async def _heartbeat(self, job_id: int, lease_id: int):
+        """긴 LLM 호출 중에도 lease가 끝나지 않게 연장 (lease를 잃으면 중단)"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                if not await self.store.heartbeat(job_id, lease_id, self.lease_seconds):
+                    logger.warning(f"⚠️ 진단 작업 lease를 잃음: {job_id}")
+                    return
+            except Exception as e:
+                logger.warning(f"⚠️ 진단 작업 lease 연장 실패: {job_id}: {e}")
+
+    def metrics(self) -> Dict:
+        return {
+            **self.stats,
+            "workers": self.workers,
+            "running": len(self._running),
+            "persistent": self.store.persistent,
+        }
+
+
+job_service = JobService()
@@ -1,11 +1,13 @@
 from fastapi import HTTPException, Depends
-from typing import Dict, List, Optional
-from datetime import datetime
-import time
+from typing import AsyncIterator, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+import json
 import logging
 
 from ..service.chatbot_service import ChatbotService
-from ..model.chatbot_model import ChatMessageRequest, LangChainResponse, ChatSessionResponse
+from ....common.snowflake import next_id
+from ..model.chatbot_model import ChatMessageRequest, LangChainResponse, ChatSessionListResponse, UsageResponse
+from ..repository.usage_meter import usage_meter, GROUP_BY
 
 logger = logging.getLogger("chatbot_service")
 
@@ -13,21 +15,44 @@ class ChatbotController:
     def __init__(self, chatbot_service: ChatbotService):
         self.chatbot_service = chatbot_service
     
-    async def send_message(self, message_request: ChatMessageRequest) -> LangChainResponse:
+    async def _resolve_session(self, message_request: ChatMessageRequest, user_id: int) -> tuple:
+        """세션 ID와 이전 대화 (세션이 없으면 새로 생성, 다른 사용자의 세션이면 404)"""
+        if message_request.session_id:
+            if not await self.chatbot_service.owns_session(message_request.session_id, user_id):
+                raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
+            history = await self.chatbot_service.get_history(message_request.session_id)
+            return message_request.session_id, history
+        session_id = await self.chatbot_service.start_session(user_id, message_request.message)
+        if session_id is None:
+            # 세션 행이 없으면 기록기가 메시지를 기록하지 않으므로 대화를 시작하지 않는다
+            raise HTTPException(status_code=503, detail="대화 세션을 만들지 못했습니다. 잠시 후 다시 시도해주세요.")
+        return session_id, []
+    
+    async def send_message(self, message_request: ChatMessageRequest,
+                           tenant: Optional[str] = None, user_id: int = 1) -> LangChainResponse:
         """AI 채팅봇에게 메시지를 전송하고 응답을 받습니다."""
         try:
             logger.info(f"🤖 메시지 수신: {message_request.message}")
             
-            # 간단한 사용자 ID (실제로는 JWT에서 추출)
-            user_id = 1
-            
-            # 세션 ID 생성 또는 사용
-            session_id = message_request.session_id or int(time.time())
+            # 세션 ID 생성 또는 사용 (기존 세션이면 이전 대화를 함께 전달)
+            session_id, history = await self._resolve_session(message_request, user_id)
             
             # 서비스를 통해 응답 생성
             response_data = await self.chatbot_service.generate_response(
                 message_request.message, 
-                message_request.context
+                message_request.context,
+                tenant,
+                history,
+                user_id
+            )
+            if response_data.get("error") == "overloaded":
+                raise HTTPException(
+                    status_code=503,
+                    detail=response_data["response"],
+                    headers={"Retry-After": str(int(response_data["retry_after"] + 0.5))}
+                )
+            message_id = await self.chatbot_service.record_turn(
+                session_id, user_id, message_request.message, response_data
             )
             
             logger.info(f"✅ 응답 생성 완료: {response_data['response']}")
@@ -35,11 +60,16 @@ class ChatbotController:
             return LangChainResponse(
                 response=response_data['response'],
                 session_id=session_id,
-                message_id=int(time.time()),  # 임시 message_id
+                message_id=message_id or next_id(),
                 tokens_used=response_data.get('tokens_used', 0),
-                processing_time=response_data.get('processing_time', 0.1)
+                prompt_tokens=response_data.get('prompt_tokens'),
+                completion_tokens=response_data.get('completion_tokens'),
+                processing_time=response_data.get('processing_time', 0.1),
+                queue_time=response_data.get('queue_time')
             )
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"❌ 메시지 처리 오류: {e}")
             raise HTTPException(
@@ -47,11 +77,54 @@ class ChatbotController:
                 detail=f"메시지 처리 중 오류가 발생했습니다: {str(e)}"
             )
     
-    async def get_chat_sessions(self, user_id: int) -> List[ChatSessionResponse]:
-        """사용자의 채팅 세션 목록을 조회합니다."""
+    async def stream_message(self, message_request: ChatMessageRequest,
+                             tenant: Optional[str] = None, user_id: int = 1) -> AsyncIterator[str]:
+        """AI 응답을 server-sent events 형식으로 스트리밍합니다.
+        
+        세션 확인은 스트림을 열기 전에 하므로 다른 사용자의 세션이면 응답 시작 전에 404가 난다.
+        """
+        logger.info(f"🤖 스트리밍 메시지 수신: {message_request.message}")
+        
+        session_id, history = await self._resolve_session(message_request, user_id)
+        return self._stream_events(message_request, tenant, user_id, session_id, history)
+    
+    async def _stream_events(self, message_request: ChatMessageRequest, tenant: Optional[str],
+                             user_id: int, session_id: int, history: List) -> AsyncIterator[str]:
+        # 응답 메시지 ID를 미리 발급해 start 이벤트로 알린다
+        message_id = next_id()
+        yield self._sse("start", {"session_id": session_id, "message_id": message_id})
+        
+        async for event in self.chatbot_service.stream_response(
+            message_request.message,
+            message_request.context,
+            tenant,
+            history,
+            user_id
+        ):
+            event_type = event.pop("type")
+            if event_type == "done":
+                await self.chatbot_service.record_turn(
+                    session_id, user_id, message_request.message, event, message_id
+                )
+                event.update(session_id=session_id, message_id=message_id)
+                logger.info(
+                    f"✅ 스트리밍 완료: TTFT {event['ttft_ms']}ms, {event['tokens_per_second']} tokens/sec"
+                )
+            yield self._sse(event_type, event)
+    
+    @staticmethod
+    def _sse(event: str, data: Dict) -> str:
+        """SSE 이벤트 한 건 직렬화"""
+        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    
+    async def get_chat_sessions(self, user_id: int, limit: int,
+                                cursor: Optional[str] = None) -> ChatSessionListResponse:
+        """사용자의 채팅 세션 목록을 최근 활동 순으로 한 페이지씩 조회합니다."""
         try:
-            sessions = await self.chatbot_service.get_chat_sessions(user_id)
-            return sessions
+            page = await self.chatbot_service.get_chat_sessions(user_id, limit, cursor)
+            return ChatSessionListResponse(**page)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             logger.error(f"❌ 세션 목록 조회 오류: {e}")
             raise HTTPException(
@@ -63,11 +136,40 @@ class ChatbotController:
         """채팅 세션을 삭제합니다."""
         try:
             logger.info(f"🗑️ 세션 삭제 요청: {session_id}")
-            result = await self.chatbot_service.delete_chat_session(session_id, user_id)
-            return {"message": "세션이 삭제되었습니다", "session_id": session_id}
+            deleted = await self.chatbot_service.delete_chat_session(session_id, user_id)
         except Exception as e:
             logger.error(f"❌ 세션 삭제 오류: {e}")
             raise HTTPException(
                 status_code=500,
                 detail=f"세션 삭제 중 오류가 발생했습니다: {str(e)}"
             )
+        if not deleted:
+            raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
+        return {"message": "세션이 삭제되었습니다", "session_id": session_id}
+    
+    async def get_usage(self, company_id: Optional[str], user_id: Optional[int],
+                        start: Optional[datetime], end: Optional[datetime],
+                        group_by: str) -> UsageResponse:
+        """LLM 사용량을 조회합니다. (기간 기본값: 최근 24시간)"""
+        if group_by not in GROUP_BY:
+            raise HTTPException(
+                status_code=400,
+                detail=f"group_by는 {', '.join(sorted(GROUP_BY))} 중 하나여야 합니다"
+            )
+        end = end or datetime.now(timezone.utc)
+        start = start or end - timedelta(hours=24)
+        # 시간대가 없는 값은 UTC로 간주
+        start, end = [moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc) for moment in (start, end)]
+        if start >= end:
+            raise HTTPException(status_code=400, detail="start는 end보다 앞서야 합니다")
+        try:
+            rows = await usage_meter.query(company_id, user_id, start, end, group_by)
+        except Exception as e:
+            logger.error(f"❌ 사용량 조회 오류: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"사용량 조회 중 오류가 발생했습니다: {str(e)}"
+            )
+        return UsageResponse(
+            company_id=company_id, user_id=user_id, start=start, end=end, group_by=group_by, rows=rows
+        )
@@ -60,6 +60,8 @@ class ChatSession:
         self.user_id = user_id
         self.session_title = session_title or f"채팅 세션 {datetime.now().strftime('%Y-%m-%d %H:%M')}"
         self.is_active = True
+        self.message_count = 0
+        self.last_message_preview: Optional[str] = None
         self.created_at = datetime.now()
         self.updated_at = datetime.now()
     
@@ -73,6 +75,8 @@ class ChatSession:
             'user_id': self.user_id,
             'session_title': self.session_title,
             'is_active': self.is_active,
+            'message_count': self.message_count,
+            'last_message_preview': self.last_message_preview,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 class ChatMessageRequest(BaseModel):
@@ -13,17 +13,28 @@ class LangChainResponse(BaseModel):
     response: str
     session_id: int
     message_id: int
-    tokens_used: Optional[int] = None
-    processing_time: Optional[float] = None
+    tokens_used: Optional[int] = None  # prompt_tokens + completion_tokens
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    processing_time: Optional[float] = None  # LLM 대기열 대기 시간 포함
+    queue_time: Optional[float] = None
 
 class ChatSessionResponse(BaseModel):
     """채팅 세션 응답 모델"""
     id: int
     user_id: int
     session_title: Optional[str]
+    message_count: int = 0
+    last_message_preview: Optional[str] = None
     created_at: datetime
+    updated_at: Optional[datetime] = None
     is_active: bool
 
+class ChatSessionListResponse(BaseModel):
+    """채팅 세션 목록 한 페이지 (next_cursor를 cursor로 넘기면 다음 페이지, 없으면 마지막 페이지)"""
+    sessions: List[ChatSessionResponse]
+    next_cursor: Optional[str] = None
+
 class ChatMessageResponse(BaseModel):
     """채팅 메시지 응답 모델"""
     id: int
@@ -45,3 +56,21 @@ class ChatSessionUpdateRequest(BaseModel):
     """채팅 세션 수정 요청 모델"""
     session_title: Optional[str] = None
     is_active: Optional[bool] = None
+
+class UsageRow(BaseModel):
+    """LLM 사용량 집계 한 줄 (key: group_by 값)"""
+    key: str
+    requests: int
+    cached_requests: int
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+
+class UsageResponse(BaseModel):
+    """LLM 사용량 조회 응답 모델"""
+    company_id: Optional[str] = None
+    user_id: Optional[int] = None
+    start: datetime
+    end: datetime
+    group_by: str
+    rows: List[UsageRow]
@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Optional, Tuple
+
+from ....common.database import database
+from .session_list_cache import session_list_cache
+
+logger = logging.getLogger("chatbot_service")
+
+# 채팅 메시지 일괄 기록 설정
+CHAT_WRITE_FLUSH_MS = int(os.getenv("CHAT_WRITE_FLUSH_MS", "200"))
+CHAT_WRITE_BATCH_SIZE = int(os.getenv("CHAT_WRITE_BATCH_SIZE", "500"))
+CHAT_WRITE_QUEUE_SIZE = int(os.getenv("CHAT_WRITE_QUEUE_SIZE", "20000"))
+CHAT_WRITE_RETRIES = 3
+# 세션 목록에 보여 줄 마지막 메시지 미리보기 길이 (chat_sessions.last_message_preview)
+CHAT_SESSION_PREVIEW_CHARS = min(int(os.getenv("CHAT_SESSION_PREVIEW_CHARS", "100")), 200)
+
+# (id, session_id, user_id, message_type, content, tokens_used, processing_time, created_at)
+PendingMessage = Tuple[int, int, int, str, str, Optional[int], Optional[float], datetime]
+
+MESSAGE_COLUMNS = ["id", "session_id", "user_id", "message_type", "content", "tokens_used", "processing_time",
+                   "created_at"]
+
+
+class ChatHistoryWriter:
+    """
+    채팅 메시지 write-behind 기록기
+
+    응답 경로에서는 메모리 큐에 넣기만 하고, 백그라운드 작업이 N ms마다 또는 M건이
+    쌓이면 chat_messages COPY + chat_sessions 갱신(마지막 활동 시각, 메시지 수, 마지막 메시지
+    미리보기)을 한 트랜잭션으로 기록하고 (세션 행은 만들지 않으므로 삭제된 세션은 되살아나지 않는다), 반영된 사용자의 세션 목록 캐시를 무효화한다.
+    created_at은 큐에 넣는 시점에 정해지므로 일괄 기록해도 대화 순서가 유지된다.
+    큐가 가득 차면 메시지를 버리고 dropped로 집계하며, 종료 시 남은 메시지를 모두 기록한다.
+    """
+
+    def __init__(self, flush_interval_ms: int = CHAT_WRITE_FLUSH_MS,
+                 batch_size: int = CHAT_WRITE_BATCH_SIZE,
+                 max_queue_size: int = CHAT_WRITE_QUEUE_SIZE):
+        self.flush_interval = flush_interval_ms / 1000
+        self.batch_size = batch_size
+        self.max_queue_size = max_queue_size
+        self._pending: Deque[PendingMessage] = deque()
+        self._wakeup = asyncio.Event()
+        self._closed = True
+        self._task: Optional[asyncio.Task] = None
+        self._last_drop_warning = 0.0
+        self.queued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.rejected = 0
+        self.last_flush_ms = 0.0
+
+    async def start(self):
+        """백그라운드 기록 작업 시작"""
+        self._closed = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0):
+        """남은 메시지를 모두 기록하고 종료"""
+        self._closed = True
+        self._wakeup.set()
+        if self._task:
+            try:
+                await asyncio.wait_for(self._task, timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"⚠️ 채팅 메시지 기록 종료 시간 초과: {len(self._pending)}건 미기록")
+            self._task = None
+
+    def enqueue(self, message_id: int, session_id: int, user_id: int, message_type: str, content: str,
+                tokens_used: Optional[int] = None, processing_time: Optional[float] = None) -> datetime:
+        """메시지 추가 (DB 쓰기 없음) → 기록될 created_at"""
+        created_at = datetime.now(timezone.utc)
+        if self._closed or len(self._pending) >= self.max_queue_size:
+            self.dropped += 1
+            now = time.monotonic()
+            if now - self._last_drop_warning > 10:
+                self._last_drop_warning = now
+                logger.warning(f"⚠️ 채팅 메시지 큐 초과로 메시지 유실 (누적 {self.dropped}건)")
+            return created_at
+        self._pending.append(
+            (message_id, session_id, user_id, message_type, content, tokens_used, processing_time, created_at)
+        )
+        self.queued += 1
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+        return created_at
+
+    def pending_for_session(self, session_id: int) -> List[PendingMessage]:
+        """아직 기록되지 않은 해당 세션 메시지 (조회 시 DB 결과에 합친다)"""
+        return [message for message in self._pending if message[1] == session_id]
+
+    def stats(self) -> Dict:
+        return {
+            "queue_depth": len(self._pending),
+            "queued": self.queued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+        }
+
+    async def _run(self):
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._flush_pending()
+        # 종료 시 남은 메시지 기록
+        await self._flush_pending()
+
+    async def _flush_pending(self):
+        while self._pending:
+            batch: List[PendingMessage] = list(self._pending)[:self.batch_size]
+            # 기록이 끝날 때까지 큐에 남겨 두어 pending_for_session 조회에 포함시킨다
+            written = await self._flush_with_retry(batch)
+            for _ in batch:
+                self._pending.popleft()
+            if not written:
+                self.failed += len(batch)
+                logger.error(f"❌ 채팅 메시지 {len(batch)}건 기록 포기")
+
+    async def _flush_with_retry(self, batch: List[PendingMessage]) -> bool:
+        for attempt in range(1, CHAT_WRITE_RETRIES + 1):
+            try:
+                started = time.perf_counter()
+                await self._flush(batch)
+                self.last_flush_ms = (time.perf_counter() - started) * 1000
+                self.written += len(batch)
+                return True
+            except Exception as e:
+                logger.warning(f"⚠️ 채팅 메시지 기록 실패 ({attempt}/{CHAT_WRITE_RETRIES}): {e}")
+                if not database.is_ready:
+                    break
+                await asyncio.sleep(0.2 * attempt)
+        return False
+
+    async def _flush(self, batch: List[PendingMessage]):
+        # 세션별 (사용자, 마지막 메시지 시각, 이번 배치 메시지 수, 마지막 메시지 미리보기)
+        sessions: Dict[int, Tuple[int, datetime, int, str]] = {}
+        for _, session_id, user_id, _, content, _, _, created_at in batch:
+            if session_id in sessions and sessions[session_id][0] != user_id:
+                continue
+            count = sessions[session_id][2] + 1 if session_id in sessions else 1
+            sessions[session_id] = (user_id, created_at, count, content[:CHAT_SESSION_PREVIEW_CHARS])
+        values = list(sessions.values())
+
+        async with database.acquire() as conn:
+            async with conn.transaction():
+                # 있는 본인 세션만 갱신한다 (세션은 대화 시작 때 만들어지므로, 삭제된 세션이나 다른 사용자의
+                # 세션은 되살리거나 덮어쓰지 않고 RETURNING에 빠진 세션의 메시지는 기록하지 않는다)
+                owned = await conn.fetch("""
+                    UPDATE chat_sessions AS s
+                    SET message_count = s.message_count + v.message_count,
+                        last_message_preview = CASE
+                            WHEN v.updated_at >= s.updated_at THEN v.preview
+                            ELSE s.last_message_preview
+                        END,
+                        updated_at = GREATEST(s.updated_at, v.updated_at)
+                    FROM unnest($1::bigint[], $2::bigint[], $3::timestamptz[], $4::int[], $5::text[])
+                        AS v(id, user_id, updated_at, message_count, preview)
+                    WHERE s.id = v.id AND s.user_id = v.user_id
+                    RETURNING s.id
+                """, list(sessions), [value[0] for value in values], [value[1] for value in values],
+                    [value[2] for value in values], [value[3] for value in values])
+                owned_ids = {record["id"] for record in owned}
+                records = [
+                    message for message in batch
+                    if message[1] in owned_ids and message[2] == sessions[message[1]][0]
+                ]
+                if len(records) < len(batch):
+                    self.rejected += len(batch) - len(records)
+                    logger.warning(
+                        f"⚠️ 없는(삭제된) 세션이나 다른 사용자의 세션에 대한 채팅 메시지 {len(batch) - len(records)}건 기록 거부"
+                    )
+                if records:
+                    await conn.copy_records_to_table("chat_messages", records=records, columns=MESSAGE_COLUMNS)
+        # 기록 전에 채워진 목록 캐시가 남지 않도록 반영된 뒤에도 무효화
+        for user_id in {value[0] for value in values}:
+            session_list_cache.invalidate(user_id)
+
+chat_history_writer = ChatHistoryWriter()
@@ -1,67 +1,208 @@
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any, Tuple
 import logging
+import os
 
+from ....common.database import database, Database
+from ....common.snowflake import next_id, snowflake
 from ..entity.chatbot_entity import ChatMessage, ChatSession
+from .chat_history_writer import chat_history_writer, ChatHistoryWriter
+from .session_list_cache import session_list_cache
 
 logger = logging.getLogger("chatbot_service")
 
+# 프롬프트 컨텍스트 후보로 불러올 최근 메시지 수 (실제 포함 범위는 토큰 예산으로 정함)
+CHAT_HISTORY_MESSAGES = int(os.getenv("CHAT_HISTORY_MESSAGES", "50"))
+
+# 세션 ID 발급 시각보다 이 시간 이상 앞선 메시지는 없다고 본다 (복제본 간 시계 차이 여유)
+SESSION_CLOCK_SKEW_SECONDS = float(os.getenv("SESSION_CLOCK_SKEW_SECONDS", "300"))
+
+SESSION_COLUMNS = "id, user_id, session_title, is_active, message_count, last_message_preview, created_at, updated_at"
+
+
+def session_messages_since(session_id: int) -> datetime:
+    """세션 메시지의 created_at 하한 (chat_messages 월별 파티션 중 세션 시작 이전 것은 읽지 않도록)
+
+    세션 ID는 Snowflake라 발급 시각을 담고 있고, 메시지는 그 뒤에만 생긴다. 발급 시각이 미래인 ID
+    (클라이언트가 임의로 만든 값 등)는 하한 없이 전체 구간을 읽는다.
+    """
+    try:
+        started = snowflake.parse(session_id)[0]
+    except (ValueError, OverflowError, OSError):
+        started = None
+    if started is None or started > datetime.now(timezone.utc):
+        return datetime.fromtimestamp(0, tz=timezone.utc)
+    return started - timedelta(seconds=SESSION_CLOCK_SKEW_SECONDS)
+
 class ChatbotRepository:
-    def __init__(self, session: Any = None):
+    def __init__(self, db: Database = database, writer: ChatHistoryWriter = chat_history_writer):
         """
         채팅봇 데이터 액세스를 담당하는 Repository 클래스
-        
+
         Args:
-            session: 데이터베이스 세션 인스턴스
+            db: asyncpg 커넥션 풀
+            writer: 메시지 일괄 기록기 (응답 경로 밖에서 chat_messages에 기록)
         """
-        self.session = session
-    
+        self.db = db
+        self.writer = writer
+
+    @staticmethod
+    def _to_message(record) -> ChatMessage:
+        message = ChatMessage(
+            message=record['content'],
+            user_id=record['user_id'],
+            session_id=record['session_id'],
+            message_type=record['message_type'],
+            tokens_used=record['tokens_used'],
+            processing_time=record['processing_time'],
+            message_id=record['id']
+        )
+        message.created_at = record['created_at']
+        return message
+
+    @staticmethod
+    def _to_session(record) -> ChatSession:
+        session = ChatSession(
+            user_id=record['user_id'],
+            session_title=record['session_title'],
+            session_id=record['id']
+        )
+        session.is_active = record['is_active']
+        session.message_count = record['message_count']
+        session.last_message_preview = record['last_message_preview']
+        session.created_at = record['created_at']
+        session.updated_at = record['updated_at']
+        return session
+
     async def create_chat_message(self, message_data: dict) -> Optional[ChatMessage]:
-        """새 채팅 메시지 생성"""
+        """새 채팅 메시지 기록 (ID는 바로 발급, DB 기록은 큐에 넣어 일괄 처리)"""
         try:
-            # TODO: 실제 데이터베이스 저장 구현
-            logger.info(f"채팅 메시지 생성: {message_data}")
-            return ChatMessage(**message_data)
+            message = ChatMessage(**message_data)
+            if message.id is None:
+                message.id = next_id()
+            if self.db.is_ready:
+                message.created_at = self.writer.enqueue(
+                    message.id, message.session_id, message.user_id, message.message_type, message.message,
+                    message.tokens_used, message.processing_time
+                )
+                session_list_cache.invalidate(message.user_id)
+            return message
         except Exception as e:
             logger.error(f"채팅 메시지 생성 오류: {e}")
             return None
-    
-    async def get_chat_messages_by_session(self, session_id: int) -> List[ChatMessage]:
-        """세션별 채팅 메시지 조회"""
+
+    async def get_chat_messages_by_session(self, session_id: int,
+                                           limit: int = CHAT_HISTORY_MESSAGES) -> List[ChatMessage]:
+        """세션의 최근 메시지 limit건 (오래된 순)"""
         try:
-            # TODO: 실제 데이터베이스 쿼리 구현
-            logger.info(f"세션 메시지 조회: {session_id}")
-            return []
+            messages: List[ChatMessage] = []
+            if self.db.is_ready:
+                # (session_id, created_at) 커버링 인덱스를 역순으로 읽어 최근 limit건만 가져온다
+                # created_at 하한으로 세션 시작 이전 월 파티션은 건너뛴다
+                async with self.db.acquire() as conn:
+                    records = await conn.fetch("""
+                        SELECT id, session_id, user_id, message_type, content, tokens_used, processing_time, created_at
+                        FROM chat_messages
+                        WHERE session_id = $1 AND created_at >= $3
+                        ORDER BY created_at DESC
+                        LIMIT $2
+                    """, session_id, limit, session_messages_since(session_id))
+                messages = [self._to_message(record) for record in reversed(records)]
+
+            # 아직 기록 대기 중인 메시지도 포함 (방금 보낸 대화가 빠지지 않도록)
+            # 기록 직후 큐에서 빠지기 전이면 DB 결과와 겹칠 수 있어 ID로 거른다
+            written = {message.id for message in messages}
+            for message_id, session, user_id, message_type, content, tokens_used, processing_time, created_at in \
+                    self.writer.pending_for_session(session_id):
+                if message_id in written:
+                    continue
+                message = ChatMessage(
+                    message=content, user_id=user_id, session_id=session, message_type=message_type,
+                    tokens_used=tokens_used, processing_time=processing_time, message_id=message_id
+                )
+                message.created_at = created_at
+                messages.append(message)
+            return messages[-limit:]
         except Exception as e:
             logger.error(f"세션 메시지 조회 오류: {e}")
             return []
-    
+
+    async def is_session_owner(self, session_id: int, user_id: int) -> bool:
+        """세션이 해당 사용자의 것인지 (DB가 없으면 저장된 대화가 없으므로 허용)
+
+        세션 행은 대화를 시작할 때 바로 만들어지므로 chat_sessions만 본다. 조회 오류는 호출한 쪽으로
+        올린다 (확인하지 못한 세션을 허용하지 않도록).
+        """
+        if not self.db.is_ready:
+            return True
+        async with self.db.acquire() as conn:
+            owner = await conn.fetchval("SELECT user_id FROM chat_sessions WHERE id = $1", session_id)
+        return owner == user_id
+
     async def create_chat_session(self, session_data: dict) -> Optional[ChatSession]:
-        """새 채팅 세션 생성"""
+        """새 채팅 세션 생성 (ID는 DB 시퀀스 대신 애플리케이션에서 발급)"""
         try:
-            # TODO: 실제 데이터베이스 저장 구현
-            logger.info(f"채팅 세션 생성: {session_data}")
-            return ChatSession(**session_data)
+            session = ChatSession(**session_data)
+            if session.id is None:
+                session.id = next_id()
+            if not self.db.is_ready:
+                return session
+            async with self.db.acquire() as conn:
+                record = await conn.fetchrow(f"""
+                    INSERT INTO chat_sessions (id, user_id, session_title)
+                    VALUES ($1, $2, $3)
+                    RETURNING {SESSION_COLUMNS}
+                """, session.id, session.user_id, session.session_title)
+            session_list_cache.invalidate(session.user_id)
+            return self._to_session(record)
         except Exception as e:
             logger.error(f"채팅 세션 생성 오류: {e}")
             return None
-    
-    async def get_chat_sessions_by_user(self, user_id: int) -> List[ChatSession]:
-        """사용자별 채팅 세션 조회"""
-        try:
-            # TODO: 실제 데이터베이스 쿼리 구현
-            logger.info(f"사용자 세션 조회: {user_id}")
-            return []
-        except Exception as e:
-            logger.error(f"사용자 세션 조회 오류: {e}")
+
+    async def get_chat_sessions_by_user(self, user_id: int, limit: int,
+                                        after: Optional[Tuple[datetime, int]] = None) -> List[ChatSession]:
+        """사용자별 채팅 세션 조회 (최근 활동 순, after: 이전 페이지 마지막 세션의 (updated_at, id))
+        
+        OFFSET 대신 (user_id, updated_at DESC, id DESC) 인덱스에서 마지막 행 다음부터 limit건만 읽으므로
+        뒤쪽 페이지도 첫 페이지와 같은 비용이다. 오류는 호출한 쪽으로 올린다 (빈 목록이 캐시되지 않도록).
+        """
+        if not self.db.is_ready:
             return []
-    
+        async with self.db.acquire() as conn:
+            if after is None:
+                records = await conn.fetch(f"""
+                    SELECT {SESSION_COLUMNS}
+                    FROM chat_sessions
+                    WHERE user_id = $1 AND is_active
+                    ORDER BY updated_at DESC, id DESC
+                    LIMIT $2
+                """, user_id, limit)
+            else:
+                records = await conn.fetch(f"""
+                    SELECT {SESSION_COLUMNS}
+                    FROM chat_sessions
+                    WHERE user_id = $1 AND is_active AND (updated_at, id) < ($3, $4)
+                    ORDER BY updated_at DESC, id DESC
+                    LIMIT $2
+                """, user_id, limit, after[0], after[1])
+        return [self._to_session(record) for record in records]
+
     async def delete_chat_session(self, session_id: int, user_id: int) -> bool:
-        """채팅 세션 삭제"""
-        try:
-            # TODO: 실제 데이터베이스 삭제 구현
-            logger.info(f"채팅 세션 삭제: {session_id}")
-            return True
-        except Exception as e:
-            logger.error(f"채팅 세션 삭제 오류: {e}")
+        """채팅 세션 삭제 (본인 세션만, 메시지 포함) → 삭제 여부 (오류는 호출한 쪽으로 올린다)"""
+        if not self.db.is_ready:
             return False
+        async with self.db.acquire() as conn:
+            async with conn.transaction():
+                deleted = await conn.fetchval(
+                    "DELETE FROM chat_sessions WHERE id = $1 AND user_id = $2 RETURNING id",
+                    session_id, user_id
+                )
+                if deleted is None:
+                    return False
+                await conn.execute(
+                    "DELETE FROM chat_messages WHERE session_id = $1 AND created_at >= $2",
+                    session_id, session_messages_since(session_id)
+                )
+        session_list_cache.invalidate(user_id)
+        logger.info(f"채팅 세션 삭제: {session_id}")
+        return True
@@ -0,0 +1,270 @@
+import asyncio
+import gzip
+import logging
+import os
+import re
+import shutil
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from ....common.database import database, Database
+
+logger = logging.getLogger("chatbot_service")
+
+# chat_messages 월별 파티션 설정
+CHAT_PARTITION_PREMAKE_MONTHS = int(os.getenv("CHAT_PARTITION_PREMAKE_MONTHS", "2"))
+CHAT_RETENTION_MONTHS = int(os.getenv("CHAT_RETENTION_MONTHS", "12"))  # 0이면 보관 기간 제한 없음
+# 보관 파일을 둘 영구 볼륨 경로 (컨테이너 로컬 디스크는 재배포 때 사라지므로 기본값 없음)
+# 지정하지 않으면 보관 기간이 지나도 파티션을 분리/삭제하지 않는다
+CHAT_ARCHIVE_DIR = os.getenv("CHAT_ARCHIVE_DIR", "")
+CHAT_PARTITION_MAINTENANCE_SECONDS = float(os.getenv("CHAT_PARTITION_MAINTENANCE_SECONDS", "21600"))
+
+# 같은 DB를 쓰는 복제본 중 하나만 파티션을 만들고 보관 처리하도록 잡는 advisory lock 키
+PARTITION_LOCK_KEY = 0x63686174
+
+PARENT_TABLE = "chat_messages"
+LEGACY_TABLE = "chat_messages_legacy"
+PARTITION_PATTERN = r"^chat_messages_p[0-9]{6}$"
+
+MESSAGES_DDL = """
+    CREATE TABLE IF NOT EXISTS chat_messages (
+        id BIGINT NOT NULL,
+        session_id BIGINT NOT NULL,
+        user_id BIGINT,
+        message_type VARCHAR(20) NOT NULL,
+        content TEXT NOT NULL,
+        tokens_used INTEGER,
+        processing_time REAL,
+        created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (id, created_at)
+    ) PARTITION BY RANGE (created_at);
+"""
+
+# 세션별 최근 N건 조회를 인덱스만으로 처리 (파티션마다 같은 인덱스가 만들어진다)
+MESSAGES_INDEX_DDL = """
+    CREATE INDEX IF NOT EXISTS idx_chat_messages_session_created
+    ON chat_messages (session_id, created_at DESC)
+    INCLUDE (id, user_id, message_type, content, tokens_used, processing_time);
+"""
+
+_UPPER_BOUND = re.compile(r"TO \('([^']+)'\)")
+
+
+def month_start(moment: datetime) -> datetime:
+    moment = moment.astimezone(timezone.utc)
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARENT_TABLE}_p{month:%Y%m}"
+
+
+def _upper_bound(bound: str) -> Optional[datetime]:
+    """pg_get_expr(relpartbound) → 파티션 상한 (MAXVALUE면 None)"""
+    match = _UPPER_BOUND.search(bound)
+    return datetime.fromisoformat(match.group(1)) if match else None
+
+
+def _compress(source: str, target: str):
+    """source를 gzip으로 압축해 target에 쓰고 디스크에 반영된 뒤 원본 삭제 (이후 테이블을 지우므로)"""
+    partial = f"{target}.part"
+    with open(partial, "wb") as raw_target:
+        with open(source, "rb") as raw, gzip.GzipFile(fileobj=raw_target, mode="wb") as packed:
+            shutil.copyfileobj(raw, packed, 1024 * 1024)
+        raw_target.flush()
+        os.fsync(raw_target.fileno())
+    os.replace(partial, target)
+    directory = os.open(os.path.dirname(target), os.O_RDONLY)
+    try:
+        os.fsync(directory)
+    finally:
+        os.close(directory)
+    os.remove(source)
+
+
+class MessagePartitions:
+    """
+    chat_messages 월별 range 파티션 관리
+
+    chat_messages는 created_at 기준 월별 파티션(chat_messages_pYYYYMM)으로 나누고, 이번 달부터
+    CHAT_PARTITION_PREMAKE_MONTHS달 뒤까지의 파티션을 미리 만들어 둔다. CHAT_RETENTION_MONTHS보다
+    오래된 파티션은 분리(DETACH) → CSV를 gzip으로 압축해 CHAT_ARCHIVE_DIR에 보관 → 삭제한다. 분리 후
+    보관에 실패한 테이블은 다음 실행 때 다시 보관한다. 파티션 단위로 넣고 지우므로 기록이 쌓여도
+    삽입/조회 인덱스 크기는 한 달 분량에 머문다.
+
+    보관 파일이 삭제한 데이터의 유일한 사본이므로 CHAT_ARCHIVE_DIR은 영구 볼륨이어야 한다. 지정하지
+    않았거나 디렉터리가 없으면(볼륨이 마운트되지 않은 경우 등) 새로 만들지 않고 보관 처리를 건너뛴다.
+
+    파티션이 아닌 기존 chat_messages가 있으면 chat_messages_legacy로 이름을 바꿔 다음 달 1일 이전
+    구간의 파티션으로 붙인다 (이후 새 달부터 월별 파티션에 쌓인다).
+    """
+
+    def __init__(self, db: Database = database, archive_dir: str = CHAT_ARCHIVE_DIR,
+                 retention_months: int = CHAT_RETENTION_MONTHS,
+                 premake_months: int = CHAT_PARTITION_PREMAKE_MONTHS,
+                 interval_seconds: float = CHAT_PARTITION_MAINTENANCE_SECONDS):
+        self.db = db
+        self.archive_dir = archive_dir
+        self.retention_months = retention_months
+        self.premake_months = premake_months
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+        self.partitions = 0
+        self.created = 0
+        self.archived = 0
+        self.archived_rows = 0
+        self.failed_runs = 0
+        self.skipped_runs = 0
+        self.last_run: Optional[datetime] = None
+
+    async def create_table(self, conn):
+        """chat_messages 파티션 테이블과 이번 달 이후 파티션 생성 (기동 시, 기존 일반 테이블은 변환)"""
+        async with conn.transaction():
+            await conn.execute("SELECT pg_advisory_xact_lock($1)", PARTITION_LOCK_KEY)
+            relkind = await conn.fetchval(f"SELECT relkind FROM pg_class WHERE oid = to_regclass('{PARENT_TABLE}')")
+            if relkind == "r":
+                await self._convert_legacy(conn)
+            else:
+                await conn.execute(MESSAGES_DDL)
+                await conn.execute(MESSAGES_INDEX_DDL)
+            await self._ensure_partitions(conn)
+
+    async def _convert_legacy(self, conn):
+        boundary = add_months(month_start(datetime.now(timezone.utc)), 1)
+        await conn.execute(f"ALTER TABLE {PARENT_TABLE} RENAME TO {LEGACY_TABLE}")
+        await conn.execute(f"ALTER TABLE {LEGACY_TABLE} RENAME CONSTRAINT {PARENT_TABLE}_pkey TO {LEGACY_TABLE}_pkey")
+        await conn.execute(
+            f"ALTER INDEX IF EXISTS idx_chat_messages_session_created RENAME TO idx_{LEGACY_TABLE}_session_created"
+        )
+        await conn.execute(MESSAGES_DDL)
+        await conn.execute(MESSAGES_INDEX_DDL)
+        await conn.execute(f"""
+            ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {LEGACY_TABLE}
+            FOR VALUES FROM (MINVALUE) TO ('{boundary.isoformat()}')
+        """)
+        logger.info(f"🗂️ 기존 chat_messages를 {boundary:%Y-%m-%d} 이전 구간 파티션({LEGACY_TABLE})으로 변환")
+
+    async def _attached(self, conn) -> List[Tuple[str, Optional[datetime]]]:
+        """붙어 있는 파티션 (이름, 상한)"""
+        records = await conn.fetch(f"""
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) AS bound
+            FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = '{PARENT_TABLE}'::regclass
+        """)
+        return [(record["relname"], _upper_bound(record["bound"])) for record in records]
+
+    async def _ensure_partitions(self, conn):
+        attached = await self._attached(conn)
+        current = month_start(datetime.now(timezone.utc))
+        uppers = [upper for _, upper in attached if upper is not None]
+        # 이미 덮인 구간(변환한 기존 테이블 등) 다음 달부터 만든다
+        month = max([current] + uppers)
+        last = add_months(current, self.premake_months)
+        while month <= last:
+            name = partition_name(month)
+            await conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE}
+                FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')
+            """)
+            if name not in {attached_name for attached_name, _ in attached}:
+                self.created += 1
+                logger.info(f"🗂️ 채팅 메시지 파티션 생성: {name}")
+            month = add_months(month, 1)
+        self.partitions = len(await self._attached(conn))
+
+    def _archive_ready(self) -> bool:
+        """보관 디렉터리가 지정되어 있고 (마운트되어) 쓸 수 있는지"""
+        return bool(self.archive_dir) and os.path.isdir(self.archive_dir) and os.access(self.archive_dir, os.W_OK)
+
+    async def _expire(self, conn):
+        """보관 기간이 지난 파티션 분리 → 압축 보관 → 삭제"""
+        if self.retention_months <= 0:
+            return
+        if not self._archive_ready():
+            self.skipped_runs += 1
+            logger.warning(
+                f"⚠️ CHAT_ARCHIVE_DIR이 지정되지 않았거나 쓸 수 없어 보관 기간이 지난 채팅 메시지 파티션을 "
+                f"삭제하지 않습니다: {self.archive_dir or '(미지정)'}"
+            )
+            return
+        cutoff = add_months(month_start(datetime.now(timezone.utc)), -self.retention_months)
+        for name, upper in await self._attached(conn):
+            if upper is not None and upper <= cutoff:
+                await conn.execute(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}")
+                self.partitions -= 1
+                logger.info(f"🗂️ 보관 기간이 지난 파티션 분리: {name}")
+        # 이번에 분리한 것과 이전 실행에서 분리만 되고 보관하지 못한 것
+        detached = await conn.fetch(f"""
+            SELECT relname FROM pg_class
+            WHERE relkind = 'r' AND NOT relispartition
+              AND (relname ~ '{PARTITION_PATTERN}' OR relname = '{LEGACY_TABLE}')
+        """)
+        for record in detached:
+            await self._archive(conn, record["relname"])
+
+    async def _archive(self, conn, table: str):
+        target = os.path.join(self.archive_dir, f"{table}.csv.gz")
+        staging = os.path.join(self.archive_dir, f"{table}.csv")
+        status = await conn.copy_from_table(table, output=staging, format="csv", header=True)
+        await asyncio.to_thread(_compress, staging, target)
+        await conn.execute(f"DROP TABLE {table}")
+        rows = int(status.split()[-1]) if status else 0
+        self.archived += 1
+        self.archived_rows += rows
+        logger.info(f"📦 채팅 메시지 파티션 보관 후 삭제: {table} ({rows}건 → {target})")
+
+    async def run_once(self) -> bool:
+        """파티션 미리 만들기 + 보관 처리 (다른 복제본이 하는 중이면 건너뜀) → 실행 여부"""
+        async with self.db.acquire() as conn:
+            if not await conn.fetchval("SELECT pg_try_advisory_lock($1)", PARTITION_LOCK_KEY):
+                return False
+            try:
+                async with conn.transaction():
+                    await self._ensure_partitions(conn)
+                await self._expire(conn)
+            finally:
+                await conn.execute("SELECT pg_advisory_unlock($1)", PARTITION_LOCK_KEY)
+        self.last_run = datetime.now(timezone.utc)
+        return True
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.failed_runs += 1
+                logger.error(f"❌ 채팅 메시지 파티션 관리 실패: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def stats(self) -> Dict:
+        return {
+            "partitions": self.partitions,
+            "created": self.created,
+            "archived": self.archived,
+            "archived_rows": self.archived_rows,
+            "failed_runs": self.failed_runs,
+            "skipped_runs": self.skipped_runs,
+            "archive_dir": self.archive_dir or None,
+            "retention_months": self.retention_months,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+        }
+
+
+message_partitions = MessagePartitions()
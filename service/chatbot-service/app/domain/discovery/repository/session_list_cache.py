@@ -0,0 +1,73 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# 세션 목록 첫 페이지 캐시 설정
+SESSION_LIST_CACHE_USERS = int(os.getenv("SESSION_LIST_CACHE_USERS", "10000"))
+# 다른 복제본에서 온 메시지는 무효화 신호가 없으므로 TTL이 지나면 다시 읽는다
+SESSION_LIST_CACHE_TTL_SECONDS = float(os.getenv("SESSION_LIST_CACHE_TTL_SECONDS", "30"))
+
+
+class SessionListCache:
+    """
+    사용자별 세션 목록 첫 페이지 캐시 (LRU + TTL)
+
+    새 메시지를 큐에 넣을 때와 기록기가 DB에 반영한 뒤 두 번 무효화한다. 목록 조회는 DB를 읽기 전에
+    시각을 받아 두고, 읽는 동안 그 사용자가 무효화됐으면 결과를 캐시에 넣지 않는다 (기록 전 상태가
+    캐시에 남지 않도록). 무효화 시각은 TTL 동안만 보관한다.
+    """
+
+    def __init__(self, max_users: int = SESSION_LIST_CACHE_USERS,
+                 ttl_seconds: float = SESSION_LIST_CACHE_TTL_SECONDS):
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        self._pages: "OrderedDict[int, Tuple[float, Any]]" = OrderedDict()
+        self._invalidated: "OrderedDict[int, float]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    @staticmethod
+    def mark() -> float:
+        """DB 조회 시작 시각 (put에 넘긴다)"""
+        return time.monotonic()
+
+    def get(self, user_id: int) -> Optional[Any]:
+        entry = self._pages.get(user_id)
+        if entry is None or entry[0] <= time.monotonic():
+            self._pages.pop(user_id, None)
+            self.stats["misses"] += 1
+            return None
+        self._pages.move_to_end(user_id)
+        self.stats["hits"] += 1
+        return entry[1]
+
+    def put(self, user_id: int, page: Any, started_at: float):
+        """started_at: mark()로 받은 조회 시작 시각 (그 뒤에 무효화됐으면 넣지 않는다)"""
+        if self._invalidated.get(user_id, float("-inf")) >= started_at:
+            return
+        self._pages[user_id] = (time.monotonic() + self.ttl_seconds, page)
+        self._pages.move_to_end(user_id)
+        while len(self._pages) > self.max_users:
+            self._pages.popitem(last=False)
+
+    def invalidate(self, user_id: Optional[int]):
+        if user_id is None:
+            return
+        now = time.monotonic()
+        self._pages.pop(user_id, None)
+        self._invalidated[user_id] = now
+        self._invalidated.move_to_end(user_id)
+        while self._invalidated and next(iter(self._invalidated.values())) < now - self.ttl_seconds:
+            self._invalidated.popitem(last=False)
+        self.stats["invalidations"] += 1
+
+    def metrics(self) -> Dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "users": len(self._pages),
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+session_list_cache = SessionListCache()
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from ....common.database import database
+
+logger = logging.getLogger("chatbot_service")
+
+# 사용량 집계 설정
+USAGE_FLUSH_SECONDS = float(os.getenv("USAGE_FLUSH_SECONDS", "30"))
+
+# (시간 버킷, 회사 ID, 사용자 ID, 모델) — 회사/사용자가 없으면 ''/0
+UsageKey = Tuple[datetime, str, int, str]
+# [요청 수, 캐시 응답 수, 입력 토큰, 출력 토큰]
+USAGE_FIELDS = ["requests", "cached_requests", "prompt_tokens", "completion_tokens"]
+
+GROUP_BY = {"model", "user", "company", "hour", "day"}
+
+
+def company_of(tenant: Optional[str]) -> str:
+    """get_tenant 값에서 회사 ID (회사 헤더가 없던 요청은 '')"""
+    return tenant[len("company:"):] if tenant and tenant.startswith("company:") else ""
+
+
+def _bucket(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+class UsageMeter:
+    """
+    LLM 토큰 사용량 미터
+
+    호출마다 (시간, 회사, 사용자, 모델) 단위 메모리 누적기에 더하기만 하고, USAGE_FLUSH_SECONDS마다
+    누적분을 llm_usage 테이블에 한 번의 UPSERT(+=)로 반영한다. 기록에 실패하면 누적분을 되돌려
+    다음 주기에 다시 시도하고, DB가 없으면 메모리에만 쌓는다. 조회는 DB 결과에 아직 반영되지
+    않은 누적분을 합쳐 돌려준다.
+    """
+
+    def __init__(self, flush_seconds: float = USAGE_FLUSH_SECONDS):
+        self.flush_seconds = flush_seconds
+        self._pending: Dict[UsageKey, List[int]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._closed = True
+        self.recorded = 0
+        self.flushed_rows = 0
+        self.failed_flushes = 0
+
+    async def start(self):
+        self._closed = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """남은 누적분을 기록하고 종료"""
+        self._closed = True
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def record(self, company_id: str, user_id: Optional[int], model: str,
+               prompt_tokens: int, completion_tokens: int, cached: bool = False):
+        key = (_bucket(datetime.now(timezone.utc)), company_id or "", user_id or 0, model)
+        counters = self._pending.get(key)
+        if counters is None:
+            counters = self._pending[key] = [0, 0, 0, 0]
+        counters[0] += 1
+        counters[1] += int(cached)
+        counters[2] += prompt_tokens
+        counters[3] += completion_tokens
+        self.recorded += 1
+
+    async def _run(self):
+        while not self._closed:
+            await asyncio.sleep(self.flush_seconds)
+            await self.flush()
+
+    async def flush(self):
+        if not self._pending or not database.is_ready:
+            return
+        batch, self._pending = self._pending, {}
+        try:
+            started = time.perf_counter()
+            keys = list(batch)
+            async with database.acquire() as conn:
+                await conn.execute("""
+                    INSERT INTO llm_usage (bucket, company_id, user_id, model,
+                                           requests, cached_requests, prompt_tokens, completion_tokens)
+                    SELECT * FROM unnest($1::timestamptz[], $2::varchar[], $3::bigint[], $4::varchar[],
+                                         $5::bigint[], $6::bigint[], $7::bigint[], $8::bigint[])
+                    ON CONFLICT (bucket, company_id, user_id, model) DO UPDATE SET
+                        requests = llm_usage.requests + EXCLUDED.requests,
+                        cached_requests = llm_usage.cached_requests + EXCLUDED.cached_requests,
+                        prompt_tokens = llm_usage.prompt_tokens + EXCLUDED.prompt_tokens,
+                        completion_tokens = llm_usage.completion_tokens + EXCLUDED.completion_tokens
+                """, *[[key[i] for key in keys] for i in range(4)],
+                    *[[batch[key][i] for key in keys] for i in range(4)])
+            self.flushed_rows += len(keys)
+            logger.info(f"📊 LLM 사용량 {len(keys)}건 기록 ({(time.perf_counter() - started) * 1000:.1f}ms)")
+        except Exception as e:
+            # 기록 실패 → 누적분 되돌리기
+            self.failed_flushes += 1
+            logger.warning(f"⚠️ LLM 사용량 기록 실패 (다음 주기에 재시도): {e}")
+            for key, counters in batch.items():
+                current = self._pending.setdefault(key, [0, 0, 0, 0])
+                for i, value in enumerate(counters):
+                    current[i] += value
+
+    async def query(self, company_id: Optional[str], user_id: Optional[int],
+                    start: datetime, end: datetime, group_by: str) -> List[Dict]:
+        """범위 [start, end) 사용량을 group_by 기준으로 합산 (회사 또는 사용자 범위)"""
+        rows: Dict[UsageKey, List[int]] = {}
+        if database.is_ready:
+            async with database.acquire() as conn:
+                records = await conn.fetch("""
+                    SELECT bucket, company_id, user_id, model,
+                           requests, cached_requests, prompt_tokens, completion_tokens
+                    FROM llm_usage
+                    WHERE bucket >= $1 AND bucket < $2
+                      AND ($3::varchar IS NULL OR company_id = $3)
+                      AND ($4::bigint IS NULL OR user_id = $4)
+                """, _bucket(start), end, company_id, user_id)
+            for record in records:
+                rows[(record["bucket"], record["company_id"], record["user_id"], record["model"])] = [
+                    record[field] for field in USAGE_FIELDS
+                ]
+        for key, counters in list(self._pending.items()):
+            bucket, key_company, key_user, _ = key
+            if not (_bucket(start) <= bucket < end):
+                continue
+            if (company_id is not None and key_company != company_id) or (user_id is not None and key_user != user_id):
+                continue
+            current = rows.setdefault(key, [0, 0, 0, 0])
+            for i, value in enumerate(counters):
+                current[i] += value
+
+        grouped: Dict[str, List[int]] = {}
+        for (bucket, key_company, key_user, model), counters in rows.items():
+            group = {
+                "model": model,
+                "user": str(key_user),
+                "company": key_company,
+                "hour": bucket.isoformat(),
+                "day": bucket.date().isoformat(),
+            }[group_by]
+            current = grouped.setdefault(group, [0, 0, 0, 0])
+            for i, value in enumerate(counters):
+                current[i] += value
+        return [
+            {"key": group, **dict(zip(USAGE_FIELDS, counters)), "total_tokens": counters[2] + counters[3]}
+            for group, counters in sorted(grouped.items())
+        ]
+
+    def stats(self) -> Dict:
+        return {
+            "pending_rows": len(self._pending),
+            "recorded": self.recorded,
+            "flushed_rows": self.flushed_rows,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+usage_meter = UsageMeter()
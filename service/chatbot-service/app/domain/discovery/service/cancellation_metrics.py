@@ -0,0 +1,37 @@
+import logging
+from typing import Dict
+
+logger = logging.getLogger("chatbot_service")
+
+
+class CancellationMetrics:
+    """
+    클라이언트 연결 종료로 취소된 LLM 호출 지표
+
+    대기열에서 취소된 호출은 프롬프트와 예상 응답 토큰 전부를, 생성 중에 취소된 호출은 예상 응답 토큰
+    중 아직 만들지 않은 만큼을 아낀 토큰(saved_tokens)으로 센다. 예상 응답 토큰은 스케줄러가 예약하는
+    LLM_EXPECTED_COMPLETION_TOKENS 기준이라 추정치다.
+    """
+
+    def __init__(self):
+        self.stats = {
+            "send": 0,
+            "stream": 0,
+            "queued": 0,
+            "generating": 0,
+            "generated_tokens": 0,
+            "saved_tokens": 0,
+        }
+
+    def record(self, kind: str, queued: bool, generated_tokens: int, saved_tokens: int):
+        self.stats[kind] += 1
+        self.stats["queued" if queued else "generating"] += 1
+        self.stats["generated_tokens"] += generated_tokens
+        self.stats["saved_tokens"] += saved_tokens
+        logger.info(f"🛑 클라이언트 연결 종료로 {kind} 취소 (생성 {generated_tokens} 토큰, 절약 약 {saved_tokens} 토큰)")
+
+    def metrics(self) -> Dict:
+        return {**self.stats, "cancelled": self.stats["send"] + self.stats["stream"]}
+
+
+cancellation_metrics = CancellationMetrics()
@@ -1,47 +1,141 @@
 import os
 import time
+import base64
+import asyncio
 import logging
-from typing import Dict, List, Optional
-from datetime import datetime
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 from ..repository.chatbot_repository import ChatbotRepository
+from ..repository.usage_meter import usage_meter, company_of
+from ..repository.session_list_cache import session_list_cache
 from ..entity.chatbot_entity import ChatMessage, ChatSession
+from .stream_metrics import stream_metrics
+from .cancellation_metrics import cancellation_metrics
+from .response_cache import response_cache
+from .context_window import context_window
+from .intent_matcher import intent_matcher
+from .llm_scheduler import llm_scheduler, LLMOverloaded, BATCH
+from .llm_runtime import llm_runtime, LLMRuntime, OPENAI_MAX_TOKENS
+from ...retrieval.service.retrieval_service import retrieval_service
+
+# LangChain 메시지 타입은 선택 사항 (미설치 시 더미 모드)
+try:
+    from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+except ImportError:
+    pass
 
 logger = logging.getLogger("chatbot_service")
 
+# 스케줄러 토큰 예산에 미리 잡아 둘 응답 토큰 수 (호출 후 실제 사용량으로 정산)
+LLM_EXPECTED_COMPLETION_TOKENS = min(int(os.getenv("LLM_EXPECTED_COMPLETION_TOKENS", "500")), OPENAI_MAX_TOKENS)
+
+ERROR_RESPONSE = "죄송합니다. 현재 AI 서비스에 문제가 있습니다. 잠시 후 다시 시도해주세요."
+OVERLOADED_RESPONSE = "현재 AI 요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해주세요."
+DUMMY_MODEL = "dummy"
+
+# 세션 목록 페이지 크기 (기본 크기의 첫 페이지만 사용자별로 캐시)
+SESSION_PAGE_SIZE = int(os.getenv("SESSION_PAGE_SIZE", "20"))
+SESSION_PAGE_MAX = 100
+_CURSOR_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def encode_session_cursor(updated_at: datetime, session_id: int) -> str:
+    """세션 목록 다음 페이지 커서 (마지막 세션의 updated_at 마이크로초 + ID)"""
+    micros = (updated_at - _CURSOR_EPOCH) // timedelta(microseconds=1)
+    return base64.urlsafe_b64encode(f"{micros}:{session_id}".encode()).decode().rstrip("=")
+
+
+def decode_session_cursor(cursor: str) -> Tuple[datetime, int]:
+    """커서 → (updated_at, 세션 ID), 형식이 틀리면 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        micros, session_id = raw.split(":")
+        return _CURSOR_EPOCH + timedelta(microseconds=int(micros)), int(session_id)
+    except Exception:
+        raise ValueError("잘못된 페이지 커서입니다")
+
 class ChatbotService:
-    def __init__(self, repository: ChatbotRepository):
+    def __init__(self, repository: ChatbotRepository, runtime: LLMRuntime = llm_runtime):
+        """앱 수명 동안 하나만 만든다 (클라이언트와 템플릿은 runtime이 들고 있다)"""
         self.repository = repository
-        self.openai_api_key = os.getenv("OPENAI_API_KEY")
-        logger.info(f"🔑 OpenAI API Key: {'설정됨' if self.openai_api_key else '설정 안됨 (더미 모드)'}")
+        self.runtime = runtime
+    
+    @property
+    def mode(self) -> str:
+        return self.runtime.mode
     
-    async def generate_response(self, message: str, context: Optional[Dict] = None) -> Dict:
-        """AI 응답 생성"""
+    async def generate_response(self, message: str, context: Optional[Dict] = None,
+                                tenant: Optional[str] = None,
+                                history: Optional[List[ChatMessage]] = None,
+                                user_id: Optional[int] = None) -> Dict:
+        """AI 응답 생성 (tenant: 캐시 격리 단위 - 회사 또는 사용자, history: 이전 대화)
+        
+        processing_time은 LLM 대기열에서 기다린 시간(queue_time)을 포함한다.
+        tokens_used는 입력 + 출력 토큰이며 호출마다 usage_meter에 집계된다.
+        """
         start_time = time.time()
+        queue_ms = 0.0
         
         try:
-            if self.openai_api_key:
-                # TODO: 실제 OpenAI API 호출
-                response = await self._generate_openai_response(message, context)
+            if self.runtime.enabled:
+                # 같은/비슷한 질문은 LLM 호출 없이 캐시에서 응답 (이전 대화에 의존하는 후속 질문 제외)
+                cached, cache_tier = await response_cache.get(message, context, tenant) if not history else (None, None)
+                if cached is not None:
+                    usage_meter.record(company_of(tenant), user_id, self.runtime.model, 0, 0, cached=True)
+                    return {
+                        "response": cached.response,
+                        "tokens_used": 0,
+                        "prompt_tokens": 0,
+                        "completion_tokens": 0,
+                        "processing_time": time.time() - start_time,
+                        "success": True,
+                        "cached": cache_tier
+                    }
+                response, prompt_tokens, completion_tokens, queue_ms, model = await self._generate_openai_response(
+                    message, context, history, tenant, user_id
+                )
+                tokens_used = prompt_tokens + completion_tokens
+                if not history:
+                    await response_cache.put(message, response, tokens_used, context, tenant)
+                usage_meter.record(company_of(tenant), user_id, model, prompt_tokens, completion_tokens)
             else:
-                # 더미 응답
+                # 더미 응답 (토큰 수는 로컬 토크나이저로 계산)
                 response = self._generate_dummy_response(message)
+                prompt_tokens = context_window.counter.count(message)
+                completion_tokens = context_window.counter.count(response)
+                tokens_used = prompt_tokens + completion_tokens
+                usage_meter.record(company_of(tenant), user_id, DUMMY_MODEL, prompt_tokens, completion_tokens)
             
             processing_time = time.time() - start_time
             
             return {
                 "response": response,
-                "tokens_used": 0,  # TODO: 실제 토큰 수 계산
+                "tokens_used": tokens_used,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
                 "processing_time": processing_time,
+                "queue_time": queue_ms / 1000,
                 "success": True
             }
             
+        except LLMOverloaded as e:
+            logger.warning(f"⚠️ LLM 대기열 거절: {e}")
+            return {
+                "response": OVERLOADED_RESPONSE,
+                "tokens_used": 0,
+                "processing_time": time.time() - start_time,
+                "success": False,
+                "error": "overloaded",
+                "retry_after": e.retry_after
+            }
         except Exception as e:
             logger.error(f"AI 응답 생성 오류: {e}")
             processing_time = time.time() - start_time
             
             return {
-                "response": "죄송합니다. 현재 AI 서비스에 문제가 있습니다. 잠시 후 다시 시도해주세요.",
+                "response": ERROR_RESPONSE,
                 "tokens_used": 0,
                 "processing_time": processing_time,
                 "success": False,
@@ -49,50 +143,338 @@ class ChatbotService:
             }
     
     def _generate_dummy_response(self, message: str) -> str:
-        """더미 응답 생성 (개발/테스트용)"""
-        dummy_responses = {
-            "안녕": "안녕하세요! 중소기업 진단 AI 어시스턴트입니다. 어떤 도움이 필요하신가요?",
-            "재무": "재무 상태를 분석해드리겠습니다. 매출, 비용, 현금흐름 등의 정보를 알려주시면 더 정확한 진단이 가능합니다.",
-            "운영": "운영 효율성을 개선하기 위해 프로세스 최적화, 인력 관리, 기술 도입 등을 검토해보시기 바랍니다.",
-            "마케팅": "마케팅 전략으로는 디지털 마케팅 강화, 고객 세분화, 브랜드 포지셔닝 등을 고려해보세요.",
-            "평가": "기업 평가를 위해서는 재무제표, 사업계획서, 시장 분석 자료 등이 필요합니다. 어떤 부분을 중점적으로 살펴보고 싶으신가요?",
-            "개선": "개선 방안을 제시하기 위해 현재 겪고 있는 문제점이나 목표를 구체적으로 말씀해 주세요."
-        }
-        
-        for keyword, response in dummy_responses.items():
-            if keyword in message:
-                return response
+        """더미 응답 생성 (API 키가 없을 때 FAQ 의도 매칭)"""
+        match = intent_matcher.match(message)
+        if match is not None:
+            return match.intent.response
         
         return f"'{message}'에 대해 분석해보겠습니다. 중소기업 진단 관련하여 재무, 운영, 마케팅, 인사 등 어떤 분야에 대해 더 자세히 알고 싶으신가요?"
     
-    async def _generate_openai_response(self, message: str, context: Optional[Dict] = None) -> str:
-        """OpenAI API를 사용한 응답 생성 (향후 구현)"""
-        # TODO: 실제 OpenAI API 호출 구현
-        return "실제 OpenAI API 응답 (구현 예정)"
+    def _build_messages(self, message: str, context: Optional[Dict] = None,
+                        history: Optional[List[ChatMessage]] = None,
+                        documents: Optional[List[Dict]] = None) -> List:
+        """대화 템플릿에 (컨텍스트) + (검색 문서) + (이전 대화 요약) + 최근 대화 + 사용자 메시지를 채운다
+        
+        이전 대화와 컨텍스트는 토큰 예산에 맞춰 자르고, 예산 밖의 대화는 누적 요약으로 대신한다.
+        """
+        notes = []
+        extra = context_window.fit_context(context)
+        if extra:
+            notes.append(SystemMessage(content="참고 정보:\n" + extra))
+        if documents:
+            passages = "\n\n".join(
+                f"[{index}] {document['title']}\n{document['text']}" for index, document in enumerate(documents, 1)
+            )
+            notes.append(SystemMessage(
+                content="아래 참고 문서를 근거로 답변하고, 문서에 없는 내용은 일반론임을 밝히세요.\n\n"
+                        + context_window.counter.truncate(passages, context_window.extra_tokens)
+            ))
+        summary, recent = context_window.fit(history, self._summarize_turns)
+        if summary:
+            notes.append(SystemMessage(content="이전 대화 요약:\n" + summary))
+        history_messages = [
+            AIMessage(content=turn.message) if turn.message_type == "assistant" else HumanMessage(content=turn.message)
+            for turn in recent
+        ]
+        return self.runtime.chat_prompt.format_messages(notes=notes, history=history_messages, message=message)
+    
+    async def _summarize_turns(self, previous: Optional[str], turns: List[ChatMessage]) -> str:
+        """이전 요약에 새 대화를 합쳐 누적 요약 생성 (백그라운드)"""
+        transcript = "\n".join(
+            f"{'어시스턴트' if turn.message_type == 'assistant' else '사용자'}: {turn.message}" for turn in turns
+        )
+        messages = self.runtime.summary_prompt.format_messages(previous=previous or "(없음)", transcript=transcript)
+        # 요약은 응답을 기다리는 사용자가 없으므로 대화 요청 뒤로 보낸다
+        async with self._llm_slot(messages, "summarizer", None, BATCH) as ticket:
+            result, provider = await self.runtime.router.ainvoke(messages)
+            prompt_tokens, completion_tokens = self._usage_tokens(result.usage_metadata, messages, result.content)
+            ticket.record_usage(prompt_tokens + completion_tokens)
+        # 요약은 특정 요청에 속하지 않으므로 회사/사용자 없이 집계
+        usage_meter.record("", None, provider.model, prompt_tokens, completion_tokens)
+        return result.content
     
-    async def get_chat_sessions(self, user_id: int) -> List[Dict]:
-        """사용자의 채팅 세션 목록을 조회합니다."""
+    async def _prepare_messages(self, message: str, context: Optional[Dict] = None,
+                                history: Optional[List[ChatMessage]] = None,
+                                tenant: Optional[str] = None) -> List:
+        """근거 문서 검색 후 프롬프트 구성"""
+        documents = await retrieval_service.search(message, tenant)
+        return self._build_messages(message, context, history, documents)
+    
+    @staticmethod
+    def _count_prompt_tokens(messages: List) -> int:
+        return sum(context_window.counter.count(m.content) for m in messages)
+    
+    def _usage_tokens(self, usage: Optional[Dict], messages: List, completion: str) -> tuple:
+        """프로바이더 사용량 → (입력 토큰, 출력 토큰), 보고하지 않은 값은 로컬 토크나이저로 계산"""
+        usage = usage or {}
+        prompt_tokens = usage.get("input_tokens") or self._count_prompt_tokens(messages)
+        completion_tokens = usage.get("output_tokens") or context_window.counter.count(completion)
+        return prompt_tokens, completion_tokens
+    
+    def _llm_slot(self, messages: List, tenant: Optional[str], user_id: Optional[int],
+                  priority: Optional[str] = None):
+        """LLM 대기열 실행 허가 (프롬프트 토큰 수로 대화형/긴 작업 구분)"""
+        prompt_tokens = self._count_prompt_tokens(messages)
+        return llm_scheduler.slot(
+            tenant, f"user:{user_id}" if user_id else None,
+            prompt_tokens, LLM_EXPECTED_COMPLETION_TOKENS, priority
+        )
+    
+    async def _generate_openai_response(self, message: str, context: Optional[Dict] = None,
+                                        history: Optional[List[ChatMessage]] = None,
+                                        tenant: Optional[str] = None,
+                                        user_id: Optional[int] = None) -> tuple:
+        """OpenAI API를 사용한 응답 생성 → (응답, 입력 토큰, 출력 토큰, 대기열 대기 ms, 응답한 모델)
+        
+        클라이언트 연결이 끊겨 취소되면 프로바이더 스트림도 닫고, 그때까지 쓴 토큰을 집계한다.
+        """
+        messages = await self._prepare_messages(message, context, history, tenant)
+        prompt_tokens = self._count_prompt_tokens(messages)
+        ticket = None
+        result = None
+        generated = 0
+        model = self.runtime.model
         try:
-            # TODO: 실제 DB에서 세션 목록 조회
-            return [
-                {
-                    "id": 1,
-                    "user_id": user_id,
-                    "session_title": "기업 진단 상담",
-                    "created_at": datetime.now(),
-                    "is_active": True
+            async with self._llm_slot(messages, tenant, user_id) as ticket:
+                # 대화형 요청만 프롬프트 길이를 넘겨 짧으면 헤지할 수 있게 한다
+                async for chunk, provider in self.runtime.router.astream(
+                    messages, prompt_tokens, llm_scheduler.hedge_slot(ticket)
+                ):
+                    result = chunk if result is None else result + chunk
+                    model = provider.model
+                    if chunk.content:
+                        # 중간에 취소돼도 스케줄러가 그때까지 쓴 만큼으로 정산하도록 계속 갱신
+                        generated += context_window.counter.count(chunk.content)
+                        ticket.record_usage(prompt_tokens + generated)
+                prompt_tokens, completion_tokens = self._usage_tokens(result.usage_metadata, messages, result.content)
+                ticket.record_usage(prompt_tokens + completion_tokens)
+        except asyncio.CancelledError:
+            self._record_cancellation("send", ticket is None, prompt_tokens, generated, tenant, user_id, model)
+            raise
+        return result.content, prompt_tokens, completion_tokens, ticket.queue_ms, model
+    
+    def _record_cancellation(self, kind: str, queued: bool, prompt_tokens: int, generated: int,
+                             tenant: Optional[str], user_id: Optional[int], model: Optional[str]):
+        """클라이언트 연결 종료로 취소된 호출 집계 (queued: 대기열에서 취소되어 프로바이더에 보내지 않음)"""
+        if queued:
+            cancellation_metrics.record(kind, True, 0, prompt_tokens + LLM_EXPECTED_COMPLETION_TOKENS)
+            return
+        cancellation_metrics.record(kind, False, generated, max(0, LLM_EXPECTED_COMPLETION_TOKENS - generated))
+        # 끊기 전까지 보낸 프롬프트와 생성된 토큰은 프로바이더가 과금하므로 사용량에 넣는다
+        usage_meter.record(company_of(tenant), user_id, model, prompt_tokens, generated)
+    
+    async def complete(self, instructions: str, prompt: str, tenant: Optional[str] = None,
+                       user_id: Optional[int] = None, priority: Optional[str] = BATCH) -> str:
+        """대화 밖 단발 호출 (진단 작업 등, 기본은 긴 작업 우선순위) → 응답 텍스트"""
+        if not self.runtime.enabled:
+            response = self._generate_dummy_response(prompt)
+            usage_meter.record(company_of(tenant), user_id, DUMMY_MODEL,
+                               context_window.counter.count(prompt), context_window.counter.count(response))
+            return response
+        messages = self.runtime.task_prompt.format_messages(instructions=instructions, prompt=prompt)
+        async with self._llm_slot(messages, tenant, user_id, priority) as ticket:
+            result, provider = await self.runtime.router.ainvoke(messages)
+            prompt_tokens, completion_tokens = self._usage_tokens(result.usage_metadata, messages, result.content)
+            ticket.record_usage(prompt_tokens + completion_tokens)
+        usage_meter.record(company_of(tenant), user_id, provider.model, prompt_tokens, completion_tokens)
+        return result.content
+    
+    async def _stream_openai_tokens(self, messages: List, prompt_tokens: int, ticket) -> AsyncIterator[tuple]:
+        """프로바이더 스트리밍 API → (텍스트 조각, 사용량 메타데이터, 응답한 모델)"""
+        hedge_slot = llm_scheduler.hedge_slot(ticket)
+        async for chunk, provider in self.runtime.router.astream(messages, prompt_tokens, hedge_slot):
+            yield chunk.content, chunk.usage_metadata, provider.model
+    
+    async def _stream_dummy_tokens(self, message: str) -> AsyncIterator[tuple]:
+        """더미 응답을 어절 단위로 흘려보낸다 (개발/테스트용)"""
+        words = self._generate_dummy_response(message).split(" ")
+        for index, word in enumerate(words):
+            await asyncio.sleep(0)
+            yield (word if index == 0 else " " + word), None, DUMMY_MODEL
+    
+    async def stream_response(self, message: str, context: Optional[Dict] = None,
+                              tenant: Optional[str] = None,
+                              history: Optional[List[ChatMessage]] = None,
+                              user_id: Optional[int] = None) -> AsyncIterator[Dict]:
+        """
+        AI 응답 스트리밍
+        
+        도착하는 대로 {"type": "token", "content": ...} 이벤트를 내보내고, 마지막에
+        첫 토큰까지의 시간(ttft_ms)과 초당 토큰 수를 담은 {"type": "done", ...}을 보낸다.
+        """
+        start_time = time.perf_counter()
+        first_token_at = None
+        usage_data: Dict = {}
+        parts: List[str] = []
+        if self.runtime.enabled and not history:
+            cached, cache_tier = await response_cache.get(message, context, tenant)
+            if cached is not None:
+                usage_meter.record(company_of(tenant), user_id, self.runtime.model, 0, 0, cached=True)
+                yield {"type": "token", "content": cached.response}
+                yield {
+                    "type": "done",
+                    "response": cached.response,
+                    "tokens_used": 0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "ttft_ms": round((time.perf_counter() - start_time) * 1000, 2),
+                    "tokens_per_second": 0.0,
+                    "processing_time": round(time.perf_counter() - start_time, 4),
+                    "cached": cache_tier,
                 }
-            ]
+                return
+        
+        stream_metrics.started()
+        queue_ms = 0.0
+        model = self.runtime.model if self.runtime.enabled else DUMMY_MODEL
+        ticket = None
+        prompt_tokens = 0
+        generated = 0
+        try:
+            if self.runtime.enabled:
+                messages = await self._prepare_messages(message, context, history, tenant)
+                prompt_tokens = self._count_prompt_tokens(messages)
+                slot = self._llm_slot(messages, tenant, user_id)
+            else:
+                prompt_tokens = context_window.counter.count(message)
+                slot = nullcontext()
+            async with slot as ticket:
+                if ticket is not None:
+                    queue_ms = ticket.queue_ms
+                source = self._stream_openai_tokens(messages, prompt_tokens, ticket) if ticket is not None else self._stream_dummy_tokens(message)
+                async for content, usage, model in source:
+                    if usage:
+                        # 사용량은 보통 마지막 조각에 한 번 실려 온다
+                        usage_data.update(usage)
+                    if not content:
+                        continue
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    parts.append(content)
+                    generated += context_window.counter.count(content)
+                    if ticket is not None:
+                        ticket.record_usage(prompt_tokens + generated)
+                    yield {"type": "token", "content": content}
+                if ticket is not None:
+                    prompt_tokens, completion_tokens = self._usage_tokens(usage_data, messages, "".join(parts))
+                    ticket.record_usage(prompt_tokens + completion_tokens)
+                else:
+                    completion_tokens = context_window.counter.count("".join(parts))
+        except (asyncio.CancelledError, GeneratorExit):
+            # 클라이언트 연결 종료 → 프로바이더 스트림도 함께 닫힌다
+            stream_metrics.cancelled += 1
+            self._record_cancellation("stream", self.runtime.enabled and ticket is None, prompt_tokens,
+                                      generated, tenant, user_id, model)
+            raise
+        except LLMOverloaded as e:
+            logger.warning(f"⚠️ LLM 대기열 거절: {e}")
+            stream_metrics.failed += 1
+            yield {"type": "error", "message": OVERLOADED_RESPONSE, "retry_after": e.retry_after}
+            return
         except Exception as e:
-            logger.error(f"세션 목록 조회 오류: {e}")
-            return []
+            logger.error(f"AI 스트리밍 오류: {e}")
+            stream_metrics.failed += 1
+            yield {"type": "error", "message": ERROR_RESPONSE}
+            return
+        
+        finished_at = time.perf_counter()
+        tokens = prompt_tokens + completion_tokens
+        ttft_ms = (first_token_at - start_time) * 1000 if first_token_at is not None else None
+        generation_seconds = finished_at - (first_token_at or start_time)
+        tokens_per_second = completion_tokens / generation_seconds if generation_seconds > 0 else 0.0
+        stream_metrics.finished(ttft_ms, completion_tokens, tokens_per_second)
+        usage_meter.record(company_of(tenant), user_id, model, prompt_tokens, completion_tokens)
+        if self.runtime.enabled and not history:
+            await response_cache.put(message, "".join(parts), tokens, context, tenant)
+        
+        yield {
+            "type": "done",
+            "response": "".join(parts),
+            "tokens_used": tokens,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "ttft_ms": round(ttft_ms, 2) if ttft_ms is not None else None,
+            "tokens_per_second": round(tokens_per_second, 2),
+            "processing_time": round(finished_at - start_time, 4),
+            "queue_ms": round(queue_ms, 2),
+        }
+    
+    async def start_session(self, user_id: int, first_message: str) -> Optional[int]:
+        """새 대화 세션 생성 (첫 메시지로 제목 지정)"""
+        session = await self.repository.create_chat_session({
+            "user_id": user_id,
+            "session_title": first_message.strip()[:50] or None
+        })
+        return session.id if session else None
+    
+    async def owns_session(self, session_id: int, user_id: int) -> bool:
+        """이어 갈 세션이 요청한 사용자의 것인지"""
+        return await self.repository.is_session_owner(session_id, user_id)
+    
+    async def get_history(self, session_id: int) -> List[ChatMessage]:
+        """프롬프트에 넣을 최근 대화"""
+        return await self.repository.get_chat_messages_by_session(session_id)
+    
+    async def record_turn(self, session_id: int, user_id: int, message: str, response_data: Dict,
+                          message_id: Optional[int] = None) -> Optional[int]:
+        """사용자 메시지와 응답을 기록 (일괄 기록 큐에 추가) → 응답 메시지 ID"""
+        await self.repository.create_chat_message({
+            "message": message, "user_id": user_id, "session_id": session_id, "message_type": "user"
+        })
+        reply = await self.repository.create_chat_message({
+            "message": response_data["response"],
+            "user_id": user_id,
+            "session_id": session_id,
+            "message_type": "assistant",
+            "tokens_used": response_data.get("tokens_used"),
+            "processing_time": response_data.get("processing_time"),
+            "message_id": message_id
+        })
+        return reply.id if reply else message_id
+    
+    async def get_chat_sessions(self, user_id: int, limit: int = SESSION_PAGE_SIZE,
+                                cursor: Optional[str] = None) -> Dict:
+        """사용자의 채팅 세션 목록 한 페이지 → {"sessions": [...], "next_cursor": 다음 페이지 커서 또는 None}
+        
+        잘못된 커서는 ValueError. 기본 크기의 첫 페이지는 새 메시지가 올 때까지 캐시에서 응답한다.
+        조회 오류는 호출한 쪽으로 올린다 (DB 장애가 빈 목록으로 보이지 않도록).
+        """
+        after = decode_session_cursor(cursor) if cursor else None
+        cacheable = after is None and limit == SESSION_PAGE_SIZE
+        if cacheable:
+            page = session_list_cache.get(user_id)
+            if page is not None:
+                return page
+        started_at = session_list_cache.mark()
+        # 한 건 더 읽어 다음 페이지가 있는지 확인
+        sessions = await self.repository.get_chat_sessions_by_user(user_id, limit + 1, after)
+        next_cursor = None
+        if len(sessions) > limit:
+            sessions = sessions[:limit]
+            next_cursor = encode_session_cursor(sessions[-1].updated_at, sessions[-1].id)
+        page = {
+            "sessions": [
+                {
+                    "id": session.id,
+                    "user_id": session.user_id,
+                    "session_title": session.session_title,
+                    "message_count": session.message_count,
+                    "last_message_preview": session.last_message_preview,
+                    "created_at": session.created_at,
+                    "updated_at": session.updated_at,
+                    "is_active": session.is_active
+                }
+                for session in sessions
+            ],
+            "next_cursor": next_cursor
+        }
+        if cacheable:
+            session_list_cache.put(user_id, page, started_at)
+        return page
     
     async def delete_chat_session(self, session_id: int, user_id: int) -> bool:
-        """채팅 세션을 삭제합니다."""
-        try:
-            # TODO: 실제 DB에서 세션 삭제
-            logger.info(f"세션 삭제: {session_id}")
-            return True
-        except Exception as e:
-            logger.error(f"세션 삭제 오류: {e}")
-            return False
+        """채팅 세션을 삭제합니다. (없거나 다른 사용자의 세션이면 False)"""
+        deleted = await self.repository.delete_chat_session(session_id, user_id)
+        if deleted:
+            context_window.forget(session_id)
+        return deleted
@@ -0,0 +1,221 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from ..entity.chatbot_entity import ChatMessage
+
+# tiktoken은 선택 사항 (미설치 또는 인코딩 파일을 받을 수 없으면 길이 기반 추정)
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+logger = logging.getLogger("chatbot_service")
+
+# 프롬프트 예산 설정
+CONTEXT_HISTORY_TOKENS = int(os.getenv("CONTEXT_HISTORY_TOKENS", "2000"))
+CONTEXT_SUMMARY_TOKENS = int(os.getenv("CONTEXT_SUMMARY_TOKENS", "400"))
+CONTEXT_EXTRA_TOKENS = int(os.getenv("CONTEXT_EXTRA_TOKENS", "1000"))
+CONTEXT_SUMMARY_CACHE_SIZE = int(os.getenv("CONTEXT_SUMMARY_CACHE_SIZE", "10000"))
+TOKENIZER_ENCODING = os.getenv("TOKENIZER_ENCODING", "o200k_base")
+TOKEN_COUNT_CACHE_SIZE = 50000
+
+# 채팅 포맷에서 메시지마다 붙는 역할/구분자 토큰
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# (이전 요약, 새로 접을 대화) → 갱신된 요약
+Summarizer = Callable[[Optional[str], List[ChatMessage]], Awaitable[str]]
+
+
+class TokenCounter:
+    """
+    메시지 토큰 수 계산기
+
+    인코더는 프로세스당 한 번만 로드하고, 텍스트별 결과를 LRU로 기억해 두어
+    매 턴 같은 이전 대화를 다시 인코딩하지 않는다 (새 메시지만 계산).
+    """
+
+    def __init__(self, encoding_name: str = TOKENIZER_ENCODING, cache_size: int = TOKEN_COUNT_CACHE_SIZE):
+        self.encoding_name = encoding_name
+        self.cache_size = cache_size
+        self._encoding = None
+        self._counts: "OrderedDict[str, int]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def name(self) -> str:
+        return self.encoding_name if self._encoding is not None else "estimate"
+
+    def load(self):
+        """인코더 로드 (첫 실행 시 인코딩 파일을 받으므로 스레드에서 호출)"""
+        if tiktoken is None or self._encoding is not None:
+            return
+        try:
+            self._encoding = tiktoken.get_encoding(self.encoding_name)
+            self._counts.clear()
+            logger.info(f"✅ 토크나이저 로드 완료 ({self.encoding_name})")
+        except Exception as e:
+            logger.warning(f"⚠️ 토크나이저 로드 실패 (길이 기반 추정 사용): {e}")
+
+    @staticmethod
+    def _estimate(text: str) -> int:
+        # 한글은 대략 글자당 1토큰(UTF-8 3바이트), 영문은 4바이트당 1토큰보다 조금 많게 잡는다
+        return max(1, len(text.encode("utf-8")) // 3)
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        cached = self._counts.get(key)
+        if cached is not None:
+            self._counts.move_to_end(key)
+            self.hits += 1
+            return cached
+        self.misses += 1
+        tokens = len(self._encoding.encode(text)) if self._encoding is not None else self._estimate(text)
+        self._counts[key] = tokens
+        if len(self._counts) > self.cache_size:
+            self._counts.popitem(last=False)
+        return tokens
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """앞부분 max_tokens 토큰만 남김"""
+        if self.count(text) <= max_tokens:
+            return text
+        if self._encoding is not None:
+            return self._encoding.decode(self._encoding.encode(text)[:max_tokens])
+        return text.encode("utf-8")[:max_tokens * 3].decode("utf-8", errors="ignore")
+
+
+@dataclass
+class SessionSummary:
+    text: str
+    covered_until: datetime
+    tokens: int
+
+
+class ContextWindowManager:
+    """
+    세션 대화를 토큰 예산 안에 맞추는 컨텍스트 관리자
+
+    최근 대화는 예산(CONTEXT_HISTORY_TOKENS)이 허용하는 만큼 그대로 넣고, 예산 밖으로 밀려난
+    이전 대화는 세션별 누적 요약 한 건으로 대신한다. 요약은 응답 경로를 막지 않도록 백그라운드에서
+    갱신하고 세션별로 캐시하므로, 갱신 전까지는 직전 요약을 쓴다. 세션이 아무리 길어도
+    프롬프트의 대화 부분은 예산 + 요약 상한(CONTEXT_SUMMARY_TOKENS)을 넘지 않는다.
+    """
+
+    def __init__(self, counter: Optional[TokenCounter] = None,
+                 history_tokens: int = CONTEXT_HISTORY_TOKENS,
+                 summary_tokens: int = CONTEXT_SUMMARY_TOKENS,
+                 extra_tokens: int = CONTEXT_EXTRA_TOKENS,
+                 max_sessions: int = CONTEXT_SUMMARY_CACHE_SIZE):
+        self.counter = counter or TokenCounter()
+        self.history_tokens = history_tokens
+        self.summary_tokens = summary_tokens
+        self.extra_tokens = extra_tokens
+        self.max_sessions = max_sessions
+        self._summaries: "OrderedDict[int, SessionSummary]" = OrderedDict()
+        self._summarizing: Set[int] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self.stats = {"windows": 0, "folded_messages": 0, "summaries": 0, "summary_failures": 0}
+
+    async def start(self):
+        await asyncio.to_thread(self.counter.load)
+
+    async def stop(self):
+        """진행 중인 요약 작업 취소"""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def message_tokens(self, message: ChatMessage) -> int:
+        return self.counter.count(message.message) + MESSAGE_OVERHEAD_TOKENS
+
+    def fit_context(self, context: Optional[Dict]) -> Optional[str]:
+        """요청 컨텍스트 직렬화 (CONTEXT_EXTRA_TOKENS 초과분은 잘라낸다)"""
+        if not context:
+            return None
+        serialized = json.dumps(context, ensure_ascii=False, default=str)
+        return self.counter.truncate(serialized, self.extra_tokens)
+
+    def fit(self, history: Optional[List[ChatMessage]],
+            summarize: Optional[Summarizer] = None) -> Tuple[Optional[str], List[ChatMessage]]:
+        """이전 대화 → (누적 요약, 그대로 넣을 최근 대화)"""
+        if not history:
+            return None, []
+        self.stats["windows"] += 1
+
+        # 최신 메시지부터 예산이 허용하는 만큼
+        used = 0
+        cut = len(history)
+        while cut > 0:
+            tokens = self.message_tokens(history[cut - 1])
+            if used + tokens > self.history_tokens:
+                break
+            used += tokens
+            cut -= 1
+        recent, older = history[cut:], history[:cut]
+
+        session_id = history[-1].session_id
+        summary = self._summaries.get(session_id)
+        if summary is not None:
+            self._summaries.move_to_end(session_id)
+        if older:
+            unfolded = [m for m in older if summary is None or m.created_at > summary.covered_until]
+            if unfolded and summarize is not None:
+                self._schedule(session_id, unfolded, summarize)
+        return (summary.text if summary else None), recent
+
+    def _schedule(self, session_id: int, messages: List[ChatMessage], summarize: Summarizer):
+        if session_id in self._summarizing:
+            return
+        self._summarizing.add(session_id)
+        task = asyncio.create_task(self._summarize(session_id, messages, summarize))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _summarize(self, session_id: int, messages: List[ChatMessage], summarize: Summarizer):
+        try:
+            previous = self._summaries.get(session_id)
+            text = await summarize(previous.text if previous else None, messages)
+            text = self.counter.truncate(text.strip(), self.summary_tokens)
+            self._summaries[session_id] = SessionSummary(text, messages[-1].created_at, self.counter.count(text))
+            self._summaries.move_to_end(session_id)
+            while len(self._summaries) > self.max_sessions:
+                self._summaries.popitem(last=False)
+            self.stats["summaries"] += 1
+            self.stats["folded_messages"] += len(messages)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats["summary_failures"] += 1
+            logger.warning(f"⚠️ 대화 요약 실패 (세션 {session_id}): {e}")
+        finally:
+            self._summarizing.discard(session_id)
+
+    def forget(self, session_id: int):
+        """세션 삭제 시 요약 제거"""
+        self._summaries.pop(session_id, None)
+
+    def metrics(self) -> Dict:
+        lookups = self.counter.hits + self.counter.misses
+        return {
+            **self.stats,
+            "tokenizer": self.counter.name,
+            "token_cache_hit_rate": round(self.counter.hits / lookups, 4) if lookups else 0.0,
+            "cached_summaries": len(self._summaries),
+            "summarizing": len(self._summarizing),
+            "history_budget_tokens": self.history_tokens,
+            "summary_budget_tokens": self.summary_tokens,
+        }
+
+
+context_window = ContextWindowManager()
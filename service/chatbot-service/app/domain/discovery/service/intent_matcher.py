@@ -0,0 +1,231 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ....common.embedding import normalize_text
+
+logger = logging.getLogger("chatbot_service")
+
+# 오프라인 FAQ 설정
+INTENTS_PATH = os.getenv("INTENTS_PATH", str(Path(__file__).resolve().parents[3] / "data" / "intents.json"))
+INTENT_RELOAD_SECONDS = float(os.getenv("INTENT_RELOAD_SECONDS", "10"))
+INTENT_MIN_SCORE = float(os.getenv("INTENT_MIN_SCORE", "0"))
+
+
+class AhoCorasick:
+    """
+    다중 키워드 매칭 오토마톤
+
+    키워드 트라이에 실패 링크를 붙여 두고, 메시지를 한 번만 훑으면서 포함된 모든 키워드를
+    찾는다. 키워드 수와 관계없이 메시지 길이 + 일치 건수에 비례하는 시간에 끝난다.
+    """
+
+    def __init__(self, patterns: List[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        for index, pattern in enumerate(patterns):
+            self._add(pattern, index)
+        self._link()
+
+    def _add(self, pattern: str, index: int):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = next_state
+        self._out[state] += (index,)
+
+    def _link(self):
+        # 너비 우선으로 실패 링크 연결, 실패 상태의 출력도 미리 합쳐 둔다
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._out[next_state] += self._out[self._fail[next_state]]
+
+    @property
+    def states(self) -> int:
+        return len(self._goto)
+
+    def find(self, text: str):
+        """text에 나타나는 키워드 번호 (중복 포함)"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                yield from out[state]
+
+
+@dataclass
+class Intent:
+    id: str
+    response: str
+
+
+@dataclass
+class IntentMatch:
+    intent: Intent
+    score: float
+
+
+class _CompiledIntents:
+    """한 번 컴파일한 의도 집합 (교체만 하고 수정하지 않는다)"""
+
+    def __init__(self, data: Dict):
+        self.version = data.get("version")
+        self.intents: List[Intent] = []
+        # 키워드 번호 → [(의도 번호, 가중치)] (같은 키워드를 여러 의도가 쓸 수 있다)
+        self.targets: List[List[Tuple[int, float]]] = []
+        keyword_index: Dict[str, int] = {}
+        for intent_data in data["intents"]:
+            intent_index = len(self.intents)
+            self.intents.append(Intent(intent_data["id"], intent_data["response"]))
+            keywords = intent_data["keywords"]
+            if isinstance(keywords, list):
+                keywords = dict.fromkeys(keywords, 1.0)
+            for keyword, weight in keywords.items():
+                normalized = normalize_text(keyword)
+                if not normalized:
+                    continue
+                if normalized not in keyword_index:
+                    keyword_index[normalized] = len(self.targets)
+                    self.targets.append([])
+                self.targets[keyword_index[normalized]].append((intent_index, float(weight)))
+        self.keywords = len(keyword_index)
+        self.automaton = AhoCorasick(list(keyword_index))
+
+    def match(self, message: str, min_score: float) -> Optional[IntentMatch]:
+        # 키워드마다 한 번만 점수에 반영
+        scores: Dict[int, float] = {}
+        for keyword in set(self.automaton.find(normalize_text(message))):
+            for intent_index, weight in self.targets[keyword]:
+                scores[intent_index] = scores.get(intent_index, 0.0) + weight
+        if not scores:
+            return None
+        # 최고 점수, 동점이면 먼저 정의된 의도
+        best = min(scores, key=lambda index: (-scores[index], index))
+        if scores[best] <= min_score:
+            return None
+        return IntentMatch(self.intents[best], scores[best])
+
+
+class IntentMatcher:
+    """
+    오프라인(더미) 모드용 FAQ 의도 매처
+
+    데이터 파일(INTENTS_PATH)을 한 번 컴파일해 두고 메시지마다 한 번 훑어 가중치 합이
+    가장 큰 의도를 고른다. 파일이 바뀌면 백그라운드에서 다시 컴파일해 통째로 교체하며,
+    잘못된 파일이면 기존 의도 집합을 그대로 쓴다.
+    """
+
+    def __init__(self, path: str = INTENTS_PATH, reload_seconds: float = INTENT_RELOAD_SECONDS,
+                 min_score: float = INTENT_MIN_SCORE):
+        self.path = path
+        self.reload_seconds = reload_seconds
+        self.min_score = min_score
+        self._compiled: Optional[_CompiledIntents] = None
+        self._signature: Optional[Tuple[float, int]] = None
+        self._attempted = False
+        self._task: Optional[asyncio.Task] = None
+        self.reloads = 0
+        self.matches = 0
+        self.misses = 0
+        self.last_compile_ms = 0.0
+
+    def _file_signature(self) -> Optional[Tuple[float, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime, stat.st_size
+
+    def load(self) -> bool:
+        """데이터 파일 컴파일 후 교체 (실패 시 기존 의도 유지)"""
+        signature = self._file_signature()
+        self._attempted = True
+        try:
+            started = time.perf_counter()
+            with open(self.path, encoding="utf-8") as f:
+                compiled = _CompiledIntents(json.load(f))
+            self.last_compile_ms = (time.perf_counter() - started) * 1000
+        except Exception as e:
+            logger.warning(f"⚠️ FAQ 의도 파일 로드 실패 ({self.path}): {e}")
+            self._signature = signature
+            return False
+        self._compiled = compiled
+        self._signature = signature
+        self.reloads += 1
+        logger.info(
+            f"✅ FAQ 의도 {len(compiled.intents)}개 / 키워드 {compiled.keywords}개 컴파일 "
+            f"({self.last_compile_ms:.1f}ms)"
+        )
+        return True
+
+    async def start(self):
+        await asyncio.to_thread(self.load)
+        if self.reload_seconds > 0:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self):
+        """파일 변경 감지 시 다시 컴파일"""
+        while True:
+            await asyncio.sleep(self.reload_seconds)
+            if self._file_signature() != self._signature:
+                await asyncio.to_thread(self.load)
+
+    def match(self, message: str) -> Optional[IntentMatch]:
+        if not self._attempted:
+            self.load()
+        compiled = self._compiled
+        result = compiled.match(message, self.min_score) if compiled is not None else None
+        if result is None:
+            self.misses += 1
+        else:
+            self.matches += 1
+        return result
+
+    def stats(self) -> Dict:
+        compiled = self._compiled
+        return {
+            "path": self.path,
+            "version": compiled.version if compiled else None,
+            "intents": len(compiled.intents) if compiled else 0,
+            "keywords": compiled.keywords if compiled else 0,
+            "states": compiled.automaton.states if compiled else 0,
+            "reloads": self.reloads,
+            "last_compile_ms": round(self.last_compile_ms, 2),
+            "matches": self.matches,
+            "misses": self.misses,
+        }
+
+
+intent_matcher = IntentMatcher()
@@ -0,0 +1,163 @@
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+
+import httpx
+
+from .llm_scheduler import LLM_MAX_CONCURRENCY
+from .provider_router import Provider, ProviderRouter
+
+# LangChain OpenAI 연동은 선택 사항 (미설치 시 더미 모드)
+try:
+    from langchain_openai import ChatOpenAI
+    from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+except ImportError:
+    ChatOpenAI = None
+
+logger = logging.getLogger("chatbot_service")
+
+# LLM 설정 (OPENAI_BASE_URL로 로컬 가짜 서버나 호환 프로바이더를 지정할 수 있다)
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+OPENAI_TEMPERATURE = float(os.getenv("OPENAI_TEMPERATURE", "0.3"))
+OPENAI_MAX_TOKENS = int(os.getenv("OPENAI_MAX_TOKENS", "1024"))
+OPENAI_TIMEOUT_SECONDS = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "60"))
+# 연결이 안 되는 프로바이더를 빨리 포기하고 다음 프로바이더로 넘기기 위한 연결 시간 제한
+LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "3"))
+# 여러 프로바이더 (JSON 목록, 비우면 OPENAI_* 설정 하나만 사용), 예:
+# [{"name": "primary", "model": "gpt-4o-mini", "api_key_env": "OPENAI_API_KEY"},
+#  {"name": "backup", "model": "gpt-4o-mini", "base_url": "http://localhost:9101/v1", "api_key": "fake"}]
+LLM_PROVIDERS = os.getenv("LLM_PROVIDERS", "")
+
+SYSTEM_PROMPT = (
+    "당신은 중소기업 진단 AI 어시스턴트입니다. 재무, 운영, 마케팅, 인사 등 기업 진단 관련 질문에 "
+    "한국어로 간결하고 구체적으로 답변하세요. 모르는 내용은 추측하지 말고 필요한 자료를 요청하세요."
+)
+
+SUMMARY_PROMPT = (
+    "다음은 기업 진단 상담 대화의 이전 요약과 그 뒤에 이어진 대화입니다. 이후 답변에 필요한 사실"
+    "(회사 정보, 수치, 사용자의 요청과 결정 사항)만 남겨 한국어로 간결하게 하나의 요약으로 합치세요."
+)
+
+
+def _is_configured(api_key: Optional[str]) -> bool:
+    """.env 예시 값(your-...)은 미설정으로 간주"""
+    return bool(api_key) and not api_key.startswith("your-")
+
+
+def _provider_configs() -> List[Dict]:
+    """프로바이더 설정 목록 (API 키가 없는 항목은 제외)"""
+    if LLM_PROVIDERS.strip():
+        configs = json.loads(LLM_PROVIDERS)
+    else:
+        configs = [{"name": "openai", "model": OPENAI_MODEL, "base_url": OPENAI_BASE_URL}]
+    providers = []
+    for index, config in enumerate(configs):
+        api_key = config.get("api_key") or os.getenv(config.get("api_key_env", "OPENAI_API_KEY"))
+        name = config.get("name") or f"provider-{index}"
+        if not _is_configured(api_key):
+            logger.warning(f"⚠️ LLM 프로바이더 {name}의 API 키가 없어 제외합니다")
+            continue
+        providers.append({
+            "name": name,
+            "model": config.get("model") or OPENAI_MODEL,
+            "base_url": config.get("base_url") or None,
+            "api_key": api_key,
+        })
+    return providers
+
+
+class LLMRuntime:
+    """
+    프로세스당 한 번 만드는 LLM 실행 환경
+
+    API 키 확인, 프로바이더 HTTP 클라이언트(연결 풀), ChatOpenAI 클라이언트, 프롬프트 템플릿을
+    lifespan 시작 시 한 번 만들고 요청들이 함께 쓴다. 템플릿은 메시지 목록만 만들고 호출은
+    클라이언트로 따로 하는데, LLM 대기열이 호출 전에 프롬프트 토큰 수를 알아야 하기 때문이다.
+    프로바이더마다 ChatOpenAI 클라이언트를 하나씩 만들어 router에 넣고, 호출은 router가 고른
+    프로바이더로 간다. API 키가 있는 프로바이더가 없거나 LangChain이 없으면 더미 모드로 동작한다.
+    """
+
+    def __init__(self):
+        self.router: Optional[ProviderRouter] = None
+        self.http_client: Optional[httpx.AsyncClient] = None
+        self.chat_prompt = None
+        self.summary_prompt = None
+        self.task_prompt = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.router is not None
+
+    @property
+    def mode(self) -> str:
+        return "openai" if self.enabled else "dummy"
+
+    @property
+    def model(self) -> Optional[str]:
+        """기본(첫 번째) 프로바이더 모델"""
+        return self.router.providers[0].model if self.enabled else None
+
+    async def start(self):
+        configs = _provider_configs() if ChatOpenAI is not None else []
+        if not configs:
+            logger.info("ℹ️ OpenAI API 키가 없어 더미 응답 모드로 동작합니다")
+            return
+        # 스케줄러 동시 호출 수만큼 연결을 유지해 호출마다 TLS 연결을 새로 맺지 않는다 (프로바이더 공용)
+        timeout = httpx.Timeout(OPENAI_TIMEOUT_SECONDS, connect=LLM_CONNECT_TIMEOUT_SECONDS)
+        self.http_client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=LLM_MAX_CONCURRENCY * 2 * len(configs),
+                                max_keepalive_connections=LLM_MAX_CONCURRENCY * len(configs)),
+        )
+        # 대체 프로바이더가 있으면 SDK 재시도 대신 바로 다음 프로바이더로 넘긴다
+        max_retries = 0 if len(configs) > 1 else 2
+        self.router = ProviderRouter([
+            Provider(config["name"], config["model"], ChatOpenAI(
+                model=config["model"],
+                api_key=config["api_key"],
+                base_url=config["base_url"],
+                temperature=OPENAI_TEMPERATURE,
+                max_tokens=OPENAI_MAX_TOKENS,
+                timeout=timeout,
+                max_retries=max_retries,
+                streaming=True,
+                stream_usage=True,
+                http_async_client=self.http_client,
+            ))
+            for config in configs
+        ])
+        # 대화: 시스템 프롬프트 + (참고 정보/문서/이전 요약) + 최근 대화 + 사용자 메시지
+        self.chat_prompt = ChatPromptTemplate.from_messages([
+            ("system", SYSTEM_PROMPT),
+            MessagesPlaceholder("notes", optional=True),
+            MessagesPlaceholder("history", optional=True),
+            ("human", "{message}"),
+        ])
+        self.summary_prompt = ChatPromptTemplate.from_messages([
+            ("system", SUMMARY_PROMPT),
+            ("human", "이전 요약:\n{previous}\n\n대화:\n{transcript}"),
+        ])
+        # 진단 작업 등 대화 밖 단발 호출
+        self.task_prompt = ChatPromptTemplate.from_messages([
+            ("system", "{instructions}"),
+            ("human", "{prompt}"),
+        ])
+        names = ", ".join(f"{p.name}:{p.model}" for p in self.router.providers)
+        logger.info(f"✅ LLM 클라이언트 준비 완료 ({names})")
+
+    async def stop(self):
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+        self.router = None
+
+    def status(self) -> Dict:
+        return {"mode": self.mode, "model": self.model}
+
+    def metrics(self) -> Dict:
+        return self.router.metrics() if self.enabled else {}
+
+
+llm_runtime = LLMRuntime()
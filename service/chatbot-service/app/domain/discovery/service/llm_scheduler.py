@@ -0,0 +1,274 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger("chatbot_service")
+
+# LLM 호출 스케줄링 설정
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "200000"))  # 0이면 제한 없음
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "200"))
+LLM_QUEUE_TIMEOUT_SECONDS = float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", "30"))
+LLM_LONG_PROMPT_TOKENS = int(os.getenv("LLM_LONG_PROMPT_TOKENS", "2000"))
+LLM_BATCH_MAX_WAIT_SECONDS = float(os.getenv("LLM_BATCH_MAX_WAIT_SECONDS", "10"))
+# 흐름별 가중치 (예: "company:1=4,company:7=2"), 지정하지 않은 흐름은 1
+LLM_FLOW_WEIGHTS = os.getenv("LLM_FLOW_WEIGHTS", "")
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+
+class LLMOverloaded(Exception):
+    """대기열이 가득 찼거나 대기 시간이 초과된 경우"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _parse_weights(spec: str) -> Dict[str, float]:
+    weights = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        flow, _, weight = item.rpartition("=")
+        if flow:
+            weights[flow] = float(weight)
+    return weights
+
+
+@dataclass
+class Ticket:
+    """실행 허가 (queue_ms: 대기 시간, reserved: 예약한 토큰 수)"""
+    priority: str
+    reserved: int
+    queue_ms: float = 0.0
+    used_tokens: Optional[int] = None
+    prompt_tokens: int = 0
+
+    def record_usage(self, tokens: Optional[int]):
+        """실제 사용 토큰 (반납 시 예약분과의 차이를 정산)"""
+        if tokens:
+            self.used_tokens = tokens
+
+
+@dataclass(order=True)
+class _Waiter:
+    tag: float
+    seq: int
+    start_tag: float = field(compare=False)
+    ticket: Ticket = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+class LLMScheduler:
+    """
+    프로바이더 호출 디스패치 대기열
+
+    동시 호출 수(LLM_MAX_CONCURRENCY)와 분당 토큰 예산(LLM_TOKENS_PER_MINUTE, 토큰 버킷)을 넘지 않게
+    호출을 내보낸다. 순서는 가중 공정 큐잉(WFQ)으로 정하는데, 요청의 종료 태그를 회사 흐름과 사용자
+    흐름 중 늦은 쪽에서 시작하게 해 한 회사나 한 사용자가 몰아서 보내도 다른 흐름이 밀리지 않는다.
+    짧은 대화형 요청은 긴 진단 작업보다 먼저 나가되, 오래 기다린 작업(LLM_BATCH_MAX_WAIT_SECONDS)은
+    우선 처리한다. 대기열이 가득 차거나 대기 시간이 초과되면 LLMOverloaded로 바로 거절한다.
+    """
+
+    def __init__(self, max_concurrency: int = LLM_MAX_CONCURRENCY,
+                 tokens_per_minute: int = LLM_TOKENS_PER_MINUTE,
+                 max_queue: int = LLM_MAX_QUEUE,
+                 queue_timeout: float = LLM_QUEUE_TIMEOUT_SECONDS,
+                 long_prompt_tokens: int = LLM_LONG_PROMPT_TOKENS,
+                 batch_max_wait: float = LLM_BATCH_MAX_WAIT_SECONDS,
+                 weights: Optional[Dict[str, float]] = None):
+        self.max_concurrency = max_concurrency
+        self.tokens_per_minute = tokens_per_minute
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.long_prompt_tokens = long_prompt_tokens
+        self.batch_max_wait = batch_max_wait
+        self.weights = weights if weights is not None else _parse_weights(LLM_FLOW_WEIGHTS)
+        self._queues: Dict[str, List[_Waiter]] = {INTERACTIVE: [], BATCH: []}
+        self._finish: Dict[str, float] = {}
+        self._virtual_time = 0.0
+        self._seq = itertools.count()
+        self._running = 0
+        self._waiting = 0
+        self._tokens = float(tokens_per_minute)
+        self._refilled_at = time.monotonic()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._queue_ms: Deque[float] = deque(maxlen=1000)
+        self.stats = {"dispatched": 0, "rejected": 0, "timeouts": 0, "cancelled": 0, "tokens_reconciled": 0,
+                      "hedges": 0, "hedges_denied": 0}
+
+    def classify(self, prompt_tokens: int) -> str:
+        return BATCH if prompt_tokens > self.long_prompt_tokens else INTERACTIVE
+
+    def _weight(self, flow: str) -> float:
+        return self.weights.get(flow, 1.0)
+
+    def _refill(self):
+        if self.tokens_per_minute <= 0:
+            return
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.tokens_per_minute),
+            self._tokens + (now - self._refilled_at) * self.tokens_per_minute / 60
+        )
+        self._refilled_at = now
+
+    @asynccontextmanager
+    async def slot(self, tenant: Optional[str], user: Optional[str], prompt_tokens: int,
+                   completion_tokens: int, priority: Optional[str] = None):
+        """호출 한 건 실행 허가 (async with)"""
+        ticket = await self.acquire(tenant, user, prompt_tokens, completion_tokens, priority)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    async def acquire(self, tenant: Optional[str], user: Optional[str], prompt_tokens: int,
+                      completion_tokens: int, priority: Optional[str] = None) -> Ticket:
+        if self._waiting >= self.max_queue:
+            self.stats["rejected"] += 1
+            raise LLMOverloaded("AI 요청이 많아 잠시 후 다시 시도해주세요", self._retry_after())
+
+        cost = prompt_tokens + completion_tokens
+        ticket = Ticket(priority or self.classify(prompt_tokens), cost, prompt_tokens=prompt_tokens)
+        flows = [flow for flow in (tenant, user) if flow] or ["anonymous"]
+        weight = min(self._weight(flow) for flow in flows)
+        start_tag = max([self._virtual_time] + [self._finish.get(flow, 0.0) for flow in flows])
+        tag = start_tag + cost / weight
+        for flow in flows:
+            self._finish[flow] = tag
+
+        waiter = _Waiter(tag, next(self._seq), start_tag, ticket,
+                         asyncio.get_running_loop().create_future(), time.monotonic())
+        heapq.heappush(self._queues[ticket.priority], waiter)
+        self._waiting += 1
+        self._dispatch()
+
+        try:
+            done, _ = await asyncio.wait({waiter.future}, timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            # 대기 중 클라이언트 연결 종료
+            self._abandon(waiter)
+            self.stats["cancelled"] += 1
+            raise
+        if not done:
+            self._abandon(waiter)
+            self.stats["timeouts"] += 1
+            raise LLMOverloaded("AI 요청 대기 시간이 초과되었습니다", self._retry_after())
+        return ticket
+
+    def _abandon(self, waiter: _Waiter):
+        if waiter.future.done() and not waiter.future.cancelled():
+            # 허가를 받은 직후 취소됨 → 슬롯 반납
+            self.release(waiter.ticket)
+            return
+        waiter.cancelled = True
+        waiter.future.cancel()
+        self._waiting -= 1
+
+    def release(self, ticket: Ticket):
+        self._running -= 1
+        if self.tokens_per_minute > 0 and ticket.used_tokens is not None:
+            # 예약분과 실제 사용량 차이 정산 (초과 사용분은 다음 호출들이 갚는다)
+            self._refill()
+            self._tokens += ticket.reserved - ticket.used_tokens
+            self.stats["tokens_reconciled"] += 1
+        self._dispatch()
+
+    def hedge_slot(self, ticket: Ticket) -> Callable[[], Optional[Callable[[], None]]]:
+        """허가받은 호출이 헤지로 프로바이더에 한 번 더 보낼 때 쓸 추가 허가 (프로바이더 라우터에 넘긴다)
+
+        헤지 호출도 동시 호출 한 자리와 프롬프트 토큰을 쓰므로, 대기 중인 요청이 없고 동시 호출과 토큰
+        예산에 여유가 있을 때만 허가한다. 진 쪽은 첫 토큰 직후 취소되어 프롬프트 토큰만 과금되므로
+        프롬프트 토큰만큼 버킷에서 빼고, 자리는 반납 함수를 부를 때 돌려받는다.
+        """
+        def acquire() -> Optional[Callable[[], None]]:
+            self._refill()
+            if (self._waiting or self._running >= self.max_concurrency
+                    or (self.tokens_per_minute > 0 and self._tokens < ticket.prompt_tokens)):
+                self.stats["hedges_denied"] += 1
+                return None
+            if self.tokens_per_minute > 0:
+                self._tokens -= ticket.prompt_tokens
+            self._running += 1
+            self.stats["hedges"] += 1
+            released = False
+
+            def release():
+                nonlocal released
+                if not released:
+                    released = True
+                    self._running -= 1
+                    self._dispatch()
+            return release
+        return acquire
+
+    def _next_queue(self) -> Optional[List[_Waiter]]:
+        for queue in self._queues.values():
+            while queue and queue[0].cancelled:
+                heapq.heappop(queue)
+        interactive, batch = self._queues[INTERACTIVE], self._queues[BATCH]
+        if batch and (not interactive or time.monotonic() - batch[0].enqueued_at > self.batch_max_wait):
+            return batch
+        return interactive or None
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._refill()
+        while self._running < self.max_concurrency:
+            queue = self._next_queue()
+            if queue is None:
+                break
+            waiter = queue[0]
+            if self.tokens_per_minute > 0:
+                # 예산보다 큰 요청은 버킷이 가득 찼을 때 보낸다
+                needed = min(waiter.ticket.reserved, self.tokens_per_minute)
+                if self._tokens < needed:
+                    delay = (needed - self._tokens) * 60 / self.tokens_per_minute
+                    self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                    break
+                self._tokens -= waiter.ticket.reserved
+            heapq.heappop(queue)
+            self._waiting -= 1
+            self._running += 1
+            self._virtual_time = max(self._virtual_time, waiter.start_tag)
+            waiter.ticket.queue_ms = (time.monotonic() - waiter.enqueued_at) * 1000
+            self._queue_ms.append(waiter.ticket.queue_ms)
+            self.stats["dispatched"] += 1
+            waiter.future.set_result(waiter.ticket)
+        if len(self._finish) > 10000:
+            # 이미 지나간 흐름 태그 정리
+            self._finish = {flow: tag for flow, tag in self._finish.items() if tag > self._virtual_time}
+
+    def _retry_after(self) -> float:
+        average = sum(self._queue_ms) / len(self._queue_ms) / 1000 if self._queue_ms else 1.0
+        return round(max(1.0, average), 1)
+
+    def metrics(self) -> Dict:
+        self._refill()
+        samples = sorted(self._queue_ms)
+        return {
+            **self.stats,
+            "running": self._running,
+            "waiting": self._waiting,
+            "waiting_interactive": sum(1 for w in self._queues[INTERACTIVE] if not w.cancelled),
+            "waiting_batch": sum(1 for w in self._queues[BATCH] if not w.cancelled),
+            "max_concurrency": self.max_concurrency,
+            "tokens_available": round(self._tokens) if self.tokens_per_minute > 0 else None,
+            "queue_ms_avg": round(sum(samples) / len(samples), 2) if samples else 0.0,
+            "queue_ms_p95": round(samples[int(len(samples) * 0.95) - 1], 2) if len(samples) >= 20 else None,
+        }
+
+
+llm_scheduler = LLMScheduler()
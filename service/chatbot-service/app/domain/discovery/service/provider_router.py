@@ -0,0 +1,301 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+# OpenAI SDK 예외 타입은 선택 사항 (미설치 시 연결 오류만으로 판단)
+try:
+    import openai
+except ImportError:
+    openai = None
+
+logger = logging.getLogger("chatbot_service")
+
+# 프로바이더 라우팅 설정
+LLM_ROUTER_EWMA_ALPHA = float(os.getenv("LLM_ROUTER_EWMA_ALPHA", "0.2"))
+LLM_PROVIDER_FAILURE_THRESHOLD = int(os.getenv("LLM_PROVIDER_FAILURE_THRESHOLD", "3"))
+LLM_PROVIDER_COOLDOWN_SECONDS = float(os.getenv("LLM_PROVIDER_COOLDOWN_SECONDS", "30"))
+LLM_PROVIDER_MAX_ERROR_RATE = float(os.getenv("LLM_PROVIDER_MAX_ERROR_RATE", "0.5"))
+# 호출이 없어도 오류율이 이 시간마다 절반으로 줄어 제외된 프로바이더를 다시 시험하게 된다 (0이면 줄지 않음)
+LLM_PROVIDER_ERROR_HALF_LIFE_SECONDS = float(os.getenv("LLM_PROVIDER_ERROR_HALF_LIFE_SECONDS", "60"))
+# 짧은 프롬프트는 첫 토큰이 LLM_HEDGE_DELAY_MS 안에 오지 않으면 다음 프로바이더에도 보낸다
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+LLM_HEDGE_MAX_PROMPT_TOKENS = int(os.getenv("LLM_HEDGE_MAX_PROMPT_TOKENS", "800"))
+LLM_HEDGE_DELAY_MS = float(os.getenv("LLM_HEDGE_DELAY_MS", "400"))
+
+# 요청 자체의 문제라 다른 프로바이더로 보내도 똑같이 실패하는 상태 코드
+REQUEST_ERROR_STATUS = {400, 413, 422}
+
+_END = object()
+
+# 헤지 호출 허가: 호출하면 반납 함수를, 여유가 없으면 None을 돌려준다 (LLM 스케줄러가 제공)
+HedgeSlot = Callable[[], Optional[Callable[[], None]]]
+
+
+class NoProviderAvailable(Exception):
+    """설정된 프로바이더가 없는 경우"""
+
+
+def is_failover_error(error: BaseException) -> bool:
+    """다른 프로바이더로 넘겨 볼 만한 오류인지 (연결 실패, 시간 초과, 5xx, 429, 인증 등 프로바이더 쪽 문제)"""
+    if isinstance(error, (httpx.TransportError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    if openai is not None:
+        if isinstance(error, openai.APIConnectionError):
+            return True
+        if isinstance(error, openai.APIStatusError):
+            return error.status_code not in REQUEST_ERROR_STATUS
+    return False
+
+
+class Provider:
+    """
+    프로바이더 하나 (모델 + 클라이언트)와 최근 상태
+
+    latency_ms는 첫 토큰까지 걸린 시간의 EWMA로, 응답 길이와 관계없이 프로바이더 속도를 비교한다.
+    error_rate는 호출 결과(실패 1, 성공 0)의 EWMA이고, 연속 실패가 LLM_PROVIDER_FAILURE_THRESHOLD번
+    쌓이면 LLM_PROVIDER_COOLDOWN_SECONDS 동안 쉬게 한 뒤 다시 한 번 시험해 본다. 오류율이 기준을 넘어
+    제외되면 성공으로 낮아질 기회가 없으므로, 마지막 관측 뒤로 시간이 지나는 만큼도 줄어든다
+    (LLM_PROVIDER_ERROR_HALF_LIFE_SECONDS). 기준 아래로 내려오면 다음 요청이 다시 시험해 본다.
+    """
+
+    def __init__(self, name: str, model: str, llm: Any):
+        self.name = name
+        self.model = model
+        self.llm = llm
+        self.latency_ms: Optional[float] = None
+        self._error_rate = 0.0
+        self._error_at = time.monotonic()
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.inflight = 0
+        self.stats = {"requests": 0, "succeeded": 0, "failed": 0}
+
+    @property
+    def error_rate(self) -> float:
+        if LLM_PROVIDER_ERROR_HALF_LIFE_SECONDS <= 0:
+            return self._error_rate
+        elapsed = time.monotonic() - self._error_at
+        return self._error_rate * 0.5 ** (elapsed / LLM_PROVIDER_ERROR_HALF_LIFE_SECONDS)
+
+    @error_rate.setter
+    def error_rate(self, value: float):
+        self._error_rate = value
+        self._error_at = time.monotonic()
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.open_until and self.error_rate < LLM_PROVIDER_MAX_ERROR_RATE
+
+    def observe_latency(self, latency_ms: float):
+        if self.latency_ms is None:
+            self.latency_ms = latency_ms
+        else:
+            self.latency_ms += LLM_ROUTER_EWMA_ALPHA * (latency_ms - self.latency_ms)
+
+    def observe_success(self):
+        self.stats["succeeded"] += 1
+        self.error_rate *= 1 - LLM_ROUTER_EWMA_ALPHA
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+
+    def observe_failure(self):
+        self.stats["failed"] += 1
+        self.error_rate += LLM_ROUTER_EWMA_ALPHA * (1 - self.error_rate)
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= LLM_PROVIDER_FAILURE_THRESHOLD:
+            self.open_until = time.monotonic() + LLM_PROVIDER_COOLDOWN_SECONDS
+            # 쉬고 난 뒤 한 번의 성공으로 다시 쓸 수 있도록 오류율을 기준선 아래로 낮춰 둔다
+            self.error_rate = min(self.error_rate, LLM_PROVIDER_MAX_ERROR_RATE * (1 - LLM_ROUTER_EWMA_ALPHA))
+            self.consecutive_failures = 0
+            logger.warning(f"⚠️ LLM 프로바이더 {self.name} 연속 실패, {LLM_PROVIDER_COOLDOWN_SECONDS:.0f}초 동안 제외")
+
+    def status(self) -> Dict:
+        return {
+            "name": self.name,
+            "model": self.model,
+            "healthy": self.healthy,
+            "latency_ms": round(self.latency_ms, 2) if self.latency_ms is not None else None,
+            "error_rate": round(self.error_rate, 4),
+            "inflight": self.inflight,
+            **self.stats,
+        }
+
+
+class _Attempt:
+    """
+    프로바이더 한 곳에 보낸 스트리밍 호출
+
+    별도 태스크가 응답 조각을 큐로 옮긴다. 첫 토큰 전까지의 조각(역할 정보 등)은 모아 두었다가 첫 토큰과
+    함께 한 번에 넘기므로, 라우터는 큐의 첫 항목만 보고 어느 프로바이더가 먼저 응답했는지 판단한다.
+    """
+
+    def __init__(self, provider: Provider, messages: List):
+        self.provider = provider
+        self.messages = messages
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.started = time.perf_counter()
+        self.first_token = False
+        provider.inflight += 1
+        provider.stats["requests"] += 1
+        self.task = asyncio.create_task(self._pump())
+
+    async def _pump(self):
+        buffered: List = []
+        try:
+            async for chunk in self.provider.llm.astream(self.messages):
+                if self.first_token:
+                    await self.queue.put(chunk)
+                    continue
+                buffered.append(chunk)
+                if chunk.content:
+                    self.first_token = True
+                    self.provider.observe_latency((time.perf_counter() - self.started) * 1000)
+                    await self.queue.put(buffered)
+            if not self.first_token:
+                await self.queue.put(buffered)
+            self.provider.observe_success()
+            await self.queue.put(_END)
+        except asyncio.CancelledError:
+            if not self.first_token:
+                # 헤지에서 진 쪽: 첫 토큰이 최소 이만큼 늦었다는 뜻이므로 지금 평균보다 크면 반영한다
+                elapsed_ms = (time.perf_counter() - self.started) * 1000
+                if self.provider.latency_ms is None or elapsed_ms > self.provider.latency_ms:
+                    self.provider.observe_latency(elapsed_ms)
+            raise
+        except Exception as e:
+            if is_failover_error(e):
+                self.provider.observe_failure()
+            await self.queue.put(e)
+        finally:
+            self.provider.inflight -= 1
+
+    def cancel(self):
+        self.task.cancel()
+
+
+class ProviderRouter:
+    """
+    여러 LLM 프로바이더/모델 중 가장 빠른 정상 프로바이더로 보내는 라우터
+
+    정상(쉬는 중이 아니고 오류율이 기준 미만)인 프로바이더를 첫 토큰 지연 EWMA가 짧은 순으로 시도하고,
+    아직 측정값이 없는 프로바이더는 한 번 먼저 시험해 본다. 첫 토큰이 오기 전에 연결 실패/시간 초과/5xx가
+    나면 같은 요청을 다음 프로바이더로 넘긴다(정상 프로바이더가 모두 실패하면 쉬는 중인 곳도 마지막으로
+    시도). 첫 토큰 이후의 오류는 이미 보낸 내용과 겹치므로 넘기지 않고 그대로 올린다.
+
+    헤지를 켜면 짧은 대화형 프롬프트는 첫 프로바이더가 LLM_HEDGE_DELAY_MS 안에 첫 토큰을 주지 않을 때
+    두 번째 프로바이더에도 보내고, 먼저 첫 토큰을 준 쪽을 쓰고 다른 쪽은 취소한다. 헤지 호출도
+    프로바이더 동시 호출과 토큰을 쓰므로 hedge_slot으로 스케줄러의 허가를 받고(여유가 없으면 헤지하지
+    않음), 승자가 정해져 진 쪽을 취소하면 반납한다.
+    """
+
+    def __init__(self, providers: List[Provider]):
+        self.providers = providers
+        self.stats = {"failovers": 0, "hedged": 0, "hedge_wins": 0, "hedge_skipped": 0}
+
+    def ranked(self) -> List[Provider]:
+        """시도 순서 (정상 → 최근 실패 없는 쪽 먼저, 지연 짧은 순, 그다음 쉬는 중인 프로바이더)"""
+        healthy = sorted((p for p in self.providers if p.healthy),
+                         key=lambda p: (p.consecutive_failures > 0, p.latency_ms or 0.0))
+        resting = sorted((p for p in self.providers if not p.healthy), key=lambda p: (p.open_until, p.error_rate))
+        return healthy + resting
+
+    def should_hedge(self, prompt_tokens: Optional[int]) -> bool:
+        return (LLM_HEDGE_ENABLED and prompt_tokens is not None
+                and prompt_tokens <= LLM_HEDGE_MAX_PROMPT_TOKENS
+                and sum(1 for p in self.providers if p.healthy) >= 2)
+
+    async def _select(self, messages: List, hedge: bool,
+                      hedge_slot: Optional[HedgeSlot] = None) -> Tuple[_Attempt, List]:
+        """첫 토큰을 가장 먼저 준 호출 → (호출, 첫 토큰까지의 조각들)"""
+        remaining = self.ranked()
+        if not remaining:
+            raise NoProviderAvailable("설정된 LLM 프로바이더가 없습니다")
+        racing: Dict[asyncio.Task, _Attempt] = {}
+        last_error: Optional[BaseException] = None
+        winner: Optional[_Attempt] = None
+        hedged: Optional[_Attempt] = None
+        release_hedge: Optional[Callable[[], None]] = None
+
+        def launch() -> _Attempt:
+            attempt = _Attempt(remaining.pop(0), messages)
+            racing[asyncio.create_task(attempt.queue.get())] = attempt
+            return attempt
+
+        loop = asyncio.get_running_loop()
+        launch()
+        hedge_at = loop.time() + LLM_HEDGE_DELAY_MS / 1000 if hedge and remaining else None
+        try:
+            while racing:
+                timeout = max(0.0, hedge_at - loop.time()) if hedge_at is not None else None
+                done, _ = await asyncio.wait(set(racing), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedge_at = None
+                    release_hedge = hedge_slot() if hedge_slot is not None else (lambda: None)
+                    if release_hedge is None:
+                        self.stats["hedge_skipped"] += 1
+                        continue
+                    self.stats["hedged"] += 1
+                    hedged = launch()
+                    continue
+                for getter in done:
+                    attempt = racing.pop(getter)
+                    item = getter.result()
+                    if isinstance(item, BaseException):
+                        if not is_failover_error(item):
+                            raise item
+                        last_error = item
+                        logger.warning(f"⚠️ LLM 프로바이더 {attempt.provider.name} 실패: {item!r}")
+                        # 헤지 뒤에는 두 곳, 아니면 한 곳이 계속 시도 중이도록 다음 프로바이더로 넘긴다
+                        if remaining and len(racing) < (2 if hedged else 1):
+                            self.stats["failovers"] += 1
+                            replacement = launch()
+                            if attempt is hedged:
+                                hedged = replacement
+                        continue
+                    winner = attempt
+                    if attempt is hedged:
+                        self.stats["hedge_wins"] += 1
+                    return attempt, item
+            raise last_error
+        finally:
+            for getter, attempt in racing.items():
+                getter.cancel()
+                if attempt is not winner:
+                    attempt.cancel()
+            if release_hedge is not None:
+                release_hedge()
+
+    async def astream(self, messages: List, prompt_tokens: Optional[int] = None,
+                      hedge_slot: Optional[HedgeSlot] = None) -> AsyncIterator[Tuple[Any, Provider]]:
+        """스트리밍 호출 → (응답 조각, 응답한 프로바이더)
+
+        prompt_tokens를 주면 짧은 프롬프트일 때 헤지할 수 있다 (대화형 요청만 넘긴다).
+        """
+        attempt, first = await self._select(messages, self.should_hedge(prompt_tokens), hedge_slot)
+        try:
+            for chunk in first:
+                yield chunk, attempt.provider
+            while True:
+                item = await attempt.queue.get()
+                if item is _END:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item, attempt.provider
+        finally:
+            attempt.cancel()
+
+    async def ainvoke(self, messages: List, prompt_tokens: Optional[int] = None) -> Tuple[Any, Provider]:
+        """단발 호출 → (전체 응답 메시지, 응답한 프로바이더)"""
+        result = None
+        provider = None
+        async for chunk, provider in self.astream(messages, prompt_tokens):
+            result = chunk if result is None else result + chunk
+        return result, provider
+
+    def metrics(self) -> Dict:
+        return {**self.stats, "providers": [provider.status() for provider in self.providers]}
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from ....common.embedding import embedder, normalize_text
+from ....common.embedding_service import embedding_service
+
+logger = logging.getLogger("chatbot_service")
+
+# 응답 캐시 설정
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "10000"))
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600"))
+SEMANTIC_CACHE_TTL_SECONDS = int(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "1800"))
+# 의미 캐시는 문장 임베딩 모델(EMBEDDING_MODEL)이 있을 때만 켠다 (해싱 임베딩은 정확 일치만)
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true" and embedder.semantic
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+SEMANTIC_CACHE_MAX_PER_SCOPE = int(os.getenv("SEMANTIC_CACHE_MAX_PER_SCOPE", "500"))
+
+
+@dataclass
+class CachedResponse:
+    response: str
+    tokens_used: int
+    expires_at: float
+
+
+class _SemanticScope:
+    """한 테넌트 + 컨텍스트 범위의 질문 임베딩 행렬"""
+
+    def __init__(self, dim: int):
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.keys: list = []
+        self.expires_at: list = []
+
+    def add(self, vector: np.ndarray, key: str, expires_at: float):
+        if len(self.keys) >= SEMANTIC_CACHE_MAX_PER_SCOPE:
+            # 가장 오래된 항목부터 제거
+            self.vectors, self.keys, self.expires_at = self.vectors[1:], self.keys[1:], self.expires_at[1:]
+        self.vectors = np.vstack([self.vectors, vector[None, :]])
+        self.keys.append(key)
+        self.expires_at.append(expires_at)
+
+    def nearest(self, vector: np.ndarray, now: float) -> Tuple[Optional[str], float]:
+        if not self.keys:
+            return None, 0.0
+        scores = self.vectors @ vector
+        scores[np.asarray(self.expires_at) <= now] = -1.0
+        index = int(np.argmax(scores))
+        return self.keys[index], float(scores[index])
+
+
+class ResponseCache:
+    """
+    챗봇 응답 2단계 캐시
+
+    1단계는 정규화한 메시지 + 컨텍스트 해시를 키로 하는 LRU(정확히 같은 질문),
+    2단계는 질문 임베딩의 코사인 유사도가 임계값 이상인 기존 질문(거의 같은 질문)이다.
+    2단계는 문장 임베딩 모델이 설정된 경우에만 쓴다. 문자 n-gram 해싱 임베딩은 "매출이 늘었는데"와
+    "줄었는데", "2023년"과 "2024년"처럼 뜻이 다른 질문을 더 가깝게 보기 때문이다.
+    키와 의미 검색 범위 모두 테넌트(회사, 없으면 사용자)로 나눠 다른 회사의 답변이
+    섞이지 않게 하고, 항목마다 TTL을 둔다.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+                 ttl_seconds: int = RESPONSE_CACHE_TTL_SECONDS,
+                 semantic_ttl_seconds: int = SEMANTIC_CACHE_TTL_SECONDS,
+                 semantic_threshold: float = SEMANTIC_CACHE_THRESHOLD,
+                 semantic_enabled: bool = SEMANTIC_CACHE_ENABLED):
+        self.max_entries = max_entries
+        self.semantic_enabled = semantic_enabled
+        self.ttl_seconds = ttl_seconds
+        self.semantic_ttl_seconds = semantic_ttl_seconds
+        self.semantic_threshold = semantic_threshold
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._scopes: Dict[str, _SemanticScope] = {}
+        self.stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "stores": 0}
+
+    @staticmethod
+    def _scope(tenant: Optional[str], context: Optional[Dict]) -> str:
+        context_hash = hashlib.sha1(
+            json.dumps(context or {}, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        ).hexdigest()[:16]
+        return f"{tenant or 'anonymous'}:{context_hash}"
+
+    @staticmethod
+    def _key(scope: str, normalized: str) -> str:
+        return f"{scope}:{hashlib.sha1(normalized.encode('utf-8')).hexdigest()}"
+
+    def _get_entry(self, key: str, now: float) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def get(self, message: str, context: Optional[Dict] = None,
+                  tenant: Optional[str] = None) -> Tuple[Optional[CachedResponse], Optional[str]]:
+        """캐시 조회 → (응답, "exact" | "semantic" | None)"""
+        now = time.monotonic()
+        normalized = normalize_text(message)
+        if not normalized:
+            return None, None
+        scope = self._scope(tenant, context)
+
+        entry = self._get_entry(self._key(scope, normalized), now)
+        if entry is not None:
+            self.stats["exact_hits"] += 1
+            return entry, "exact"
+
+        semantic_scope = self._scopes.get(scope) if self.semantic_enabled else None
+        if semantic_scope is not None:
+            key, score = semantic_scope.nearest(await embedding_service.embed_one(normalized), now)
+            if key is not None and score >= self.semantic_threshold:
+                entry = self._get_entry(key, now)
+                if entry is not None:
+                    self.stats["semantic_hits"] += 1
+                    logger.info(f"🧠 의미 캐시 적중 (유사도 {score:.3f})")
+                    return entry, "semantic"
+
+        self.stats["misses"] += 1
+        return None, None
+
+    async def put(self, message: str, response: str, tokens_used: int = 0,
+                  context: Optional[Dict] = None, tenant: Optional[str] = None):
+        """성공한 응답 저장"""
+        normalized = normalize_text(message)
+        if not normalized:
+            return
+        now = time.monotonic()
+        scope = self._scope(tenant, context)
+        key = self._key(scope, normalized)
+
+        self._entries[key] = CachedResponse(response, tokens_used, now + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self.stats["stores"] += 1
+        if not self.semantic_enabled:
+            return
+
+        semantic_scope = self._scopes.get(scope)
+        if semantic_scope is None:
+            semantic_scope = self._scopes[scope] = _SemanticScope(embedder.dim)
+        # 조회 때 계산한 질문 벡터가 임베딩 캐시에 있으므로 다시 계산하지 않는다
+        semantic_scope.add(await embedding_service.embed_one(normalized), key, now + self.semantic_ttl_seconds)
+        if self.stats["stores"] % 1000 == 0:
+            self._purge_scopes(now)
+
+    def _purge_scopes(self, now: float):
+        """모든 항목이 만료된 범위 제거"""
+        expired = [scope for scope, entries in self._scopes.items() if max(entries.expires_at, default=0) <= now]
+        for scope in expired:
+            del self._scopes[scope]
+
+    def metrics(self) -> Dict:
+        lookups = self.stats["exact_hits"] + self.stats["semantic_hits"] + self.stats["misses"]
+        hits = self.stats["exact_hits"] + self.stats["semantic_hits"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "scopes": len(self._scopes),
+            "semantic_enabled": self.semantic_enabled,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,56 @@
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger("chatbot_service")
+
+# 최근 값에 가중치를 두는 이동 평균 계수
+_EWMA_ALPHA = 0.2
+
+
+class StreamMetrics:
+    """
+    스트리밍 응답 지표
+
+    첫 토큰까지의 시간(TTFT)과 초당 토큰 수를 응답별로 기록하고,
+    /health에서 볼 수 있도록 누적 횟수와 이동 평균을 유지한다.
+    """
+
+    def __init__(self):
+        self.streams = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.tokens = 0
+        self.ttft_ms_avg: Optional[float] = None
+        self.tokens_per_second_avg: Optional[float] = None
+
+    @staticmethod
+    def _ewma(current: Optional[float], value: float) -> float:
+        return value if current is None else current + _EWMA_ALPHA * (value - current)
+
+    def started(self):
+        self.streams += 1
+
+    def finished(self, ttft_ms: Optional[float], tokens: int, tokens_per_second: float):
+        self.completed += 1
+        self.tokens += tokens
+        if ttft_ms is not None:
+            self.ttft_ms_avg = self._ewma(self.ttft_ms_avg, ttft_ms)
+        if tokens:
+            self.tokens_per_second_avg = self._ewma(self.tokens_per_second_avg, tokens_per_second)
+
+    def stats(self) -> Dict:
+        return {
+            "streams": self.streams,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "tokens": self.tokens,
+            "ttft_ms_avg": round(self.ttft_ms_avg, 2) if self.ttft_ms_avg is not None else None,
+            "tokens_per_second_avg": (
+                round(self.tokens_per_second_avg, 2) if self.tokens_per_second_avg is not None else None
+            ),
+        }
+
+
+stream_metrics = StreamMetrics()
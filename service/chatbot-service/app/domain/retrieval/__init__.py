@@ -0,0 +1,9 @@
+from .controller.retrieval_controller import RetrievalController
+from .service.retrieval_service import RetrievalService, retrieval_service
+from .repository.vector_store import VectorStore
+from .model.retrieval_model import (
+    DocumentIngestRequest,
+    DocumentIngestResponse,
+    RetrievedChunk,
+    RetrievalSearchResponse
+)
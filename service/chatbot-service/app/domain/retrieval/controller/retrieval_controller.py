@@ -0,0 +1,40 @@
+from fastapi import HTTPException
+from typing import Optional
+import logging
+
+from ..service.retrieval_service import RetrievalService
+from ..model.retrieval_model import DocumentIngestRequest, DocumentIngestResponse, RetrievalSearchResponse
+
+logger = logging.getLogger("chatbot_service")
+
+class RetrievalController:
+    def __init__(self, retrieval_service: RetrievalService):
+        self.retrieval_service = retrieval_service
+    
+    async def ingest_document(self, request: DocumentIngestRequest,
+                              tenant: Optional[str] = None) -> DocumentIngestResponse:
+        """회사 진단 자료 등 검색 문서를 등록합니다 (테넌트 전용)."""
+        if not tenant:
+            raise HTTPException(status_code=400, detail="회사 또는 사용자 정보가 필요합니다")
+        if not request.text.strip():
+            raise HTTPException(status_code=400, detail="문서 내용이 비어 있습니다")
+        try:
+            chunks = await self.retrieval_service.ingest(request.source, request.text, request.title, tenant)
+            return DocumentIngestResponse(
+                source=request.source,
+                chunks=chunks,
+                total_chunks=self.retrieval_service.store.active_count
+            )
+        except RuntimeError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        except Exception as e:
+            logger.error(f"❌ 문서 등록 오류: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"문서 등록 중 오류가 발생했습니다: {str(e)}"
+            )
+    
+    async def search(self, query: str, tenant: Optional[str] = None, k: Optional[int] = None) -> RetrievalSearchResponse:
+        """질문과 가까운 문서 청크를 조회합니다."""
+        results = await self.retrieval_service.search(query, tenant, k)
+        return RetrievalSearchResponse(query=query, results=results)
@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class DocumentIngestRequest(BaseModel):
+    """검색 문서 등록 요청 모델 (회사 진단 자료 등)"""
+    source: str
+    text: str
+    title: Optional[str] = None
+
+class DocumentIngestResponse(BaseModel):
+    """검색 문서 등록 응답 모델"""
+    source: str
+    chunks: int
+    total_chunks: int
+
+class RetrievedChunk(BaseModel):
+    """검색 결과 청크"""
+    title: str
+    text: str
+    source: str
+    score: float
+
+class RetrievalSearchResponse(BaseModel):
+    """검색 응답 모델"""
+    query: str
+    results: List[RetrievedChunk]
@@ -0,0 +1,246 @@
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("chatbot_service")
+
+# 한 번에 내적할 행 수 (메모리 사용량과 BLAS 효율의 절충)
+SEARCH_BLOCK_ROWS = int(os.getenv("VECTOR_SEARCH_BLOCK_ROWS", "65536"))
+
+# 테넌트 코드 0은 모든 테넌트가 검색하는 공용 문서
+SHARED_TENANT = 0
+
+VECTORS_FILE = "vectors.f32"
+TENANTS_FILE = "tenants.i32"
+OFFSETS_FILE = "offsets.i64"
+CHUNKS_FILE = "chunks.jsonl"
+MANIFEST_FILE = "manifest.json"
+
+
+@dataclass
+class _Snapshot:
+    """검색 시점의 인덱스 상태 (추가가 일어나도 진행 중인 검색은 이 상태로 끝난다)"""
+    count: int
+    vectors: np.ndarray
+    tenants: np.ndarray
+    offsets: np.ndarray
+    active: np.ndarray
+
+
+class VectorStore:
+    """
+    디스크 기반 청크 벡터 저장소
+
+    벡터는 float32 행렬을 그대로 이어 붙인 파일을 np.memmap으로 열어 검색하므로
+    프로세스 메모리에 올리지 않고 OS 페이지 캐시를 공유한다. 청크 본문은 JSONL에 두고
+    바이트 오프셋으로 결과 행만 읽는다. 같은 출처(source)를 다시 넣으면 이전 행은
+    비활성 구간으로 표시만 하고(추가 전용), 검색에서 제외한다.
+    """
+
+    def __init__(self, directory: str, dim: int, embedder_name: str):
+        self.directory = Path(directory)
+        self.dim = dim
+        self.embedder_name = embedder_name
+        self._write_lock = threading.Lock()
+        self._manifest: Dict = {}
+        self._tenant_codes: Dict[str, int] = {}
+        self._snapshot = self._empty_snapshot()
+
+    def _path(self, name: str) -> Path:
+        return self.directory / name
+
+    def _empty_snapshot(self) -> _Snapshot:
+        return _Snapshot(
+            0,
+            np.zeros((0, self.dim), dtype=np.float32),
+            np.zeros(0, dtype=np.int32),
+            np.zeros(0, dtype=np.int64),
+            np.zeros(0, dtype=bool),
+        )
+
+    @property
+    def count(self) -> int:
+        return self._snapshot.count
+
+    @property
+    def active_count(self) -> int:
+        return int(self._snapshot.active.sum())
+
+    def open(self):
+        """저장소 열기 (임베딩 방식이나 차원이 바뀌었으면 비우고 새로 시작)"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        manifest_path = self._path(MANIFEST_FILE)
+        manifest = None
+        if manifest_path.exists():
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("dim") != self.dim or manifest.get("embedder") != self.embedder_name:
+                logger.warning(
+                    f"⚠️ 벡터 인덱스 임베딩 방식 변경 ({manifest.get('embedder')} → {self.embedder_name}), 인덱스를 다시 만듭니다"
+                )
+                manifest = None
+        if manifest is None:
+            for name in (VECTORS_FILE, TENANTS_FILE, OFFSETS_FILE, CHUNKS_FILE):
+                self._path(name).unlink(missing_ok=True)
+            manifest = {
+                "dim": self.dim, "embedder": self.embedder_name, "count": 0,
+                "tenants": ["*"], "sources": {}, "inactive": [],
+            }
+            self._write_manifest(manifest)
+        self._manifest = manifest
+        self._tenant_codes = {tenant: code for code, tenant in enumerate(manifest["tenants"])}
+        self._remap()
+
+    def _write_manifest(self, manifest: Dict):
+        # 임시 파일에 쓴 뒤 교체 (중간에 죽어도 이전 manifest가 남는다)
+        tmp_path = self._path(MANIFEST_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(MANIFEST_FILE))
+
+    def _remap(self):
+        count = self._manifest["count"]
+        if count == 0:
+            self._snapshot = self._empty_snapshot()
+            return
+        # manifest의 count까지만 유효 (기록 도중 중단된 꼬리는 무시)
+        vectors = np.memmap(self._path(VECTORS_FILE), dtype=np.float32, mode="r", shape=(count, self.dim))
+        tenants = np.fromfile(self._path(TENANTS_FILE), dtype=np.int32, count=count)
+        offsets = np.fromfile(self._path(OFFSETS_FILE), dtype=np.int64, count=count)
+        active = np.ones(count, dtype=bool)
+        for start, end in self._manifest["inactive"]:
+            active[start:end] = False
+        self._snapshot = _Snapshot(count, vectors, tenants, offsets, active)
+
+    def source_hash(self, source: str) -> Optional[str]:
+        entry = self._manifest.get("sources", {}).get(source)
+        return entry["sha"] if entry else None
+
+    def _truncate_to_manifest(self, count: int):
+        """이전 기록이 중단돼 manifest보다 길어진 파일 꼬리 제거"""
+        for name, row_bytes in ((VECTORS_FILE, self.dim * 4), (TENANTS_FILE, 4), (OFFSETS_FILE, 8)):
+            path = self._path(name)
+            if path.exists() and path.stat().st_size > count * row_bytes:
+                with open(path, "r+b") as f:
+                    f.truncate(count * row_bytes)
+        chunks_path = self._path(CHUNKS_FILE)
+        if chunks_path.exists():
+            end = 0
+            if count:
+                with open(chunks_path, "rb") as f:
+                    f.seek(int(self._snapshot.offsets[count - 1]))
+                    end = f.tell() + len(f.readline())
+            if chunks_path.stat().st_size > end:
+                with open(chunks_path, "r+b") as f:
+                    f.truncate(end)
+
+    def append(self, source: str, sha: str, vectors: np.ndarray, chunks: Sequence[Dict],
+               tenant: Optional[str] = None):
+        """출처 하나의 청크 추가 (같은 출처의 이전 청크는 비활성화)"""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.shape != (len(chunks), self.dim):
+            raise ValueError(f"벡터 shape 불일치: {vectors.shape}, 청크 {len(chunks)}개")
+        with self._write_lock:
+            manifest = self._manifest
+            start = manifest["count"]
+            self._truncate_to_manifest(start)
+
+            if tenant is None:
+                code = SHARED_TENANT
+            else:
+                code = self._tenant_codes.get(tenant)
+                if code is None:
+                    code = self._tenant_codes[tenant] = len(manifest["tenants"])
+                    manifest["tenants"].append(tenant)
+
+            chunks_path = self._path(CHUNKS_FILE)
+            offsets = np.zeros(len(chunks), dtype=np.int64)
+            with open(chunks_path, "ab") as f:
+                for i, chunk in enumerate(chunks):
+                    offsets[i] = f.tell()
+                    f.write(json.dumps({**chunk, "source": source}, ensure_ascii=False).encode("utf-8") + b"\n")
+            with open(self._path(VECTORS_FILE), "ab") as f:
+                f.write(vectors.tobytes())
+            with open(self._path(TENANTS_FILE), "ab") as f:
+                f.write(np.full(len(chunks), code, dtype=np.int32).tobytes())
+            with open(self._path(OFFSETS_FILE), "ab") as f:
+                f.write(offsets.tobytes())
+
+            previous = manifest["sources"].get(source)
+            if previous and previous["end"] > previous["start"]:
+                manifest["inactive"].append([previous["start"], previous["end"]])
+            manifest["sources"][source] = {"sha": sha, "start": start, "end": start + len(chunks)}
+            manifest["count"] = start + len(chunks)
+            self._write_manifest(manifest)
+            self._remap()
+
+    def search(self, queries: np.ndarray, k: int, tenant: Optional[str] = None) -> List[List[Tuple[int, float]]]:
+        """
+        전수 내적 검색 → 질의마다 [(행 번호, 점수)] 상위 k개
+
+        블록 단위로 (행 × 질의) 점수를 한 번의 행렬곱으로 구하고, 블록마다 argpartition으로
+        후보 k개만 남긴 뒤 마지막에 합쳐 정렬한다. 공용 문서와 해당 테넌트 문서만 대상이다.
+        """
+        snapshot = self._snapshot
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if snapshot.count == 0 or k <= 0:
+            return [[] for _ in range(len(queries))]
+        allowed = snapshot.active & (snapshot.tenants == SHARED_TENANT)
+        code = self._tenant_codes.get(tenant) if tenant else None
+        if code is not None:
+            allowed |= snapshot.active & (snapshot.tenants == code)
+
+        candidate_rows: List[np.ndarray] = []
+        candidate_scores: List[np.ndarray] = []
+        for start in range(0, snapshot.count, SEARCH_BLOCK_ROWS):
+            end = min(start + SEARCH_BLOCK_ROWS, snapshot.count)
+            block_allowed = allowed[start:end]
+            if not block_allowed.any():
+                continue
+            scores = queries @ snapshot.vectors[start:end].T
+            scores[:, ~block_allowed] = -np.inf
+            if scores.shape[1] > k:
+                top = np.argpartition(scores, -k, axis=1)[:, -k:]
+            else:
+                top = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+            candidate_rows.append(top + start)
+            candidate_scores.append(np.take_along_axis(scores, top, axis=1))
+
+        if not candidate_rows:
+            return [[] for _ in range(len(queries))]
+        rows = np.concatenate(candidate_rows, axis=1)
+        scores = np.concatenate(candidate_scores, axis=1)
+        order = np.argsort(-scores, axis=1)[:, :k]
+        results = []
+        for query_index in range(len(queries)):
+            results.append([
+                (int(rows[query_index, i]), float(scores[query_index, i]))
+                for i in order[query_index] if np.isfinite(scores[query_index, i])
+            ])
+        return results
+
+    def get_chunks(self, rows: Sequence[int]) -> List[Dict]:
+        """행 번호 → 청크 (JSONL에서 해당 줄만 읽는다)"""
+        offsets = self._snapshot.offsets
+        chunks = []
+        with open(self._path(CHUNKS_FILE), "rb") as f:
+            for row in rows:
+                f.seek(int(offsets[row]))
+                chunks.append(json.loads(f.readline()))
+        return chunks
+
+    def stats(self) -> Dict:
+        return {
+            "chunks": self.count,
+            "active_chunks": self.active_count,
+            "sources": len(self._manifest.get("sources", {})),
+            "tenants": len(self._manifest.get("tenants", [])) - 1,
+            "dim": self.dim,
+            "size_mb": round(self.count * self.dim * 4 / 1024 / 1024, 1),
+        }
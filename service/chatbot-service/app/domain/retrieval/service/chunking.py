@@ -0,0 +1,52 @@
+import os
+import re
+from typing import List
+
+# 청크 설정 (문자 수 기준)
+RETRIEVAL_CHUNK_CHARS = int(os.getenv("RETRIEVAL_CHUNK_CHARS", "500"))
+RETRIEVAL_CHUNK_OVERLAP = int(os.getenv("RETRIEVAL_CHUNK_OVERLAP", "80"))
+
+_PARAGRAPH = re.compile(r"\n\s*\n")
+_SENTENCE = re.compile(r"(?<=[.!?。])\s+|\n")
+
+
+def _split_long(paragraph: str, size: int, overlap: int) -> List[str]:
+    """한 문단이 size보다 길면 문장 단위로, 문장도 길면 글자 단위로 자른다"""
+    pieces: List[str] = []
+    current = ""
+    for sentence in filter(None, (s.strip() for s in _SENTENCE.split(paragraph))):
+        while len(sentence) > size:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:size])
+            sentence = sentence[size - overlap:]
+        if current and len(current) + 1 + len(sentence) > size:
+            pieces.append(current)
+            # 문맥이 끊기지 않도록 앞 조각의 끝부분을 겹쳐 둔다
+            current = current[-overlap:] + " " + sentence if overlap else sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_text(text: str, size: int = RETRIEVAL_CHUNK_CHARS, overlap: int = RETRIEVAL_CHUNK_OVERLAP) -> List[str]:
+    """문단 경계를 우선해 size 이하 청크로 나눈다"""
+    chunks: List[str] = []
+    current = ""
+    for paragraph in filter(None, (p.strip() for p in _PARAGRAPH.split(text))):
+        if len(paragraph) > size:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.extend(_split_long(paragraph, size, overlap))
+        elif current and len(current) + 2 + len(paragraph) > size:
+            chunks.append(current)
+            current = paragraph
+        else:
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,125 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ....common.embedding import embedder
+from ....common.embedding_service import embedding_service
+from ..repository.vector_store import VectorStore
+from .chunking import chunk_text
+
+logger = logging.getLogger("chatbot_service")
+
+# 검색 설정
+_DATA_DIR = Path(__file__).resolve().parents[3] / "data"
+RETRIEVAL_INDEX_DIR = os.getenv("RETRIEVAL_INDEX_DIR", str(_DATA_DIR / "index"))
+RETRIEVAL_DOCS_DIR = os.getenv("RETRIEVAL_DOCS_DIR", str(_DATA_DIR / "documents"))
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "3"))
+RETRIEVAL_MIN_SCORE = float(os.getenv("RETRIEVAL_MIN_SCORE", "0.3"))
+
+DOCUMENT_SUFFIXES = {".md", ".txt"}
+
+
+class RetrievalService:
+    """
+    진단 답변 근거 검색
+
+    방법론 문서(RETRIEVAL_DOCS_DIR, 공용)와 회사별로 올린 진단 자료(테넌트 전용)를 청크로 나눠
+    로컬 CPU 임베딩으로 벡터화하고 VectorStore에 쌓는다. 질문이 오면 공용 + 해당 테넌트 청크
+    중 유사도 상위 k개를 돌려준다. 임베딩은 embedding_service(마이크로 배치 + 캐시)를 거치고,
+    검색은 이벤트 루프를 막지 않도록 스레드에서 돈다.
+    """
+
+    def __init__(self, index_dir: str = RETRIEVAL_INDEX_DIR, docs_dir: str = RETRIEVAL_DOCS_DIR,
+                 top_k: int = RETRIEVAL_TOP_K, min_score: float = RETRIEVAL_MIN_SCORE):
+        self.store = VectorStore(index_dir, embedder.dim, embedder.name)
+        self.docs_dir = docs_dir
+        self.top_k = top_k
+        self.min_score = min_score
+        self._ingest_lock = asyncio.Lock()
+        self._ready = False
+        self.searches = 0
+        self.last_search_ms = 0.0
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready and self.store.active_count > 0
+
+    async def start(self):
+        """인덱스 열기 + 방법론 문서 반영 (바뀐 문서만 다시 임베딩)"""
+        try:
+            await asyncio.to_thread(self.store.open)
+            self._ready = True
+            await self.ingest_directory(self.docs_dir)
+            logger.info(f"✅ 검색 인덱스 준비 완료 ({self.store.active_count}개 청크)")
+        except Exception as e:
+            logger.error(f"❌ 검색 인덱스 준비 실패 (검색 없이 진행): {e}")
+
+    async def ingest_directory(self, directory: str) -> int:
+        path = Path(directory)
+        if not path.is_dir():
+            return 0
+        ingested = 0
+        for file_path in sorted(path.rglob("*")):
+            if file_path.suffix.lower() not in DOCUMENT_SUFFIXES:
+                continue
+            text = file_path.read_text(encoding="utf-8")
+            ingested += await self.ingest(
+                f"doc:{file_path.relative_to(path).as_posix()}", text, title=file_path.stem
+            )
+        return ingested
+
+    async def ingest(self, source: str, text: str, title: Optional[str] = None,
+                     tenant: Optional[str] = None) -> int:
+        """문서 하나 반영 → 새로 추가한 청크 수 (내용이 같으면 0)"""
+        if not self._ready:
+            raise RuntimeError("검색 인덱스가 준비되지 않았습니다")
+        # 테넌트 문서는 출처 이름이 겹쳐도 서로 덮어쓰지 않게 테넌트로 구분
+        key = f"{tenant}:{source}" if tenant else source
+        sha = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        async with self._ingest_lock:
+            if self.store.source_hash(key) == sha:
+                return 0
+            pieces = chunk_text(text)
+            vectors = await embedding_service.embed(pieces)
+            chunks = [{"title": title or source, "text": piece, "position": i} for i, piece in enumerate(pieces)]
+            await asyncio.to_thread(self.store.append, key, sha, vectors, chunks, tenant)
+        logger.info(f"📚 문서 반영: {key} ({len(pieces)}개 청크)")
+        return len(pieces)
+
+    def _search(self, vector: np.ndarray, tenant: Optional[str], k: int) -> List[Dict]:
+        hits = self.store.search(vector, k, tenant)[0]
+        hits = [(row, score) for row, score in hits if score >= self.min_score]
+        chunks = self.store.get_chunks([row for row, _ in hits])
+        return [
+            {"title": chunk["title"], "text": chunk["text"], "source": chunk["source"], "score": round(score, 4)}
+            for chunk, (_, score) in zip(chunks, hits)
+        ]
+
+    async def search(self, query: str, tenant: Optional[str] = None, k: Optional[int] = None) -> List[Dict]:
+        """질문과 가까운 청크 상위 k개 (공용 + 테넌트 문서)"""
+        if not self.is_ready:
+            return []
+        started = time.perf_counter()
+        vector = await embedding_service.embed_one(query)
+        results = await asyncio.to_thread(self._search, vector, tenant, k or self.top_k)
+        self.last_search_ms = (time.perf_counter() - started) * 1000
+        self.searches += 1
+        return results
+
+    def stats(self) -> Dict:
+        return {
+            **self.store.stats(),
+            "ready": self._ready,
+            "embedder": embedder.name,
+            "searches": self.searches,
+            "last_search_ms": round(self.last_search_ms, 2),
+        }
+
+
+retrieval_service = RetrievalService()
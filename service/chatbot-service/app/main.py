@@ -1,5 +1,6 @@
 import os
 import logging
+from contextlib import asynccontextmanager
 import json
 import time
 from datetime import datetime
@@ -22,12 +23,151 @@ logging.basicConfig(
 )
 logger = logging.getLogger("chatbot_service")
 
+from .common.database import database
+from .domain.discovery.repository.chat_history_writer import chat_history_writer
+from .domain.discovery.repository.session_list_cache import session_list_cache
+from .domain.discovery.repository.message_partitions import message_partitions
+from .domain.discovery.service.context_window import context_window
+from .domain.discovery.service.intent_matcher import intent_matcher
+from .domain.retrieval.service.retrieval_service import retrieval_service
+from .common.embedding_service import embedding_service
+from .domain.discovery.service.llm_scheduler import llm_scheduler
+from .domain.discovery.repository.usage_meter import usage_meter
+from .common.snowflake import snowflake
+from .domain.diagnosis.service.job_service import job_service
+from .domain.discovery.service.llm_runtime import llm_runtime
+from .domain.discovery.service.cancellation_metrics import cancellation_metrics
+from .container import AppContainer
+
+async def create_chat_tables():
+    """대화 기록 테이블 생성"""
+    async with database.acquire() as conn:
+        # 세션/메시지 ID는 애플리케이션이 Snowflake 방식으로 발급한다 (common/snowflake.py)
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS chat_sessions (
+                id BIGINT PRIMARY KEY,
+                user_id BIGINT NOT NULL,
+                session_title VARCHAR(200),
+                is_active BOOLEAN DEFAULT true,
+                message_count INTEGER NOT NULL DEFAULT 0,
+                last_message_preview VARCHAR(200),
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+            );
+        """)
+        # 목록에 보여 줄 메시지 수/마지막 메시지는 기록기가 세션 행에 함께 갱신한다 (기존 테이블 보강)
+        await conn.execute("""
+            ALTER TABLE chat_sessions
+            ADD COLUMN IF NOT EXISTS message_count INTEGER NOT NULL DEFAULT 0,
+            ADD COLUMN IF NOT EXISTS last_message_preview VARCHAR(200);
+        """)
+        # 메시지는 created_at 기준 월별 파티션 (기존 일반 테이블은 과거 구간 파티션으로 변환)
+        await message_partitions.create_table(conn)
+        # 세션 목록 keyset 페이지: (updated_at, id) 순서 그대로 읽고 다음 페이지는 마지막 행 다음부터
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_chat_sessions_user_updated_id
+            ON chat_sessions (user_id, updated_at DESC, id DESC)
+            WHERE is_active;
+        """)
+        await conn.execute("DROP INDEX IF EXISTS idx_chat_sessions_user_updated;")
+        # 시간 × 회사 × 사용자 × 모델 단위 LLM 사용량 (usage_meter가 주기적으로 누적)
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_usage (
+                bucket TIMESTAMP WITH TIME ZONE NOT NULL,
+                company_id VARCHAR(100) NOT NULL DEFAULT '',
+                user_id BIGINT NOT NULL DEFAULT 0,
+                model VARCHAR(100) NOT NULL,
+                requests BIGINT NOT NULL DEFAULT 0,
+                cached_requests BIGINT NOT NULL DEFAULT 0,
+                prompt_tokens BIGINT NOT NULL DEFAULT 0,
+                completion_tokens BIGINT NOT NULL DEFAULT 0,
+                PRIMARY KEY (bucket, company_id, user_id, model)
+            );
+        """)
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_llm_usage_company_bucket
+            ON llm_usage (company_id, bucket);
+        """)
+        # 장시간 진단 작업 (job_service가 lease를 잡고 실행, 재시작 후 이어서 실행)
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS diagnosis_jobs (
+                id BIGINT PRIMARY KEY,
+                company_id VARCHAR(100) NOT NULL DEFAULT '',
+                user_id BIGINT NOT NULL,
+                status VARCHAR(20) NOT NULL,
+                payload JSONB NOT NULL,
+                progress REAL NOT NULL DEFAULT 0,
+                step VARCHAR(200),
+                checkpoint JSONB NOT NULL DEFAULT '{}',
+                result JSONB,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_id BIGINT,
+                run_after TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+                lease_until TIMESTAMP WITH TIME ZONE,
+                created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+                started_at TIMESTAMP WITH TIME ZONE,
+                finished_at TIMESTAMP WITH TIME ZONE,
+                updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+            );
+        """)
+        # 가져갈 때마다 바뀌는 lease 펜싱 토큰 (기존 테이블 보강)
+        await conn.execute("ALTER TABLE diagnosis_jobs ADD COLUMN IF NOT EXISTS lease_id BIGINT")
+        # 워커가 가져갈 작업만 담는 부분 인덱스 (끝난 작업이 쌓여도 가져오기 비용이 그대로)
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_diagnosis_jobs_pending
+            ON diagnosis_jobs (run_after, id) WHERE status IN ('queued', 'running');
+        """)
+    logger.info("✅ 대화 기록 테이블 준비 완료")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 시작/종료 시 실행되는 함수"""
+    logger.info("🚀 Chatbot Service 시작")
+    
+    # 대화 기록용 커넥션 풀 (DB가 없으면 기록 없이 응답만 제공)
+    try:
+        await database.start()
+        if database.is_ready:
+            await create_chat_tables()
+    except Exception as e:
+        logger.error(f"❌ DB 준비 실패: {e}")
+        logger.info("⚠️ 서비스는 계속 진행됩니다 (대화 기록 비활성화)")
+    
+    if database.is_ready:
+        await chat_history_writer.start()
+        await message_partitions.start()
+    await context_window.start()
+    await intent_matcher.start()
+    await embedding_service.start()
+    await retrieval_service.start()
+    await usage_meter.start()
+    # LLM 클라이언트/템플릿과 요청 처리 객체는 여기서 한 번만 만든다
+    await llm_runtime.start()
+    app.state.container = AppContainer(llm_runtime)
+    await job_service.start(app.state.container.chatbot_service)
+    
+    yield
+    
+    await job_service.stop()
+    await llm_runtime.stop()
+    await usage_meter.stop()
+    await embedding_service.stop()
+    await intent_matcher.stop()
+    await context_window.stop()
+    if database.is_ready:
+        await message_partitions.stop()
+        await chat_history_writer.stop()
+    await database.stop()
+    logger.info("🛑 Chatbot Service 종료")
+
 # FastAPI 앱 생성
 app = FastAPI(
     title="Chatbot Service",
     description="LangChain을 사용한 AI 채팅 서비스",
     version="1.0.0",
-    docs_url="/docs"
+    docs_url="/docs",
+    lifespan=lifespan,
 )
 
 # CORS 설정
@@ -48,9 +188,15 @@ security = HTTPBearer()
 
 # Router import
 from .router.chatbot_router import router as chatbot_router
+from .router.retrieval_router import router as retrieval_router
+from .router.diagnosis_router import router as diagnosis_router
+from .domain.discovery.service.stream_metrics import stream_metrics
+from .domain.discovery.service.response_cache import response_cache
 
 # Router 등록
 app.include_router(chatbot_router)
+app.include_router(retrieval_router)
+app.include_router(diagnosis_router)
 
 # ===== 기본 엔드포인트들 =====
 
@@ -65,6 +211,8 @@ async def root():
             "docs": "/docs",
             "health": "/health",
             "send_message": "/api/v1/chat/send",
+            "stream_message": "/api/v1/chat/stream",
+            "documents": "/api/v1/chat/documents",
             "sessions": "/api/v1/chat/sessions"
         }
     }
@@ -72,21 +220,35 @@ async def root():
 @app.get("/health", include_in_schema=False)
 async def health_check():
     """헬스 체크"""
-    openai_status = "configured" if os.getenv("OPENAI_API_KEY") else "dummy_mode"
-    database_status = "configured" if os.getenv("DATABASE_URL") else "not_configured"
-    
+    openai_status = "configured" if llm_runtime.enabled else "dummy_mode"
     return {
         "status": "healthy",
         "service": "Chatbot Service",
         "version": "1.0.0",
         "openai": openai_status,
-        "database": database_status,
+        "database": database.status(),
         "features": {
             "langchain": True,
             "chat_responses": True,
             "dummy_responses": True,
-            "enterprise_diagnosis": True
-        }
+            "enterprise_diagnosis": True,
+            "streaming": True
+        },
+        "streaming": stream_metrics.stats(),
+        "cancellations": cancellation_metrics.metrics(),
+        "response_cache": response_cache.metrics(),
+        "chat_history": chat_history_writer.stats(),
+        "session_list_cache": session_list_cache.metrics(),
+        "chat_partitions": message_partitions.stats(),
+        "context_window": context_window.metrics(),
+        "intents": intent_matcher.stats(),
+        "retrieval": retrieval_service.stats(),
+        "embedding": embedding_service.metrics(),
+        "llm_scheduler": llm_scheduler.metrics(),
+        "llm_providers": llm_runtime.metrics(),
+        "usage": usage_meter.stats(),
+        "ids": snowflake.stats(),
+        "jobs": job_service.metrics()
     }
 
 # 로컬 실행용
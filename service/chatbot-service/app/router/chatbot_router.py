@@ -1,58 +1,134 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import os
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import List, Dict, Any
+from typing import Awaitable, List, Dict, Any, Optional
 
 from ..domain.discovery.controller.chatbot_controller import ChatbotController
-from ..domain.discovery.service.chatbot_service import ChatbotService
-from ..domain.discovery.repository.chatbot_repository import ChatbotRepository
+from ..domain.discovery.service.chatbot_service import SESSION_PAGE_SIZE, SESSION_PAGE_MAX
 from ..domain.discovery.model.chatbot_model import (
     ChatMessageRequest, 
     LangChainResponse, 
-    ChatSessionResponse
+    ChatSessionListResponse,
+    UsageResponse
 )
 
 router = APIRouter(prefix="/api/v1/chat", tags=["chatbot"])
 
-# JWT Bearer 토큰 스키마
-security = HTTPBearer()
+# 응답 생성 중 클라이언트 연결 종료를 확인하는 간격
+DISCONNECT_POLL_SECONDS = float(os.getenv("DISCONNECT_POLL_SECONDS", "0.25"))
+# 클라이언트가 먼저 연결을 끊은 요청 (nginx 관례)
+CLIENT_CLOSED_REQUEST = 499
+# 회사 전체/다른 사용자 사용량을 조회할 수 있는 역할 (게이트웨이가 토큰에서 채운 x-user-role)
+USAGE_ADMIN_ROLE = "admin"
 
-# 의존성 주입
-def get_chatbot_service() -> ChatbotService:
-    """ChatbotService 의존성 주입"""
-    repository = ChatbotRepository()
-    return ChatbotService(repository)
+# JWT Bearer 토큰 스키마 (헤더 존재만 확인하므로 인증은 게이트웨이가 채운 x-user-id로 한다)
+security = HTTPBearer()
 
-def get_chatbot_controller() -> ChatbotController:
+# 의존성 주입 (lifespan에서 만든 앱 단위 객체를 그대로 사용)
+def get_chatbot_controller(request: Request) -> ChatbotController:
     """ChatbotController 의존성 주입"""
-    service = get_chatbot_service()
-    return ChatbotController(service)
+    return request.app.state.container.chatbot_controller
+
+def get_tenant(request: Request) -> Optional[str]:
+    """캐시 격리 단위 (게이트웨이가 토큰에서 채운 회사/사용자 헤더)"""
+    company_id = request.headers.get("x-company-id")
+    if company_id:
+        return f"company:{company_id}"
+    user_id = request.headers.get("x-user-id")
+    return f"user:{user_id}" if user_id else None
+
+def get_user_id(request: Request) -> int:
+    """게이트웨이가 토큰에서 채운 사용자 ID (없으면 401, 세션 소유 확인의 기준이므로 기본값을 두지 않는다)"""
+    user_id = request.headers.get("x-user-id")
+    if not user_id or not user_id.isdigit():
+        raise HTTPException(status_code=401, detail="인증이 필요합니다")
+    return int(user_id)
+
+async def until_disconnected(request: Request, work: Awaitable):
+    """클라이언트가 연결을 끊으면 처리 중인 작업(LLM 호출 포함)을 취소하고 499로 끝낸다."""
+    task = asyncio.ensure_future(work)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                return Response(status_code=CLIENT_CLOSED_REQUEST)
+    finally:
+        task.cancel()
 
 @router.post("/send", response_model=LangChainResponse, summary="메시지 전송")
 async def send_message(
     message_request: ChatMessageRequest,
+    request: Request,
     controller: ChatbotController = Depends(get_chatbot_controller)
     # credentials: HTTPAuthorizationCredentials = Depends(security)  # 임시 비활성화
 ):
-    """AI 채팅봇에게 메시지를 전송하고 응답을 받습니다."""
-    return await controller.send_message(message_request)
+    """AI 채팅봇에게 메시지를 전송하고 응답을 받습니다. (응답 전에 연결이 끊기면 생성을 중단합니다)"""
+    user_id = get_user_id(request)
+    return await until_disconnected(
+        request, controller.send_message(message_request, get_tenant(request), user_id)
+    )
+
+@router.post("/stream", summary="메시지 전송 (스트리밍)")
+async def stream_message(
+    message_request: ChatMessageRequest,
+    request: Request,
+    controller: ChatbotController = Depends(get_chatbot_controller)
+):
+    """AI 응답을 생성되는 대로 server-sent events로 전송합니다.
+    
+    이벤트: start(session_id, message_id) → token(content)* → done(ttft_ms, tokens_per_second, ...) 또는 error
+    """
+    events = await controller.stream_message(message_request, get_tenant(request), get_user_id(request))
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
-@router.get("/sessions", response_model=List[ChatSessionResponse], summary="채팅 세션 목록")
+@router.get("/sessions", response_model=ChatSessionListResponse, summary="채팅 세션 목록")
 async def get_chat_sessions(
-    controller: ChatbotController = Depends(get_chatbot_controller),
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    request: Request,
+    limit: int = Query(SESSION_PAGE_SIZE, ge=1, le=SESSION_PAGE_MAX),
+    cursor: Optional[str] = None,
+    controller: ChatbotController = Depends(get_chatbot_controller)
 ):
-    """사용자의 채팅 세션 목록을 조회합니다."""
-    # TODO: JWT에서 user_id 추출
-    user_id = 1
-    return await controller.get_chat_sessions(user_id)
+    """사용자의 채팅 세션 목록을 최근 활동 순으로 조회합니다. (다음 페이지는 응답의 next_cursor를 cursor로 전달)"""
+    return await controller.get_chat_sessions(get_user_id(request), limit, cursor)
 
 @router.delete("/sessions/{session_id}", summary="채팅 세션 삭제")
 async def delete_chat_session(
     session_id: int,
-    controller: ChatbotController = Depends(get_chatbot_controller),
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    request: Request,
+    controller: ChatbotController = Depends(get_chatbot_controller)
+):
+    """채팅 세션을 삭제합니다. (본인 세션만)"""
+    return await controller.delete_chat_session(session_id, get_user_id(request))
+
+@router.get("/usage", response_model=UsageResponse, summary="LLM 사용량 조회")
+async def get_usage(
+    request: Request,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    group_by: str = "model",
+    user_id: Optional[int] = None,
+    controller: ChatbotController = Depends(get_chatbot_controller)
 ):
-    """채팅 세션을 삭제합니다."""
-    # TODO: JWT에서 user_id 추출
-    user_id = 1
-    return await controller.delete_chat_session(session_id, user_id)
+    """LLM 토큰 사용량을 group_by(model, user, company, hour, day)별로 조회합니다.
+    
+    일반 사용자는 본인 사용량만 볼 수 있다. 회사 관리자(x-user-role=admin)는 회사 전체(user_id 생략)
+    또는 회사 안의 특정 사용자(user_id) 사용량을 볼 수 있다.
+    """
+    requester = get_user_id(request)
+    company_id = request.headers.get("x-company-id")
+    if request.headers.get("x-user-role") == USAGE_ADMIN_ROLE and company_id:
+        return await controller.get_usage(company_id, user_id, start, end, group_by)
+    if user_id is not None and user_id != requester:
+        raise HTTPException(status_code=403, detail="다른 사용자의 사용량은 관리자만 조회할 수 있습니다")
+    return await controller.get_usage(company_id, requester, start, end, group_by)
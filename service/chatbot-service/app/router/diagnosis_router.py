@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from ..domain.diagnosis.controller.diagnosis_controller import DiagnosisController
+from ..domain.diagnosis.model.diagnosis_model import (
+    DiagnosisJobRequest,
+    DiagnosisJobSubmitResponse,
+    DiagnosisJobResponse
+)
+from .chatbot_router import get_user_id
+
+# 게이트웨이가 /api/chatbot/* 를 /api/v1/chat/* 로 전달하므로 같은 prefix 사용
+router = APIRouter(prefix="/api/v1/chat", tags=["diagnosis"])
+
+def get_diagnosis_controller(request: Request) -> DiagnosisController:
+    """DiagnosisController 의존성 주입"""
+    return request.app.state.container.diagnosis_controller
+
+def get_company_id(request: Request) -> str:
+    """게이트웨이가 토큰에서 채운 회사 ID (없으면 '')"""
+    return request.headers.get("x-company-id") or ""
+
+def get_requester(request: Request) -> tuple:
+    """작업 소유 확인 기준 (회사 ID, 사용자 ID), 게이트웨이가 채운 사용자 ID가 없으면 401"""
+    return get_company_id(request), get_user_id(request)
+
+@router.post("/diagnosis", response_model=DiagnosisJobSubmitResponse, status_code=202, summary="종합 진단 요청")
+async def submit_diagnosis(
+    diagnosis_request: DiagnosisJobRequest,
+    requester: tuple = Depends(get_requester),
+    controller: DiagnosisController = Depends(get_diagnosis_controller)
+):
+    """기업 종합 진단 작업을 접수합니다. 결과는 /jobs/{job_id} 조회 또는 /jobs/{job_id}/events 구독으로 받습니다."""
+    return await controller.submit(diagnosis_request, *requester)
+
+@router.get("/jobs/{job_id}", response_model=DiagnosisJobResponse, summary="진단 작업 조회")
+async def get_job(
+    job_id: int,
+    requester: tuple = Depends(get_requester),
+    controller: DiagnosisController = Depends(get_diagnosis_controller)
+):
+    """진단 작업의 상태, 진행률, 결과를 조회합니다."""
+    return await controller.get_job(job_id, *requester)
+
+@router.get("/jobs/{job_id}/events", summary="진단 작업 진행 구독")
+async def stream_job(
+    job_id: int,
+    requester: tuple = Depends(get_requester),
+    controller: DiagnosisController = Depends(get_diagnosis_controller)
+):
+    """진단 작업 진행 상황을 server-sent events로 전송합니다.
+    
+    이벤트: progress(status, progress, step)* → done(result) 또는 error(error)
+    """
+    company_id, user_id = requester
+    # 없는 작업은 스트림을 열기 전에 404
+    await controller.get_job(job_id, company_id, user_id)
+    return StreamingResponse(
+        controller.stream_job(job_id, company_id, user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, Query, Request
+from typing import Optional
+
+from ..domain.retrieval.controller.retrieval_controller import RetrievalController
+from ..domain.retrieval.model.retrieval_model import (
+    DocumentIngestRequest,
+    DocumentIngestResponse,
+    RetrievalSearchResponse
+)
+from .chatbot_router import get_tenant
+
+# 게이트웨이가 /api/chatbot/* 를 /api/v1/chat/* 로 전달하므로 같은 prefix 사용
+router = APIRouter(prefix="/api/v1/chat", tags=["retrieval"])
+
+def get_retrieval_controller(request: Request) -> RetrievalController:
+    """RetrievalController 의존성 주입"""
+    return request.app.state.container.retrieval_controller
+
+@router.post("/documents", response_model=DocumentIngestResponse, summary="검색 문서 등록")
+async def ingest_document(
+    document: DocumentIngestRequest,
+    request: Request,
+    controller: RetrievalController = Depends(get_retrieval_controller)
+):
+    """회사 진단 자료 등 답변 근거로 쓸 문서를 등록합니다. 같은 source로 다시 올리면 교체됩니다."""
+    return await controller.ingest_document(document, get_tenant(request))
+
+@router.get("/documents/search", response_model=RetrievalSearchResponse, summary="문서 검색")
+async def search_documents(
+    request: Request,
+    q: str = Query(..., min_length=1),
+    k: Optional[int] = Query(None, ge=1, le=20),
+    controller: RetrievalController = Depends(get_retrieval_controller)
+):
+    """질문과 가까운 문서 청크를 조회합니다 (공용 방법론 문서 + 본인 회사 자료)."""
+    return await controller.search(q, get_tenant(request), k)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+ID 발급 처리량 벤치마크
+SnowflakeGenerator.next_id()의 초당 발급 수를 단일 루프와 asyncio 동시 작업에서 측정하고,
+발급된 ID가 겹치지 않으며 발급 순서대로 증가하는지 확인합니다. 여러 워커(복제본)가 같은 시간에
+발급한 ID가 서로 겹치지 않는지, 기존 방식(int(time.time()))이 얼마나 겹치는지도 함께 봅니다.
+
+    python benchmark_ids.py
+    python benchmark_ids.py --ids 2000000 --tasks 1000 --workers 8 --output ids.json
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from typing import Dict, List
+
+from app.common.snowflake import SnowflakeGenerator, MAX_WORKER_ID
+
+
+def rate(count: int, seconds: float) -> Dict:
+    return {"ids": count, "ids_per_second": round(count / seconds), "ns_per_id": round(seconds * 1e9 / count, 1)}
+
+
+def is_increasing(ids: List[int]) -> bool:
+    return all(a < b for a, b in zip(ids, ids[1:]))
+
+
+def single_loop(count: int) -> Dict:
+    generator = SnowflakeGenerator(worker_id=0)
+    started = time.perf_counter()
+    ids = [generator.next_id() for _ in range(count)]
+    elapsed = time.perf_counter() - started
+    return {
+        **rate(count, elapsed),
+        "unique": len(set(ids)) == count,
+        "increasing": is_increasing(ids),
+        "borrowed_ms": generator.borrowed_ms,
+    }
+
+
+async def concurrent_tasks(count: int, tasks: int) -> Dict:
+    """동시 작업들이 await 사이사이에 ID를 발급 (요청 처리 중 발급하는 상황)"""
+    generator = SnowflakeGenerator(worker_id=1)
+    issued: List[int] = []
+    per_task = count // tasks
+
+    async def worker():
+        for _ in range(per_task):
+            issued.append(generator.next_id())
+            await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(tasks)))
+    elapsed = time.perf_counter() - started
+    return {
+        **rate(len(issued), elapsed),
+        "tasks": tasks,
+        "unique": len(set(issued)) == len(issued),
+        "increasing_in_issue_order": is_increasing(issued),
+    }
+
+
+def multi_worker(count: int, workers: int) -> Dict:
+    """워커 ID가 다른 생성기들이 번갈아 발급해도 겹치지 않는지"""
+    generators = [SnowflakeGenerator(worker_id=worker) for worker in range(workers)]
+    ids = [generators[index % workers].next_id() for index in range(count)]
+    return {"workers": workers, "ids": count, "unique": len(set(ids)) == count}
+
+
+def baselines(count: int) -> Dict:
+    started = time.perf_counter()
+    for _ in range(count):
+        uuid.uuid4()
+    uuid_seconds = time.perf_counter() - started
+
+    # 기존 방식: 같은 초에 들어온 요청끼리 ID가 같다
+    legacy = [int(time.time()) for _ in range(min(count, 100_000))]
+    return {
+        "uuid4": rate(count, uuid_seconds),
+        "time_seconds_collisions": len(legacy) - len(set(legacy)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ID 발급 벤치마크")
+    parser.add_argument("--ids", type=int, default=1_000_000)
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=MAX_WORKER_ID + 1)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    results = {
+        "single_loop": single_loop(args.ids),
+        "asyncio_tasks": asyncio.run(concurrent_tasks(args.ids // 10, args.tasks)),
+        "multi_worker": multi_worker(args.ids // 10, args.workers),
+        "baselines": baselines(args.ids // 10),
+    }
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
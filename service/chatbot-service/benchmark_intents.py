@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+오프라인 FAQ 의도 매칭 벤치마크
+키워드 N개(기본 10,000)짜리 의도 집합을 만들어 기존 방식(키워드마다 `in` 검사)과
+Aho-Corasick 오토마톤의 메시지당 매칭 시간을 비교합니다.
+
+    python benchmark_intents.py
+    python benchmark_intents.py --patterns 50000 --messages 2000 --output intents.json
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from typing import Dict, List
+
+from app.common.embedding import normalize_text
+from app.domain.discovery.service.intent_matcher import _CompiledIntents
+
+SYLLABLES = [chr(code) for code in range(0xAC00, 0xAC00 + 2000, 7)]
+TOPICS = ["재무", "매출", "현금흐름", "부채비율", "채용", "마케팅", "광고", "정책자금", "탄소", "물류"]
+
+
+def make_intents(patterns: int, keywords_per_intent: int, seed: int) -> Dict:
+    """무작위 2~5음절 키워드로 의도 집합 생성"""
+    rng = random.Random(seed)
+    keywords = set(TOPICS)
+    while len(keywords) < patterns:
+        keywords.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5))))
+    keywords = sorted(keywords)
+    rng.shuffle(keywords)
+    intents = []
+    for start in range(0, len(keywords), keywords_per_intent):
+        chunk = keywords[start:start + keywords_per_intent]
+        intents.append({
+            "id": f"intent_{len(intents)}",
+            "response": f"응답 {len(intents)}",
+            "keywords": {keyword: round(rng.uniform(0.5, 1.0), 2) for keyword in chunk},
+        })
+    return {"version": 1, "intents": intents}
+
+
+def make_messages(count: int, keywords: List[str], seed: int) -> List[str]:
+    """키워드 0~3개가 섞인 30~80자 메시지"""
+    rng = random.Random(seed + 1)
+    messages = []
+    for _ in range(count):
+        words = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(10, 20))]
+        for _ in range(rng.randint(0, 3)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+        messages.append(" ".join(words))
+    return messages
+
+
+def linear_match(data: Dict, message: str):
+    """기존 방식: 의도/키워드를 차례로 돌며 `in` 검사 후 가중치 합산"""
+    normalized = normalize_text(message)
+    best, best_score = None, 0.0
+    for intent in data["intents"]:
+        score = sum(weight for keyword, weight in intent["keywords"].items() if keyword in normalized)
+        if score > best_score:
+            best, best_score = intent["id"], score
+    return best
+
+
+def measure(match, messages: List[str]) -> Dict:
+    latencies = []
+    for message in messages:
+        started = time.perf_counter()
+        match(message)
+        latencies.append((time.perf_counter() - started) * 1_000_000)
+    latencies.sort()
+    return {
+        "mean_us": round(statistics.fmean(latencies), 2),
+        "p50_us": round(latencies[len(latencies) // 2], 2),
+        "p99_us": round(latencies[int(len(latencies) * 0.99) - 1], 2),
+        "messages_per_sec": round(len(messages) / (sum(latencies) / 1_000_000), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FAQ 의도 매칭 벤치마크")
+    parser.add_argument("--patterns", type=int, default=10000)
+    parser.add_argument("--keywords-per-intent", type=int, default=20)
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    data = make_intents(args.patterns, args.keywords_per_intent, args.seed)
+    keywords = [keyword for intent in data["intents"] for keyword in intent["keywords"]]
+    messages = make_messages(args.messages, keywords, args.seed)
+
+    started = time.perf_counter()
+    compiled = _CompiledIntents(data)
+    compile_ms = (time.perf_counter() - started) * 1000
+
+    def compiled_match(message: str):
+        result = compiled.match(message, 0.0)
+        return result.intent.id if result else None
+
+    # 두 방식의 선택 결과가 같은지 먼저 확인
+    mismatches = sum(1 for message in messages if compiled_match(message) != linear_match(data, message))
+
+    results = {
+        "patterns": compiled.keywords,
+        "intents": len(compiled.intents),
+        "automaton_states": compiled.automaton.states,
+        "compile_ms": round(compile_ms, 1),
+        "mismatches": mismatches,
+        "linear": measure(lambda message: linear_match(data, message), messages),
+        "aho_corasick": measure(compiled_match, messages),
+    }
+    results["speedup"] = round(results["linear"]["mean_us"] / results["aho_corasick"]["mean_us"], 1)
+
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+검색 인덱스 질의 지연 시간 벤치마크
+청크 N개(기본 100,000 / 1,000,000)짜리 memmap 인덱스를 임시 디렉터리에 만들고
+VectorStore.search(블록 행렬곱 + argpartition top-k)의 질의 지연 시간을
+단순 방식(전체 점수 계산 후 argsort)과 비교합니다.
+
+    python benchmark_retrieval.py
+    python benchmark_retrieval.py --sizes 100000 --queries 500 --batch 32 --output retrieval.json
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from app.domain.retrieval.repository.vector_store import VectorStore
+
+BUILD_SLICE = 100_000
+
+
+def build_store(directory: str, size: int, dim: int, rng: np.random.Generator) -> VectorStore:
+    store = VectorStore(directory, dim, "benchmark")
+    store.open()
+    for start in range(0, size, BUILD_SLICE):
+        rows = min(BUILD_SLICE, size - start)
+        vectors = rng.standard_normal((rows, dim), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        chunks = [{"title": "bench", "text": "", "position": i} for i in range(rows)]
+        store.append(f"bench:{start}", str(start), vectors, chunks)
+    return store
+
+
+def percentiles(latencies: List[float]) -> Dict:
+    latencies = sorted(latencies)
+    return {
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": round(latencies[len(latencies) // 2], 3),
+        "p99_ms": round(latencies[max(0, int(len(latencies) * 0.99) - 1)], 3),
+    }
+
+
+def run(size: int, dim: int, queries: int, batch: int, k: int, seed: int) -> Dict:
+    rng = np.random.default_rng(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        store = build_store(directory, size, dim, rng)
+        build_seconds = time.perf_counter() - started
+
+        query_vectors = rng.standard_normal((queries, dim), dtype=np.float32)
+        query_vectors /= np.linalg.norm(query_vectors, axis=1, keepdims=True)
+        vectors = store._snapshot.vectors
+
+        # 페이지 캐시 예열
+        store.search(query_vectors[:1], k)
+
+        single = []
+        for query in query_vectors:
+            started = time.perf_counter()
+            store.search(query, k)
+            single.append((time.perf_counter() - started) * 1000)
+
+        batched = []
+        for start in range(0, queries, batch):
+            block = query_vectors[start:start + batch]
+            started = time.perf_counter()
+            store.search(block, k)
+            batched.append((time.perf_counter() - started) * 1000 / len(block))
+
+        naive = []
+        for query in query_vectors[:min(queries, 50)]:
+            started = time.perf_counter()
+            scores = vectors @ query
+            np.argsort(-scores)[:k]
+            naive.append((time.perf_counter() - started) * 1000)
+
+        # 결과가 전체 정렬과 같은지 확인
+        expected = np.argsort(-(vectors @ query_vectors[0]))[:k].tolist()
+        actual = [row for row, _ in store.search(query_vectors[0], k)[0]]
+
+        return {
+            "chunks": size,
+            "dim": dim,
+            "index_mb": round(size * dim * 4 / 1024 / 1024, 1),
+            "build_seconds": round(build_seconds, 2),
+            "top_k_matches_full_sort": expected == actual,
+            "single_query": percentiles(single),
+            f"batched_{batch}_per_query": percentiles(batched),
+            "naive_argsort": percentiles(naive),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="검색 인덱스 벤치마크")
+    parser.add_argument("--sizes", default="100000,1000000", help="청크 수 (쉼표 구분)")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=32)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    results = [
+        run(int(size), args.dim, args.queries, args.batch, args.k, args.seed)
+        for size in args.sizes.split(",")
+    ]
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
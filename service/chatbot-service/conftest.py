@@ -0,0 +1 @@
+# pytest가 서비스 루트(app 패키지가 있는 곳)를 import 경로에 넣도록 두는 루트 conftest
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+로컬 가짜 LLM 프로바이더 (OpenAI Chat Completions 호환)
+실제 API 키/과금 없이 스트리밍 경로와 TTFT, tokens/sec 지표를 확인할 때 사용합니다.
+
+    python fake_llm_server.py                      # http://localhost:9100
+    OPENAI_API_KEY=fake OPENAI_BASE_URL=http://localhost:9100/v1 uvicorn app.main:app --port 8003
+    curl -N -X POST localhost:8003/api/v1/chat/stream \\
+         -H 'Content-Type: application/json' -d '{"message": "재무 상태 진단"}'
+
+FAKE_LLM_FIRST_TOKEN_MS / FAKE_LLM_TOKEN_DELAY_MS 로 첫 토큰 지연과 토큰 간격을 조절합니다.
+FAKE_LLM_ERROR_RATE(0~1) 비율만큼 503을 돌려주므로, 포트를 달리해 여러 개 띄우면 LLM_PROVIDERS의
+지연 기반 선택과 장애 시 다른 프로바이더로 넘기는 동작을 확인할 수 있습니다.
+
+    FAKE_LLM_PORT=9101 FAKE_LLM_FIRST_TOKEN_MS=900 python fake_llm_server.py
+    LLM_PROVIDERS='[{"name": "a", "base_url": "http://localhost:9100/v1", "api_key": "fake"},
+                    {"name": "b", "base_url": "http://localhost:9101/v1", "api_key": "fake"}]'
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+FIRST_TOKEN_MS = float(os.getenv("FAKE_LLM_FIRST_TOKEN_MS", "300"))
+TOKEN_DELAY_MS = float(os.getenv("FAKE_LLM_TOKEN_DELAY_MS", "20"))
+ERROR_RATE = float(os.getenv("FAKE_LLM_ERROR_RATE", "0"))
+
+app = FastAPI(title="Fake LLM Provider")
+
+
+def _answer(messages: list) -> str:
+    """마지막 사용자 메시지를 되짚는 고정 형식 응답"""
+    question = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+    return (
+        f"'{question}'에 대한 진단 결과입니다. 재무 건전성, 운영 효율성, 마케팅 역량을 "
+        f"순서대로 살펴보면 현금흐름 관리와 고객 세분화가 우선 개선 과제로 보입니다."
+    )
+
+
+def _tokens(text: str) -> list:
+    words = text.split(" ")
+    return [word if index == 0 else " " + word for index, word in enumerate(words)]
+
+
+def _usage(messages: list, tokens: list) -> dict:
+    prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in messages)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": len(tokens),
+        "total_tokens": prompt_tokens + len(tokens),
+    }
+
+
+def _chunk(completion_id: str, model: str, delta: dict, finish_reason=None, usage=None) -> str:
+    payload = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}] if usage is None else [],
+    }
+    if usage is not None:
+        payload["usage"] = usage
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    if random.random() < ERROR_RATE:
+        return JSONResponse({"error": {"message": "fake provider unavailable", "type": "server_error"}},
+                            status_code=503)
+    body = await request.json()
+    model = body.get("model", "fake-model")
+    messages = body.get("messages", [])
+    tokens = _tokens(_answer(messages))
+    usage = _usage(messages, tokens)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+
+    if not body.get("stream"):
+        await asyncio.sleep((FIRST_TOKEN_MS + TOKEN_DELAY_MS * len(tokens)) / 1000)
+        return JSONResponse({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(tokens)},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        })
+
+    include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+
+    async def events():
+        yield _chunk(completion_id, model, {"role": "assistant", "content": ""})
+        await asyncio.sleep(FIRST_TOKEN_MS / 1000)
+        for token in tokens:
+            yield _chunk(completion_id, model, {"content": token})
+            await asyncio.sleep(TOKEN_DELAY_MS / 1000)
+        yield _chunk(completion_id, model, {}, finish_reason="stop")
+        if include_usage:
+            yield _chunk(completion_id, model, {}, usage=usage)
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("FAKE_LLM_PORT", "9100")))
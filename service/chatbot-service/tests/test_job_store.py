@@ -0,0 +1,120 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from app.domain.diagnosis.repository.job_store import JobStore, MemoryJobStore, QUEUED, RUNNING, SUCCEEDED
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def _expired_then_reclaimed(store: MemoryJobStore):
+    """lease가 바로 끝나는 첫 claim → 다른 워커의 두 번째 claim → (이전 lease, 현재 lease)"""
+    await store.create(1, "company", 7, {})
+    stale = await store.claim(0.0)
+    await asyncio.sleep(0.01)
+    current = await store.claim(60)
+    return stale, current
+
+
+def test_each_claim_gets_a_new_lease_id():
+    async def scenario():
+        store = MemoryJobStore()
+        stale, current = await _expired_then_reclaimed(store)
+        assert stale["id"] == current["id"] == 1
+        assert stale["lease_id"] != current["lease_id"]
+        assert current["attempts"] == 2
+
+    run(scenario())
+
+
+def test_stale_lease_cannot_write():
+    """lease를 잃은 워커의 쓰기는 모두 무시되고 False를 돌려준다"""
+    async def scenario():
+        store = MemoryJobStore()
+        stale, current = await _expired_then_reclaimed(store)
+        lease = stale["lease_id"]
+        assert await store.report(1, lease, 0.5, "stale", {"done": ["a"]}, 60) is False
+        assert await store.heartbeat(1, lease, 60) is False
+        assert await store.complete(1, lease, {"from": "stale"}) is False
+        assert await store.fail(1, lease, "stale") is False
+        assert await store.retry(1, lease, "stale") is False
+        assert await store.release(1, lease) is False
+        job = await store.get(1)
+        assert job["status"] == RUNNING
+        assert job["step"] is None and job["result"] is None and job["attempts"] == 2
+
+    run(scenario())
+
+
+def test_current_lease_writes_apply():
+    async def scenario():
+        store = MemoryJobStore()
+        _, current = await _expired_then_reclaimed(store)
+        lease = current["lease_id"]
+        assert await store.report(1, lease, 0.5, "step", {"done": ["a"]}, 60) is True
+        assert await store.complete(1, lease, {"from": "current"}) is True
+        job = await store.get(1)
+        assert job["status"] == SUCCEEDED and job["result"] == {"from": "current"}
+        # 끝난 작업에는 같은 lease로도 더 쓸 수 없다
+        assert await store.retry(1, lease, "late") is False
+
+    run(scenario())
+
+
+def test_release_returns_job_without_counting_attempt():
+    async def scenario():
+        store = MemoryJobStore()
+        await store.create(1, "company", 7, {})
+        job = await store.claim(60)
+        assert await store.release(1, job["lease_id"]) is True
+        released = await store.get(1)
+        assert released["status"] == QUEUED and released["attempts"] == 0
+        again = await store.claim(60)
+        assert again["lease_id"] != job["lease_id"]
+        assert await store.complete(1, job["lease_id"], {}) is False
+
+    run(scenario())
+
+
+class _FakeConnection:
+    """UPDATE 문에 넘어온 인자를 기록하고, 지정한 lease_id일 때만 한 행을 바꾼 것으로 응답"""
+
+    def __init__(self, current_lease: int):
+        self.current_lease = current_lease
+        self.queries = []
+
+    async def execute(self, query, *args):
+        self.queries.append((query, args))
+        return "UPDATE 1" if args[1] == self.current_lease else "UPDATE 0"
+
+
+class _FakeDatabase:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+def test_db_store_fences_every_transition_by_lease_id():
+    async def scenario():
+        conn = _FakeConnection(current_lease=42)
+        store = JobStore(_FakeDatabase(conn))
+        calls = [
+            lambda lease: store.report(1, lease, 0.5, "step", {}, 60),
+            lambda lease: store.heartbeat(1, lease, 60),
+            lambda lease: store.complete(1, lease, {}),
+            lambda lease: store.fail(1, lease, "error"),
+            lambda lease: store.retry(1, lease, "error", 5),
+            lambda lease: store.release(1, lease),
+        ]
+        for call in calls:
+            assert await call(41) is False
+            assert await call(42) is True
+        for query, args in conn.queries:
+            assert "lease_id = $2" in query and "status = 'running'" in query
+            assert args[:1] == (1,)
+
+    run(scenario())
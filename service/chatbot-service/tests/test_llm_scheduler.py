@@ -0,0 +1,177 @@
+import asyncio
+
+import pytest
+
+from app.domain.discovery.service.llm_scheduler import LLMScheduler, LLMOverloaded, BATCH
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_fair_ordering_across_flows():
+    """한 회사가 몰아서 보내도 다른 회사 요청이 그 뒤로 밀리지 않는다"""
+    async def scenario():
+        scheduler = LLMScheduler(max_concurrency=1, tokens_per_minute=0, weights={})
+        holder = await scheduler.acquire("company:h", None, 100, 0)
+        order = []
+
+        async def call(tenant, name):
+            async with scheduler.slot(tenant, None, 100, 0):
+                order.append(name)
+
+        tasks = [asyncio.create_task(call("company:a", f"a{i}")) for i in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(call("company:b", "b0")))
+        await asyncio.sleep(0)
+        scheduler.release(holder)
+        await asyncio.gather(*tasks)
+        return order
+
+    assert run(scenario()) == ["a0", "b0", "a1", "a2"]
+
+
+def test_flow_weight_gives_larger_share():
+    """가중치가 큰 흐름은 같은 비용에 더 작은 태그를 받아 먼저 나간다"""
+    async def scenario():
+        scheduler = LLMScheduler(max_concurrency=1, tokens_per_minute=0, weights={"company:vip": 4})
+        holder = await scheduler.acquire("company:h", None, 100, 0)
+        order = []
+
+        async def call(tenant, name):
+            async with scheduler.slot(tenant, None, 100, 0):
+                order.append(name)
+
+        tasks = [asyncio.create_task(call("company:a", f"a{i}")) for i in range(2)]
+        tasks += [asyncio.create_task(call("company:vip", f"v{i}")) for i in range(3)]
+        await asyncio.sleep(0)
+        scheduler.release(holder)
+        await asyncio.gather(*tasks)
+        return order
+
+    assert run(scenario()) == ["v0", "v1", "v2", "a0", "a1"]
+
+
+def test_rejects_when_queue_is_full():
+    async def scenario():
+        scheduler = LLMScheduler(max_concurrency=1, tokens_per_minute=0, max_queue=1)
+        holder = await scheduler.acquire("company:a", None, 10, 0)
+        waiting = asyncio.create_task(scheduler.acquire("company:a", None, 10, 0))
+        await asyncio.sleep(0)
+        with pytest.raises(LLMOverloaded) as rejected:
+            await scheduler.acquire("company:b", None, 10, 0)
+        assert rejected.value.retry_after >= 1.0
+        assert scheduler.stats["rejected"] == 1
+        scheduler.release(holder)
+        scheduler.release(await waiting)
+        assert scheduler.metrics()["running"] == 0
+
+    run(scenario())
+
+
+def test_queue_timeout_frees_the_waiting_place():
+    async def scenario():
+        scheduler = LLMScheduler(max_concurrency=1, tokens_per_minute=0, queue_timeout=0.05)
+        holder = await scheduler.acquire("company:a", None, 10, 0)
+        with pytest.raises(LLMOverloaded):
+            await scheduler.acquire("company:b", None, 10, 0)
+        assert scheduler.stats["timeouts"] == 1
+        assert scheduler.metrics()["waiting"] == 0
+        scheduler.release(holder)
+        # 시간 초과로 빠진 요청이 슬롯을 받아 가지 않는다
+        assert scheduler.metrics()["running"] == 0
+
+    run(scenario())
+
+
+def test_cancel_right_after_grant_releases_the_slot():
+    """허가 직후(대기 태스크가 깨어나기 전) 취소되면 받은 슬롯을 돌려주고 다음 요청에 넘긴다"""
+    async def scenario():
+        scheduler = LLMScheduler(max_concurrency=1, tokens_per_minute=0)
+        holder = await scheduler.acquire("company:a", None, 10, 0)
+        granted_then_cancelled = asyncio.create_task(scheduler.acquire("company:b", None, 10, 0))
+        next_waiter = asyncio.create_task(scheduler.acquire("company:c", None, 10, 0))
+        await asyncio.sleep(0)
+        scheduler.release(holder)
+        granted_then_cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await granted_then_cancelled
+        ticket = await asyncio.wait_for(next_waiter, timeout=1)
+        assert scheduler.metrics()["running"] == 1
+        scheduler.release(ticket)
+        assert scheduler.metrics()["running"] == 0
+
+    run(scenario())
+
+
+def test_reconciles_reserved_tokens_with_actual_usage():
+    async def scenario():
+        scheduler = LLMScheduler(max_concurrency=2, tokens_per_minute=600_000)
+        async with scheduler.slot("company:a", None, 1000, 2000) as ticket:
+            assert ticket.reserved == 3000
+            assert scheduler.metrics()["tokens_available"] <= 600_000 - 3000 + 100
+            ticket.record_usage(1200)
+        # 예약 3000 중 1200만 썼으므로 1800을 돌려받는다 (버킷 상한은 넘지 않음)
+        assert scheduler.metrics()["tokens_available"] >= 600_000 - 1200 - 10
+        assert scheduler.stats["tokens_reconciled"] == 1
+
+    run(scenario())
+
+
+def test_aged_batch_request_goes_before_interactive():
+    async def scenario():
+        scheduler = LLMScheduler(max_concurrency=1, tokens_per_minute=0, batch_max_wait=0.05)
+        holder = await scheduler.acquire("company:h", None, 10, 0)
+        order = []
+
+        async def call(name, priority=None):
+            async with scheduler.slot(f"company:{name}", None, 10, 0, priority):
+                order.append(name)
+
+        batch = asyncio.create_task(call("batch", BATCH))
+        await asyncio.sleep(0.1)
+        interactive = asyncio.create_task(call("interactive"))
+        await asyncio.sleep(0)
+        scheduler.release(holder)
+        await asyncio.gather(batch, interactive)
+        return order
+
+    assert run(scenario()) == ["batch", "interactive"]
+
+
+def test_hedge_slot_charges_concurrency_and_prompt_tokens():
+    async def scenario():
+        scheduler = LLMScheduler(max_concurrency=2, tokens_per_minute=600_000)
+        ticket = await scheduler.acquire("company:a", None, 500, 500)
+        before = scheduler.metrics()["tokens_available"]
+        release = scheduler.hedge_slot(ticket)()
+        assert release is not None
+        assert scheduler.metrics()["running"] == 2
+        assert scheduler.metrics()["tokens_available"] <= before - 500 + 10
+        # 동시 호출 자리가 다 찼으므로 두 번째 헤지는 거절
+        assert scheduler.hedge_slot(ticket)() is None
+        assert scheduler.stats["hedges_denied"] == 1
+        release()
+        release()  # 두 번 불러도 한 번만 반납
+        assert scheduler.metrics()["running"] == 1
+        scheduler.release(ticket)
+        assert scheduler.metrics()["running"] == 0
+
+    run(scenario())
+
+
+def test_hedge_slot_denied_while_others_wait():
+    """동시 호출 자리가 남아도 대기 중인 요청이 있으면 헤지로 앞지르지 않는다"""
+    async def scenario():
+        scheduler = LLMScheduler(max_concurrency=4, tokens_per_minute=60)
+        ticket = await scheduler.acquire("company:a", None, 10, 40)
+        # 버킷에 10토큰만 남아 다음 요청은 토큰을 기다린다
+        waiting = asyncio.create_task(scheduler.acquire("company:b", None, 10, 40))
+        await asyncio.sleep(0)
+        assert scheduler.metrics()["waiting"] == 1
+        assert scheduler.hedge_slot(ticket)() is None
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        scheduler.release(ticket)
+
+    run(scenario())
@@ -0,0 +1,23 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.domain.discovery.service.chatbot_service import decode_session_cursor, encode_session_cursor
+
+
+@pytest.mark.parametrize("updated_at, session_id", [
+    (datetime(2026, 10, 19, 8, 30, 15, 123456, tzinfo=timezone.utc), 2_000_000_000_000_123),
+    (datetime(2024, 1, 1, tzinfo=timezone.utc), 1),
+    (datetime(2026, 3, 1, 9, 0, tzinfo=timezone(timedelta(hours=9))), 987654321),
+])
+def test_cursor_round_trip(updated_at, session_id):
+    """마이크로초까지 같은 (updated_at, id)로 돌아와야 keyset 비교에서 행이 빠지거나 겹치지 않는다"""
+    cursor = encode_session_cursor(updated_at, session_id)
+    assert "=" not in cursor
+    assert decode_session_cursor(cursor) == (updated_at, session_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "!!!", "MTIz"])
+def test_invalid_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_session_cursor(cursor)
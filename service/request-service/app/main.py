@@ -9,6 +9,7 @@ from datetime import datetime
 
 from .domain.discovery.model.service_registry import ServiceRegistry, ServiceInfo
 from .domain.discovery.controller.discovery_controller import DiscoveryController
+from .common.snowflake import next_id
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -129,18 +130,22 @@ async def proxy_request(service_name: str, path: str, request_method: str = "GET
         # 프록시 URL 구성
         target_url = f"{service.service_url}/{path}"
         
+        # 요청 ID 발급 (하위 서비스 로그와 응답을 같은 ID로 추적)
+        request_id = str(next_id())
+        
         # 요청 전달
         async with httpx.AsyncClient() as client:
             response = await client.request(
                 method=request_method,
                 url=target_url,
+                headers={"X-Request-ID": request_id},
                 timeout=30.0
             )
             
             return JSONResponse(
                 content=response.json() if response.headers.get("content-type", "").startswith("application/json") else response.text,
                 status_code=response.status_code,
-                headers=dict(response.headers)
+                headers={**dict(response.headers), "X-Request-ID": request_id}
             )
             
     except httpx.RequestError as e: